@@ -0,0 +1,120 @@
+import logging
+import os
+import random
+import threading
+import time
+
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+logger = logging.getLogger("activity-connection")
+
+T = TypeVar("T")
+
+
+class ActivityConnectionManager:
+    """
+    Hands out RabbitMQ connections to the activity publishers.
+
+    Nothing connects until the first publish. Every thread gets its own connection, cloned from the one returned by
+    connect, so that gunicorn's threads never share a channel, and connections made before a fork, e.g. by a preloaded
+    gunicorn master, are never used by the forked process. A publish that fails because the connection was lost, e.g.
+    after missing heartbeats, is retried on a new connection up to max_retries times with jittered exponential backoff.
+    """
+
+    def __init__(
+        self, connect: Callable[[], tuple[Any, Any]], *, max_retries: int, backoff: float, max_backoff: float
+    ) -> None:
+        self.connect = connect
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._base: Any = None
+        self._exchange: Any = None
+        self._connections: list[Any] = []
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    # the parent process' sockets aren't ours to use or close
+                    self._reset()
+
+    def _get_base(self) -> tuple[Any, Any]:
+        self._check_pid()
+        with self._lock:
+            if self._base is None:
+                self._base, self._exchange = self.connect()
+            return self._base, self._exchange
+
+    def clone(self, **kwargs: Any) -> Any:
+        """A new connection with the same settings, the caller is responsible for releasing it"""
+        return self._get_base()[0].clone(**kwargs)
+
+    def get(self, *, confirmed: bool = False) -> tuple[Any, Any]:
+        """This thread's connection and the exchange, confirmed connections wait for the broker to confirm publishes"""
+        base, exchange = self._get_base()
+        key = "confirmed" if confirmed else "unconfirmed"
+        if (connection := getattr(self._local, key, None)) is None:
+            connection = base.clone(transport_options={**base.transport_options, "confirm_publish": confirmed})
+            setattr(self._local, key, connection)
+            with self._lock:
+                self._connections.append(connection)
+
+        return connection, exchange
+
+    def _discard(self, *, confirmed: bool) -> None:
+        key = "confirmed" if confirmed else "unconfirmed"
+        if (connection := getattr(self._local, key, None)) is None:
+            return
+
+        delattr(self._local, key)
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
+        try:
+            connection.release()
+        except Exception:
+            logger.debug("Failed to release a lost connection", exc_info=True)
+
+    def _connection_errors(self) -> tuple[type[BaseException], ...]:
+        if self._base is None:
+            return (OSError,)
+        return (OSError, *self._base.connection_errors, *self._base.channel_errors)
+
+    def publish(self, send: Callable[[Any, Any], T], *, confirmed: bool = False) -> T:
+        """Call send with this thread's connection and the exchange, reconnecting if the connection was lost"""
+        attempt = 0
+        while True:
+            try:
+                connection, exchange = self.get(confirmed=confirmed)
+                return send(connection, exchange)
+            except Exception as ex:
+                # anything can go wrong while connecting, once connected only retry lost connections
+                if (self._base is not None and not isinstance(ex, self._connection_errors())) or (
+                    attempt >= self.max_retries
+                ):
+                    raise
+
+                self._discard(confirmed=confirmed)
+                delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))  # noqa: S311
+                logger.warning("Lost the connection to RabbitMQ (%s), retrying in %.2fs", ex, delay)
+                time.sleep(delay)
+                attempt += 1
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+
+        for connection in connections:
+            try:
+                connection.release()
+            except Exception:
+                logger.debug("Failed to release a connection", exc_info=True)
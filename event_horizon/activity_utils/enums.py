@@ -1,9 +1,11 @@
+from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime, timezone
 from decimal import Decimal
 from enum import Enum
-from typing import Literal
+from typing import Any, Literal
 
 from cosmos_message_lib.schemas import utc_datetime
+from pydantic import BaseModel, parse_obj_as
 
 from event_horizon.activity_utils.schemas import (
     ActivitySchema,
@@ -28,6 +30,34 @@ from event_horizon.activity_utils.utils import pence_integer_to_currency_string
 from event_horizon.settings import PROJECT_NAME
 
 
+def _balance_associated_value(new_balance: int, loyalty_type: str) -> str:
+    match loyalty_type:
+        case "STAMPS":
+            stamp_balance = new_balance // 100
+            return f"{stamp_balance} stamp" + ("s" if stamp_balance != 1 else "")
+        case "ACCUMULATOR":
+            return pence_integer_to_currency_string(new_balance, "GBP")
+        case _:
+            raise ValueError(f"Unexpected value {loyalty_type} for loyalty_type.")
+
+
+def _validate_column(schema: type[BaseModel], field: str, values: Iterable) -> list:
+    """Validate every value of a column against one of the schema's fields in a single call"""
+    column_type: Any = list[schema.__fields__[field].outer_type_]  # type: ignore[misc]
+    return parse_obj_as(column_type, values)
+
+
+def _row_defaults(schema: type[BaseModel]) -> Callable[[], dict[str, Any]]:
+    """The schema's per instance defaults, e.g. the activity id, which can't be shared between payloads"""
+    factories = {name: field.default_factory for name, field in schema.__fields__.items() if field.default_factory}
+    return lambda: {name: factory() for name, factory in factories.items()}
+
+
+def _copy_template(template: dict) -> dict:
+    """A copy of a batch's payload template that doesn't share its lists and dicts, e.g. reasons, with other payloads"""
+    return {key: value.copy() if isinstance(value, list | dict) else value for key, value in template.items()}
+
+
 class ActivityType(Enum):
     CAMPAIGN = f"activity.{PROJECT_NAME}.campaign.change"
     EARN_RULE = f"activity.{PROJECT_NAME}.earn_rule.change"
@@ -315,15 +345,7 @@ class ActivityType(Enum):
         new_balance: int,
         loyalty_type: str,
     ) -> dict:
-        match loyalty_type:
-            case "STAMPS":
-                stamp_balance = new_balance // 100
-                associated_value = f"{stamp_balance} stamp" + ("s" if stamp_balance != 1 else "")
-            case "ACCUMULATOR":
-                associated_value = pence_integer_to_currency_string(new_balance, "GBP")
-            case _:
-                raise ValueError(f"Unexpected value {loyalty_type} for loyalty_type.")
-
+        associated_value = _balance_associated_value(new_balance, loyalty_type)
         payload = BalanceChangeWholeActivitySchema(
             type=cls.BALANCE_CHANGE.name,
             datetime=datetime.now(tz=timezone.utc),
@@ -344,6 +366,57 @@ class ActivityType(Enum):
 
         return payload
 
+    @classmethod
+    def get_balance_change_activity_data_batch(  # noqa: PLR0913
+        cls,
+        *,
+        retailer_slug: str,
+        from_campaign_slug: str,
+        to_campaign_slug: str,
+        account_holder_uuids: Iterable[str],
+        activity_datetime: datetime,
+        new_balances: Iterable[int],
+        loyalty_type: str,
+    ) -> Iterator[dict]:
+        """
+        The same payloads as get_balance_change_activity_data for every account holder and their new balance, with
+        the schema validated once for the whole batch. Only the columns are validated per row and each distinct balance
+        is formatted once.
+        """
+        data_schema = BalanceChangeWholeActivitySchema.__fields__["data"].type_
+        user_ids = _validate_column(BalanceChangeWholeActivitySchema, "user_id", account_holder_uuids)
+        balances = _validate_column(data_schema, "new_balance", new_balances)
+        if not user_ids:
+            return iter(())
+
+        associated_values = {
+            balance: _balance_associated_value(balance, loyalty_type) for balance in dict.fromkeys(balances)
+        }
+        template = cls.get_balance_change_activity_data(
+            retailer_slug=retailer_slug,
+            from_campaign_slug=from_campaign_slug,
+            to_campaign_slug=to_campaign_slug,
+            account_holder_uuid=user_ids[0],
+            activity_datetime=activity_datetime,
+            new_balance=balances[0],
+            loyalty_type=loyalty_type,
+        )
+        row_defaults = _row_defaults(BalanceChangeWholeActivitySchema)
+        summary_prefix = f"{retailer_slug} {to_campaign_slug} Balance "
+        data = template["data"]
+
+        return (
+            _copy_template(template)
+            | row_defaults()
+            | {
+                "summary": summary_prefix + associated_values[balance],
+                "user_id": user_id,
+                "associated_value": associated_values[balance],
+                "data": data | {"new_balance": balance},
+            }
+            for user_id, balance in zip(user_ids, balances, strict=True)
+        )
+
     @classmethod
     def get_campaign_migration_activity_data(  # noqa: PLR0913
         cls,
@@ -628,6 +701,43 @@ class ActivityType(Enum):
 
         return payload
 
+    @classmethod
+    def get_reward_status_activity_data_batch(  # noqa: PLR0913
+        cls,
+        *,
+        retailer_slug: str,
+        from_campaign_slug: str,
+        to_campaign_slug: str,
+        account_holder_uuids: Iterable[str],
+        activity_datetime: datetime,
+        pending_reward_uuids: Iterable[str],
+    ) -> Iterator[dict]:
+        """
+        The same payloads as get_reward_status_activity_data for every pending reward and its account holder, with the
+        schema validated once for the whole batch.
+        """
+        user_ids = _validate_column(RewardStatusWholeActivitySchema, "user_id", account_holder_uuids)
+        activity_identifiers = _validate_column(
+            RewardStatusWholeActivitySchema, "activity_identifier", pending_reward_uuids
+        )
+        if not user_ids:
+            return iter(())
+
+        template = cls.get_reward_status_activity_data(
+            retailer_slug=retailer_slug,
+            from_campaign_slug=from_campaign_slug,
+            to_campaign_slug=to_campaign_slug,
+            account_holder_uuid=user_ids[0],
+            activity_datetime=activity_datetime,
+            pending_reward_uuid=activity_identifiers[0],
+        )
+        row_defaults = _row_defaults(RewardStatusWholeActivitySchema)
+
+        return (
+            _copy_template(template) | row_defaults() | {"activity_identifier": activity_identifier, "user_id": user_id}
+            for user_id, activity_identifier in zip(user_ids, activity_identifiers, strict=True)
+        )
+
     @classmethod
     def get_account_holder_deleted_activity_data(  # noqa: PLR0913
         cls,
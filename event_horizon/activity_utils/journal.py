@@ -0,0 +1,138 @@
+import json
+import logging
+import uuid
+
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from redis import Redis
+
+from event_horizon.activity_utils.utils import json_default
+
+if TYPE_CHECKING:
+    from event_horizon.activity_utils.tasks import BulkPublishProgress  # pragma: no cover
+
+logger = logging.getLogger("activity-journal")
+
+JOURNAL_KEY = "event-horizon:activity-journal:{routing_key}:{journal_id}"
+# the journals of committed changes, published or waiting to be resumed
+READY_JOURNALS_KEY = "event-horizon:activity-journals"
+
+
+class BulkPublishJournal:
+    """
+    Activities kept in Redis, along with how many of them the broker has confirmed, until they have all been published
+    so that a publish that dies part way can be resumed from its last confirmed chunk.
+
+    A journal is written before the change its activities describe is committed and marked as ready once it has been,
+    only ready journals are published. The process publishing a journal holds its lock, renewed after every confirmed
+    chunk, and another process can only resume it once the lock has expired after lock_timeout seconds. Journals are
+    deleted once published and expire ttl seconds after they were last written to otherwise.
+    """
+
+    def __init__(self, redis: Redis, key: str, *, ttl: int, lock_timeout: int) -> None:
+        self.redis = redis
+        self.key = key
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self._token: str | None = None
+
+    @property
+    def routing_key(self) -> str:
+        return self.key.rsplit(":", 2)[1]
+
+    @classmethod
+    def write(  # noqa: PLR0913
+        cls, redis: Redis, payloads: Iterable[dict], routing_key: str, *, chunk_size: int, ttl: int, lock_timeout: int
+    ) -> "BulkPublishJournal":
+        """Write the payloads to a new journal, held by this process until it is published"""
+        journal = cls(
+            redis,
+            JOURNAL_KEY.format(routing_key=routing_key, journal_id=uuid.uuid4().hex),
+            ttl=ttl,
+            lock_timeout=lock_timeout,
+        )
+        journal._lock()
+
+        payloads = iter(payloads)
+        while chunk := [json.dumps(payload, default=json_default) for payload in islice(payloads, chunk_size)]:
+            redis.rpush(f"{journal.key}:payloads", *chunk)
+        redis.set(f"{journal.key}:confirmed", 0, ex=ttl)
+        redis.expire(f"{journal.key}:payloads", ttl)
+        return journal
+
+    @classmethod
+    def ready(cls, redis: Redis, *, ttl: int, lock_timeout: int) -> Iterator["BulkPublishJournal"]:
+        for key in redis.smembers(READY_JOURNALS_KEY):
+            yield cls(redis, key.decode(), ttl=ttl, lock_timeout=lock_timeout)
+
+    def _lock(self) -> bool:
+        token = uuid.uuid4().hex
+        if self.redis.set(f"{self.key}:lock", token, nx=True, ex=self.lock_timeout):
+            self._token = token
+        return self._token == token
+
+    def _renew_lock(self) -> None:
+        token = self._token or ""
+        if self.redis.get(f"{self.key}:lock") != token.encode():
+            raise RuntimeError(f"Lost the lock of {self.key}, it is being resumed by another process")
+
+        self.redis.set(f"{self.key}:lock", token, ex=self.lock_timeout)
+
+    def mark_ready(self) -> None:
+        """Mark the journal's activities as safe to publish, once the change they describe has been committed"""
+        # nothing else touches a journal before it is ready, even if its lock expired while it was written
+        self.redis.set(f"{self.key}:lock", self._token or "", ex=self.lock_timeout)
+        self.redis.sadd(READY_JOURNALS_KEY, self.key)
+
+    def _read(self, offset: int, chunk_size: int) -> Iterator[dict]:
+        while chunk := self.redis.lrange(f"{self.key}:payloads", offset, offset + chunk_size - 1):
+            yield from (json.loads(payload) for payload in chunk)
+            offset += len(chunk)
+
+    def publish(self, publish_in_chunks: Callable[..., "BulkPublishProgress"], chunk_size: int) -> int:
+        """
+        Publish the activities that haven't been confirmed yet, returns how many there were. Nothing is published if
+        another process holds the journal's lock.
+        """
+        if self._token is None and not self._lock():
+            logger.info("%s is being published by another process", self.key)
+            return 0
+
+        if (confirmed := self.redis.get(f"{self.key}:confirmed")) is None:
+            logger.error("%s expired before it was published", self.key)
+            self.delete()
+            return 0
+
+        offset = int(confirmed)
+
+        def on_confirmed(progress: "BulkPublishProgress") -> None:
+            self._renew_lock()
+            self.redis.set(f"{self.key}:confirmed", offset + progress.confirmed, ex=self.ttl)
+            self.redis.expire(f"{self.key}:payloads", self.ttl)
+
+        try:
+            progress = publish_in_chunks(
+                self._read(offset, chunk_size),
+                routing_key=self.routing_key,
+                chunk_size=chunk_size,
+                on_confirmed=on_confirmed,
+            )
+        except Exception:
+            # let the journal be resumed straight away
+            self._unlock()
+            raise
+
+        self.delete()
+        return progress.confirmed
+
+    def _unlock(self) -> None:
+        if self._token is not None and self.redis.get(f"{self.key}:lock") == self._token.encode():
+            self.redis.delete(f"{self.key}:lock")
+        self._token = None
+
+    def delete(self) -> None:
+        self.redis.srem(READY_JOURNALS_KEY, self.key)
+        self.redis.delete(f"{self.key}:payloads", f"{self.key}:confirmed", f"{self.key}:lock")
+        self._token = None
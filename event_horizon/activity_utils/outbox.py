@@ -0,0 +1,144 @@
+import hashlib
+import json
+import logging
+import threading
+
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from sqlalchemy import JSON, BigInteger, Column, DateTime, Integer, MetaData, String, Table, delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from event_horizon.activity_utils.utils import json_default
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session  # pragma: no cover
+
+logger = logging.getLogger("activity-outbox")
+
+# Event Horizon's table in the polaris database, created by polaris' migrations from this definition as Event Horizon
+# never runs DDL against it. Automap reflects it into polaris' models along with the rest of the schema, it is only
+# ever used through this table.
+metadata = MetaData()
+activity_outbox = Table(
+    "event_horizon_activity_outbox",
+    metadata,
+    # sqlite only autoincrements INTEGER primary keys
+    Column("id", BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True),
+    Column("idempotency_key", String(64), nullable=False, unique=True),
+    Column("routing_key", String, nullable=False),
+    Column("payload", JSON, nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False, default=lambda: datetime.now(tz=timezone.utc)),
+    Column("published_at", DateTime(timezone=True), nullable=True, index=True),
+)
+
+
+def idempotency_key(payload: dict, routing_key: str) -> str:
+    return hashlib.sha256(json.dumps([routing_key, payload], sort_keys=True).encode()).hexdigest()
+
+
+def write_activities(session: "Session", payloads: Iterable[dict], routing_key: str) -> None:
+    """
+    Add the activities to the outbox in the session's transaction, they are published by the relay once it has been
+    committed.
+
+    Activities are keyed on a hash of their routing key and payload, so writing the same payload twice only adds it
+    once. Building an activity again, e.g. when a failed action is retried, gives it a new datetime and adds it again.
+    """
+    rows = []
+    for payload in payloads:
+        encoded = json.loads(json.dumps(payload, default=json_default))
+        rows.append(
+            {"idempotency_key": idempotency_key(encoded, routing_key), "routing_key": routing_key, "payload": encoded}
+        )
+
+    if not rows:
+        return
+
+    bind = session.get_bind()
+    insert = postgresql.insert if bind.dialect.name == "postgresql" else sqlite.insert
+    session.execute(insert(activity_outbox).on_conflict_do_nothing(index_elements=["idempotency_key"]), rows)
+
+
+def relay_batch(session: "Session", send: Callable[..., None], batch_size: int) -> int:
+    """
+    Publish the oldest unpublished activities and mark them as published, returns how many there were.
+
+    Rows are locked until they have been marked as published so that relays can run side by side. Each routing key's
+    activities are marked once the broker has confirmed them, if publishing fails the relay resumes after the last
+    confirmed ones. An activity is published again if the relay dies before marking it. The idempotency key only
+    stops the same activity from being written to the outbox twice, it isn't sent, consumers that can't tolerate
+    duplicates have to recognise re-sent activities by their payload, which is identical.
+    """
+    rows = session.execute(
+        select(activity_outbox.c.id, activity_outbox.c.routing_key, activity_outbox.c.payload)
+        .where(activity_outbox.c.published_at.is_(None))
+        .order_by(activity_outbox.c.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    grouped: dict[str, list] = {}
+    for row in rows:
+        grouped.setdefault(row.routing_key, []).append(row)
+
+    confirmed: list[int] = []
+    try:
+        for routing_key, group in grouped.items():
+            send([row.payload for row in group], routing_key=routing_key)
+            confirmed.extend(row.id for row in group)
+    except Exception:
+        session.rollback()
+        # the activities the broker did confirm aren't published again
+        _mark_published(session, confirmed)
+        raise
+
+    _mark_published(session, confirmed)
+    return len(rows)
+
+
+def _mark_published(session: "Session", ids: list[int]) -> None:
+    if ids:
+        session.execute(
+            update(activity_outbox)
+            .where(activity_outbox.c.id.in_(ids), activity_outbox.c.published_at.is_(None))
+            .values(published_at=datetime.now(tz=timezone.utc))
+        )
+    session.commit()
+
+
+def purge_published(session: "Session", retention: timedelta) -> int:
+    """Delete the activities published more than retention ago, returns how many there were"""
+    res = session.execute(
+        delete(activity_outbox).where(activity_outbox.c.published_at < datetime.now(tz=timezone.utc) - retention)
+    )
+    session.commit()
+    return res.rowcount
+
+
+def run_relay(  # noqa: PLR0913
+    session: "Session",
+    send: Callable[..., None],
+    *,
+    batch_size: int,
+    poll_interval: float,
+    retention: timedelta,
+    stop: threading.Event | None = None,
+) -> None:
+    """Relay the outbox until stop is set, waiting poll_interval seconds whenever it has been emptied"""
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        try:
+            relayed = relay_batch(session, send, batch_size)
+            if relayed:
+                logger.info("Published %d activities", relayed)
+            if relayed < batch_size:
+                purge_published(session, retention)
+        except Exception:
+            session.rollback()
+            logger.exception("Failed to relay activities, retrying in %.1fs", poll_interval)
+            relayed = 0
+
+        if relayed < batch_size:
+            stop.wait(poll_interval)
@@ -1,14 +1,308 @@
-from collections.abc import Iterator
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
+from typing import TYPE_CHECKING
 
 from cosmos_message_lib import get_connection_and_exchange, verify_payload_and_send_activity
 
-from event_horizon.settings import MESSAGE_EXCHANGE_NAME, RABBITMQ_DSN
+from event_horizon.activity_utils.connection import ActivityConnectionManager
+from event_horizon.activity_utils.enums import ActivityType
+from event_horizon.activity_utils.journal import BulkPublishJournal
+from event_horizon.activity_utils.outbox import write_activities
+from event_horizon.metrics import ACTIVITIES_PUBLISHED, ACTIVITY_PUBLISH_DURATION, ACTIVITY_PUBLISH_FAILURES
+from event_horizon.settings import (
+    ACTIVITY_PUBLISH_BATCH_SIZE,
+    ACTIVITY_PUBLISH_CHUNK_SIZE,
+    ACTIVITY_PUBLISH_DRAIN_TIMEOUT,
+    ACTIVITY_PUBLISH_FLUSH_INTERVAL,
+    ACTIVITY_PUBLISH_JOURNAL_LOCK_TIMEOUT,
+    ACTIVITY_PUBLISH_JOURNAL_TTL,
+    ACTIVITY_PUBLISH_MAX_RETRIES,
+    ACTIVITY_PUBLISH_MAX_RETRY_BACKOFF,
+    ACTIVITY_PUBLISH_MODE,
+    ACTIVITY_PUBLISH_QUEUE_SIZE,
+    ACTIVITY_PUBLISH_RETRY_BACKOFF,
+    MESSAGE_EXCHANGE_NAME,
+    RABBITMQ_DSN,
+    redis,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session  # pragma: no cover
+
+logger = logging.getLogger("activity-publisher")
+
+# bulk publishing uses connections that wait for the broker to confirm every message, which also stops it from
+# outpacing a slow broker
+activity_connections = ActivityConnectionManager(
+    partial(get_connection_and_exchange, rabbitmq_dsn=RABBITMQ_DSN, message_exchange_name=MESSAGE_EXCHANGE_NAME),
+    max_retries=ACTIVITY_PUBLISH_MAX_RETRIES,
+    backoff=ACTIVITY_PUBLISH_RETRY_BACKOFF,
+    max_backoff=ACTIVITY_PUBLISH_MAX_RETRY_BACKOFF,
+)
+atexit.register(activity_connections.close)
+
+ACTIVITY_TYPE_NAMES = {activity_type.value: activity_type.name for activity_type in ActivityType}
+
+
+def publish_activity(payload: dict | Iterable[dict], *, routing_key: str, confirmed: bool = False) -> None:
+    activity_type = ACTIVITY_TYPE_NAMES.get(routing_key, routing_key)
+    # payloads are published again if the connection is lost part way through
+    payload = payload if isinstance(payload, dict) else list(payload)
+
+    with ACTIVITY_PUBLISH_DURATION.labels(activity_type=activity_type).time():
+        activity_connections.publish(
+            lambda connection, exchange: verify_payload_and_send_activity(connection, exchange, payload, routing_key),
+            confirmed=confirmed,
+        )
+
+    ACTIVITIES_PUBLISHED.labels(activity_type=activity_type).inc(1 if isinstance(payload, dict) else len(payload))
+
+
+@dataclass
+class BulkPublishProgress:
+    routing_key: str
+    sent: int = 0
+    confirmed: int = 0
+    failed: int = 0
+
+
+def publish_in_chunks(
+    payloads: Iterable[dict],
+    *,
+    routing_key: str,
+    chunk_size: int = ACTIVITY_PUBLISH_CHUNK_SIZE,
+    on_confirmed: Callable[[BulkPublishProgress], None] | None = None,
+) -> BulkPublishProgress:
+    """
+    Publish the payloads chunk_size at a time, waiting for the broker to confirm each chunk before reading the next one
+    from payloads. on_confirmed is called with the progress so far after every confirmed chunk, the activities that
+    have been confirmed don't need to be published again if a later chunk fails, see BulkPublishJournal.
+    """
+    progress = BulkPublishProgress(routing_key)
+    payloads = iter(payloads)
+    while chunk := list(islice(payloads, chunk_size)):
+        progress.sent += len(chunk)
+        try:
+            publish_activity(chunk, routing_key=routing_key, confirmed=True)
+        except Exception:
+            progress.failed += len(chunk)
+            logger.error(
+                "Failed to publish %s activities, %d sent, %d confirmed, %d failed",
+                routing_key,
+                progress.sent,
+                progress.confirmed,
+                progress.failed,
+            )
+            raise
+
+        progress.confirmed += len(chunk)
+        logger.info("Published %d %s activities", progress.confirmed, routing_key)
+        if on_confirmed is not None:
+            on_confirmed(progress)
+
+    return progress
+
+
+class ActivityPublisher:
+    """
+    Publishes activities from a bounded in-process queue in a background thread, so that a slow broker doesn't slow
+    down the requests that create them.
+
+    Queued activities are sent in batches of up to batch_size activities, grouped by routing key, as soon as a batch
+    fills up or flush_interval seconds after the first activity of the batch was queued. Activities that don't fit in
+    the queue are left to the caller to publish. Activities that can't be published, even after send's retries, are
+    queued again behind the ones queued since, those that no longer fit are logged, counted and dropped. stop()
+    publishes whatever is still queued for up to drain_timeout seconds, failures are no longer retried once stopping.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        send: Callable[..., None],
+        maxsize: int,
+        batch_size: int,
+        flush_interval: float,
+        drain_timeout: float,
+    ) -> None:
+        self.send = send
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.drain_timeout = drain_timeout
+        # (time queued, routing key, payload)
+        self._queue: queue.Queue[tuple[float, str, dict]] = queue.Queue(maxsize)
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def enqueue(self, payloads: list[dict], routing_key: str, *, queued_at: float | None = None) -> list[dict]:
+        """Queue the payloads, returns the ones that didn't fit"""
+        queued_at = time.monotonic() if queued_at is None else queued_at
+        for i, payload in enumerate(payloads):
+            try:
+                self._queue.put_nowait((queued_at, routing_key, payload))
+            except queue.Full:
+                logger.warning("Activity queue is full, %d %s activities didn't fit", len(payloads) - i, routing_key)
+                return payloads[i:]
 
-connection, exchange = get_connection_and_exchange(
-    rabbitmq_dsn=RABBITMQ_DSN,
-    message_exchange_name=MESSAGE_EXCHANGE_NAME,
+        return []
+
+    def _next_batch(self) -> list[tuple[float, str, dict]]:
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        deadline = batch[0][0] + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _publish_batch(self, batch: list[tuple[float, str, dict]]) -> None:
+        grouped: dict[str, list[dict]] = {}
+        for _, routing_key, payload in batch:
+            grouped.setdefault(routing_key, []).append(payload)
+
+        for routing_key, payloads in grouped.items():
+            try:
+                self.send(payloads, routing_key=routing_key)
+            except Exception:
+                logger.exception("Failed to publish %d %s activities", len(payloads), routing_key)
+                self._requeue(payloads, routing_key)
+
+    def _requeue(self, payloads: list[dict], routing_key: str) -> None:
+        # flushed with the next batch, send backs off between its own retries
+        dropped = payloads if self._stop.is_set() else self.enqueue(payloads, routing_key, queued_at=0)
+        if dropped:
+            logger.error("Dropped %d %s activities", len(dropped), routing_key)
+            ACTIVITY_PUBLISH_FAILURES.labels(activity_type=ACTIVITY_TYPE_NAMES.get(routing_key, routing_key)).inc(
+                len(dropped)
+            )
+
+    def _run(self, stop: threading.Event) -> None:
+        # keep going until asked to stop and everything queued has been published
+        while not (stop.is_set() and self._queue.empty()):
+            if batch := self._next_batch():
+                self._publish_batch(batch)
+
+    def start(self) -> None:
+        """Start publishing in a daemon thread, call once the process has forked"""
+        with self._lock:
+            if self.running:
+                return
+
+            self._stop = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run, args=(self._stop,), name="activity-publisher", daemon=True
+            )
+            self._thread.start()
+            # gunicorn workers exit normally on a graceful shutdown, which runs atexit handlers
+            atexit.unregister(self.stop)
+            atexit.register(self.stop)
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stop.set()
+            if self._thread is not None:
+                self._thread.join(timeout=self.drain_timeout)
+                if self._thread.is_alive():
+                    logger.error("Gave up publishing %d queued activities", self._queue.qsize())
+                self._thread = None
+
+
+activity_publisher = ActivityPublisher(
+    publish_activity,
+    maxsize=ACTIVITY_PUBLISH_QUEUE_SIZE,
+    batch_size=ACTIVITY_PUBLISH_BATCH_SIZE,
+    flush_interval=ACTIVITY_PUBLISH_FLUSH_INTERVAL,
+    drain_timeout=ACTIVITY_PUBLISH_DRAIN_TIMEOUT,
 )
 
 
-def sync_send_activity(payload: dict | Iterator[dict], *, routing_key: str) -> None:
-    verify_payload_and_send_activity(connection, exchange, payload, routing_key)
+def sync_send_activity(payload: dict | Iterator[dict], *, routing_key: str, session: "Session | None" = None) -> None:
+    """
+    Publish the activities, iterators of payloads are published in confirmed chunks. In outbox mode, activities passed
+    a polaris session are written to the outbox in its transaction instead, the caller commits them along with the
+    change they describe.
+    """
+    if ACTIVITY_PUBLISH_MODE == "outbox" and session is not None:
+        write_activities(session, [payload] if isinstance(payload, dict) else payload, routing_key)
+        return
+
+    if ACTIVITY_PUBLISH_MODE == "async" and activity_publisher.running:
+        # payload iterators are consumed straight away, they may read from the request's database session
+        if leftover := activity_publisher.enqueue(
+            [payload] if isinstance(payload, dict) else list(payload), routing_key
+        ):
+            publish_in_chunks(leftover, routing_key=routing_key)
+        return
+
+    if isinstance(payload, dict):
+        publish_activity(payload, routing_key=routing_key)
+    else:
+        publish_in_chunks(payload, routing_key=routing_key)
+
+
+def journal_activities(payloads: Iterable[dict], *, routing_key: str, session: "Session") -> BulkPublishJournal | None:
+    """
+    Keep the activities of a change made in the polaris session until it has been committed. In outbox mode they are
+    written to the outbox in its transaction, otherwise they are written to a journal that the caller passes to
+    publish_journals once it has committed the session.
+    """
+    if ACTIVITY_PUBLISH_MODE == "outbox":
+        write_activities(session, payloads, routing_key)
+        return None
+
+    return BulkPublishJournal.write(
+        redis,
+        payloads,
+        routing_key,
+        chunk_size=ACTIVITY_PUBLISH_CHUNK_SIZE,
+        ttl=ACTIVITY_PUBLISH_JOURNAL_TTL,
+        lock_timeout=ACTIVITY_PUBLISH_JOURNAL_LOCK_TIMEOUT,
+    )
+
+
+def publish_journals(journals: Iterable[BulkPublishJournal | None]) -> None:
+    """
+    Publish the journals of a committed change. A journal that fails part way is left to resume_journals, which picks
+    it up from its last confirmed chunk.
+    """
+    ready = [journal for journal in journals if journal is not None]
+    # all of them can be resumed if the process dies publishing the first one
+    for journal in ready:
+        journal.mark_ready()
+
+    for journal in ready:
+        try:
+            journal.publish(publish_in_chunks, ACTIVITY_PUBLISH_CHUNK_SIZE)
+        except Exception:
+            logger.exception("Failed to publish %s, it is left to resume-activity-publishes", journal.key)
+
+
+def resume_journals() -> int:
+    """Publish the rest of the ready journals that no process is publishing, returns how many activities there were"""
+    resumed = 0
+    for journal in BulkPublishJournal.ready(
+        redis, ttl=ACTIVITY_PUBLISH_JOURNAL_TTL, lock_timeout=ACTIVITY_PUBLISH_JOURNAL_LOCK_TIMEOUT
+    ):
+        try:
+            resumed += journal.publish(publish_in_chunks, ACTIVITY_PUBLISH_CHUNK_SIZE)
+        except Exception:
+            logger.exception("Failed to resume %s", journal.key)
+
+    return resumed
@@ -1,3 +1,8 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
 from babel.numbers import format_currency
 
 
@@ -7,3 +12,12 @@ def pence_integer_to_currency_string(value: int, currency: str, currency_sign: b
         extras = {"format": "#,##0.##"}
 
     return format_currency(value / 100, currency, locale="en_GB", **extras)
+
+
+def json_default(value: Any) -> str:
+    """Encode the non JSON values found in activity payloads, for json.dumps' default"""
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, Decimal | UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,273 @@
+import csv
+import io
+import logging
+import queue
+import threading
+
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import suppress
+from itertools import chain
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from flask import current_app, stream_with_context
+from flask_admin._compat import csv_encode
+from flask_admin.contrib.sqla import ModelView
+from sqlalchemy import ARRAY, Boolean, DateTime, String, and_, case, func, inspect, not_, select
+from sqlalchemy.orm import aliased
+
+from werkzeug.utils import secure_filename
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.orm import Query, RelationshipProperty
+    from werkzeug.wrappers import Response
+
+logger = logging.getLogger("copy-export")
+
+# COPY writes a row at a time, rows are buffered into chunks of about this many bytes before they are sent
+COPY_CHUNK_SIZE = 64 * 1024
+# chunks waiting to be sent, bounds the memory used when the client reads slower than postgres writes
+COPY_QUEUE_SIZE = 16
+
+
+class CopyCancelledError(Exception):
+    pass
+
+
+def _column_key(mapper: Any, column: Any) -> str:
+    return mapper.get_property_by_column(column).key
+
+
+def _join_condition(prop: "RelationshipProperty", parent: Any, child: Any) -> Any:
+    return and_(
+        *(
+            getattr(parent, _column_key(prop.parent, local)) == getattr(child, _column_key(prop.mapper, remote))
+            for local, remote in prop.local_remote_pairs
+        )
+    )
+
+
+def _join_relationship(query: "Query", prop: "RelationshipProperty", parent: Any) -> tuple["Query", Any]:
+    if prop.secondary is not None:
+        raise ValueError(f"{prop} uses a secondary table")
+
+    child = aliased(prop.mapper.class_)
+    condition = _join_condition(prop, parent, child)
+    if prop.uselist:
+        # only the first related row is exported so collections don't multiply the exported rows
+        inner = aliased(prop.mapper.class_)
+        pk_key = _column_key(prop.mapper, prop.mapper.primary_key[0])
+        first_pk = select(func.min(getattr(inner, pk_key))).where(_join_condition(prop, parent, inner))
+        condition = and_(condition, getattr(child, pk_key) == first_pk.scalar_subquery())
+
+    return query.outerjoin(child, condition), child
+
+
+def _export_value(column: Any) -> Any:
+    """Render the column the way str() does in the default CSV export instead of in postgres' text format"""
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return case((column, "True"), (not_(column), "False"))
+
+    if isinstance(column_type, DateTime):
+        # microseconds and the UTC offset are only shown when they are set, e.g. 2024-01-02 03:04:05+00:00
+        value = func.to_char(column, "YYYY-MM-DD HH24:MI:SS", type_=String) + case(
+            (func.to_char(column, "US") != "000000", func.to_char(column, ".US", type_=String)), else_=""
+        )
+        return value + func.to_char(column, "TZH:TZM", type_=String) if column_type.timezone else value
+
+    if isinstance(column_type, ARRAY):
+        return func.array_to_string(column, ", ", type_=String)
+
+    return column
+
+
+def export_query(query: "Query", model: type, paths: Iterable[str]) -> "Query":
+    """
+    Select the columns at the given dotted paths, e.g. accountholder.email, from the model's query instead of the model.
+
+    Relationships are outer joined once per path prefix, whatever the query has joined already. Paths have to end on
+    a column, ValueError is raised otherwise. Booleans, timestamps and arrays are rendered as the default CSV export
+    renders them.
+    """
+    joins: dict[tuple[str, ...], Any] = {(): model}
+    columns = []
+    for path in paths:
+        *relationships, column_key = path.split(".")
+        mapper = inspect(model)
+        for i, key in enumerate(relationships):
+            if (prop := mapper.relationships.get(key)) is None:
+                raise ValueError(f"{path!r} is not a column path of {model.__name__}")
+
+            prefix = tuple(relationships[: i + 1])
+            if prefix not in joins:
+                query, joins[prefix] = _join_relationship(query, prop, joins[prefix[:-1]])
+            mapper = prop.mapper
+
+        if column_key not in mapper.column_attrs:
+            raise ValueError(f"{path!r} is not a column path of {model.__name__}")
+
+        columns.append(_export_value(getattr(joins[tuple(relationships)], column_key)))
+
+    return query.with_entities(*columns)
+
+
+class _ChunkWriter:
+    """File-like object that COPY writes rows to, handing them over to the streaming response in chunks"""
+
+    def __init__(self, chunks: queue.Queue, cancelled: threading.Event) -> None:
+        self.chunks = chunks
+        self.cancelled = cancelled
+        self.buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self.buffer += data
+        if len(self.buffer) >= COPY_CHUNK_SIZE:
+            self.flush()
+        return len(data)
+
+    def flush(self) -> None:
+        if self.buffer:
+            self.put(bytes(self.buffer))
+            self.buffer.clear()
+
+    def put(self, item: Any) -> None:
+        while not self.cancelled.is_set():
+            try:
+                self.chunks.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+        raise CopyCancelledError
+
+
+class CopyStream:
+    """
+    Iterator over postgres' COPY TO STDOUT output in CSV format, rowcount is set to the number of rows copied once it
+    has been exhausted.
+
+    COPY runs on its own connection in a background thread while the stream yields its output, holding at most
+    COPY_QUEUE_SIZE chunks in memory. Closing the stream, e.g. when the client goes away, cancels COPY.
+    """
+
+    def __init__(self, bind: "Engine", statement: str, params: dict) -> None:
+        self.bind = bind
+        self.statement = statement
+        self.params = params
+        self.rowcount: int | None = None
+        self._chunks: Generator[bytes, None, None] = self._stream()
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self
+
+    def __next__(self) -> bytes:
+        return next(self._chunks)
+
+    def close(self) -> None:
+        self._chunks.close()
+
+    def _copy(self, chunks: queue.Queue, cancelled: threading.Event) -> None:
+        writer = _ChunkWriter(chunks, cancelled)
+        with self.bind.connect() as conn:
+            try:
+                cursor = conn.connection.cursor()
+                # COPY doesn't take parameters, they are rendered into the statement by the driver
+                sql = cursor.mogrify(self.statement, self.params).decode()
+                cursor.copy_expert(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv)", writer)
+                writer.flush()
+                self.rowcount = cursor.rowcount
+                writer.put(None)
+            except CopyCancelledError:
+                # the connection may still be in the middle of COPY, don't return it to the pool
+                conn.invalidate()
+            except Exception as ex:
+                logger.exception("COPY export failed")
+                conn.invalidate()
+                with suppress(CopyCancelledError):
+                    writer.put(ex)
+
+    def _stream(self) -> Generator[bytes, None, None]:
+        chunks: queue.Queue = queue.Queue(maxsize=COPY_QUEUE_SIZE)
+        cancelled = threading.Event()
+        thread = threading.Thread(target=self._copy, args=(chunks, cancelled), name="copy-export", daemon=True)
+        thread.start()
+        try:
+            while (chunk := chunks.get()) is not None:
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            cancelled.set()
+
+
+def copy_csv(bind: "Engine", query: "Query") -> CopyStream:
+    """Stream the query's rows as CSV from postgres' COPY TO STDOUT"""
+    compiled = query.statement.compile(dialect=bind.dialect, compile_kwargs={"render_postcompile": True})
+    return CopyStream(bind, str(compiled), compiled.params)
+
+
+class CopyExportMixin(ModelView):
+    # Stream CSV exports straight from postgres' COPY instead of loading up to export_max_rows models and formatting
+    # them in python. Export formatters can't run in the database, columns that have one are exported from the
+    # column_export_paths path standing in for it, e.g. {"accountholder": "accountholder.account_holder_uuid"}.
+    # Booleans, timestamps and arrays are rendered as the default export renders them, other values in postgres' text
+    # format.
+    copy_export: bool = False
+    column_export_paths: ClassVar[dict[str, str]] = {}
+
+    def _apply_export_args(self, query: "Query") -> "Query":
+        """Search, filter and sort the query like the list the current request exports, without counting it"""
+        view_args = self._get_list_extra_args()
+        sort_column = self._get_column_by_idx(view_args.sort)
+        joins: dict = {}
+        if self._search_supported and view_args.search:
+            query, _, joins, _ = self._apply_search(query, None, joins, {}, view_args.search)
+        if view_args.filters and self._filters:
+            query, _, joins, _ = self._apply_filters(query, None, joins, {}, view_args.filters)
+        query, _ = self._apply_sorting(
+            query, joins, None if sort_column is None else sort_column[0], view_args.sort_desc
+        )
+        return query
+
+    def _get_copy_export_query(self) -> "Query":
+        query = self._apply_export_args(self.get_query().select_from(self.model).enable_eagerloads(False))
+        paths = []
+        for name, _ in self._export_columns:
+            if name in self.column_formatters_export and name not in self.column_export_paths:
+                raise ValueError(f"{name!r} has an export formatter but no column_export_paths entry")
+            paths.append(self.column_export_paths.get(name, name))
+
+        return export_query(query, self.model, paths)
+
+    def _copy_export_stream(self) -> CopyStream | None:
+        """The export as a COPY stream, None when the view isn't exported with COPY"""
+        if not self.copy_export or self.session.get_bind().dialect.name != "postgresql":
+            return None
+
+        try:
+            query = self._get_copy_export_query()
+        except ValueError:
+            logger.exception("Cannot export %s with COPY, falling back to the default export", self.name)
+            return None
+
+        return copy_csv(self.session.get_bind(), query)
+
+    def _get_export_csv_row(self, values: list) -> bytes:
+        row = io.StringIO()
+        csv.writer(row).writerow([csv_encode(value) for value in values])
+        return row.getvalue().encode()
+
+    def _export_csv(self, return_url: str) -> "Response":
+        if (rows := self._copy_export_stream()) is None:
+            return super()._export_csv(return_url)
+
+        header = self._get_export_csv_row([label for _, label in self._export_columns])
+        response = current_app.response_class(
+            stream_with_context(chain([header], rows)),
+            headers={"Content-Disposition": f"attachment;filename={secure_filename(self.get_export_name('csv'))}"},
+            mimetype="text/csv",
+        )
+        # chain() doesn't pass on close(), stop COPY when the client goes away before the export has been sent
+        response.call_on_close(rows.close)
+        return response
@@ -1,10 +1,21 @@
-from typing import Any
+import logging
+import time
+
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
 
 from flask_admin.babel import lazy_gettext
 from flask_admin.contrib.sqla.filters import BaseSQLAFilter
-from sqlalchemy import func
+from sqlalchemy import func, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm.query import Query
 
+if TYPE_CHECKING:
+    from flask_admin.contrib.sqla import ModelView
+    from sqlalchemy.orm import Session
+
+logger = logging.getLogger("custom-filters")
+
 
 class StringInArrayColumn(BaseSQLAFilter):
     def apply(self, query: Query, value: str, _: Any = None) -> None:
@@ -20,3 +31,89 @@ class StringNotInArrayColumn(BaseSQLAFilter):
 
     def operation(self) -> None:
         return lazy_gettext("not contains")
+
+
+class ArrayElementSuggestions:
+    """
+    The most common elements of an array column according to postgres' planner statistics, offered as tag suggestions.
+
+    Flask-Admin reads filter options when rendering every list view, the elements are loaded on first use and cached
+    for cache_ttl seconds. Reading pg_stats is cheap unlike unnesting the column, which would scan the whole table.
+    """
+
+    cache_ttl = 300
+
+    def __init__(self, column: Any, session: "Session") -> None:
+        self.column = column
+        self.session = session
+        self._elements: list[str] = []
+        self._expires_at = 0.0
+
+    def _load(self) -> list[str]:
+        if self.session.get_bind().dialect.name != "postgresql":
+            return []
+
+        try:
+            elements = self.session.execute(
+                text(
+                    "SELECT most_common_elems::text::text[] FROM pg_stats "
+                    "WHERE schemaname = current_schema() AND tablename = :table AND attname = :column"
+                ),
+                {"table": self.column.table.name, "column": self.column.name},
+            ).scalar()
+        except SQLAlchemyError:
+            logger.exception("Failed to load the most common elements of %s", self.column)
+            self.session.rollback()
+            return []
+
+        return sorted(elements or [])
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        if time.monotonic() >= self._expires_at:
+            self._elements = self._load()
+            self._expires_at = time.monotonic() + self.cache_ttl
+
+        return iter([(element, element) for element in self._elements])
+
+    def __bool__(self) -> bool:
+        # flask-admin drops falsy options, the suggestions are only known once iterated
+        return True
+
+
+class BaseArrayFilter(BaseSQLAFilter):
+    """
+    Filters array columns with postgres' array operators which, unlike the substring filters above, can use a GIN
+    index on the column. Values are entered as tags, suggesting the column's most common elements.
+    """
+
+    def __init__(self, column: Any, name: str, options: Any = None, data_type: str = "select2-tags") -> None:
+        super().__init__(column, name, options, data_type)
+        self._suggestions: ArrayElementSuggestions | None = None
+
+    def get_options(self, view: "ModelView") -> Any:
+        if self.options is not None:
+            return super().get_options(view)
+
+        if self._suggestions is None:
+            self._suggestions = ArrayElementSuggestions(self.column, view.session)
+
+        return self._suggestions
+
+    def clean(self, value: str) -> list[str]:
+        return [v.strip() for v in value.split(",") if v.strip()]
+
+
+class ArrayContainsAll(BaseArrayFilter):
+    def apply(self, query: Query, value: list[str], _: Any = None) -> Query:
+        return query.filter(self.column.contains(value))
+
+    def operation(self) -> str:
+        return lazy_gettext("contains all of")
+
+
+class ArrayContainsAny(BaseArrayFilter):
+    def apply(self, query: Query, value: list[str], _: Any = None) -> Query:
+        return query.filter(self.column.overlap(value))
+
+    def operation(self) -> str:
+        return lazy_gettext("contains any of")
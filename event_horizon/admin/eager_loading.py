@@ -0,0 +1,141 @@
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from flask import has_request_context, request
+from flask_admin.contrib.sqla import ModelView
+from sqlalchemy import inspect
+from sqlalchemy.orm import Load
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Query, RelationshipProperty
+
+
+def column_keys(model: type, columns: Iterable[str]) -> set[str] | None:
+    """
+    The model's column attributes rendering the given (dotted) columns reads, including the foreign keys of the
+    relationships they go through. None if a column isn't mapped, e.g. a property, as what it reads is unknown.
+    """
+    mapper = inspect(model)
+    keys = set()
+    for column in columns:
+        attr = column.split(".")[0]
+        if attr in mapper.column_attrs:
+            keys.add(attr)
+        elif (prop := mapper.relationships.get(attr)) is not None:
+            keys |= {mapper.get_property_by_column(local).key for local in prop.local_columns}
+        else:
+            return None
+
+    return keys
+
+
+def relationship_paths(model: type, paths: Iterable[str]) -> set[tuple["RelationshipProperty", ...]]:
+    """Resolve dotted relationship paths e.g. rewardconfig.retailer"""
+    resolved = set()
+    for path in paths:
+        mapper = inspect(model)
+        props: tuple[RelationshipProperty, ...] = ()
+        for attr in path.split("."):
+            if (prop := mapper.relationships.get(attr)) is None:
+                raise ValueError(f"{path!r} is not a relationship path of {model.__name__}")
+            props += (prop,)
+            mapper = prop.mapper
+        resolved.add(props)
+
+    return resolved
+
+
+def column_relationship_paths(model: type, columns: Iterable[str]) -> set[tuple["RelationshipProperty", ...]]:
+    """
+    Relationships rendering the given (dotted) column names goes through, e.g. campaign.retailerrewards for the
+    campaign.retailerrewards column or rewardconfig for rewardconfig.reward_slug.
+    """
+    paths = set()
+    for column in columns:
+        mapper = inspect(model)
+        path: tuple[RelationshipProperty, ...] = ()
+        for attr in column.split("."):
+            if (prop := mapper.relationships.get(attr)) is None:
+                break
+            path += (prop,)
+            mapper = prop.mapper
+
+        if path:
+            paths.add(path)
+
+    return paths
+
+
+def eager_load_options(paths: Iterable[tuple["RelationshipProperty", ...]]) -> list[Load]:
+    """
+    Loader options for the given relationship paths, collections are loaded with a separate SELECT IN query and
+    everything else is joined. Paths that are a prefix of another path are implied by it and are skipped.
+    """
+    paths = set(paths)
+    options = []
+    for path in sorted(paths, key=lambda path: [prop.key for prop in path]):
+        if any(other[: len(path)] == path and other != path for other in paths):
+            continue
+
+        option = Load(path[0].parent.class_)
+        for prop in path:
+            option = (
+                option.selectinload(prop.class_attribute) if prop.uselist else option.joinedload(prop.class_attribute)
+            )
+        options.append(option)
+
+    return options
+
+
+class ColumnLoadingMixin(ModelView):
+    # Relationship paths, e.g. "rewardconfig.retailer", loaded along with the listed or exported rows on top of the
+    # relationships named by the (dotted) list and export columns. Declare the paths formatters and related models'
+    # __str__ go through, anything missing is lazy loaded once per row.
+    column_eager_loads: tuple[str, ...] = ()
+    # Only load the list or export columns on the list and export pages, along with column_extra_loads, e.g. other
+    # columns formatters read, the primary key and the default sort columns. Everything else, e.g. JSON and YAML blobs,
+    # is left to the details and edit pages. Views listing a column that isn't mapped, e.g. a property, load every
+    # column. Opt in per view once its formatters' columns are listed or in column_extra_loads, any other column they
+    # read is lazy loaded once per row.
+    defer_unlisted_columns: bool = False
+    column_extra_loads: tuple[str, ...] = ()
+
+    def _get_eager_load_options(self, columns: list[tuple[str, str]]) -> list[Load]:
+        paths = relationship_paths(self.model, self.column_eager_loads)
+        paths |= column_relationship_paths(self.model, [name for name, _ in columns])
+        return eager_load_options(paths)
+
+    def _get_load_only_options(self, columns: list[str]) -> list[Load]:
+        if not self.defer_unlisted_columns:
+            return []
+
+        if (keys := column_keys(self.model, [*columns, *self.column_extra_loads])) is None:
+            return []
+
+        mapper = inspect(self.model)
+        keys |= {mapper.get_property_by_column(col).key for col in mapper.primary_key}
+        keys |= {field.key for field, _, _ in self._get_default_order() if getattr(field, "class_", None) is self.model}
+        if keys >= set(mapper.column_attrs.keys()):
+            return []
+
+        return [Load(self.model).load_only(*(getattr(self.model, key) for key in sorted(keys)))]
+
+    def _refresh_cache(self) -> None:
+        super()._refresh_cache()
+        self._list_eager_load_options = self._get_eager_load_options(self._list_columns)
+        self._export_eager_load_options = self._get_eager_load_options(self._export_columns)
+        self._list_load_only_options = self._get_load_only_options(
+            [name for name, _ in self._list_columns] + list(self.column_editable_list or ())
+        )
+        self._export_load_only_options = self._get_load_only_options([name for name, _ in self._export_columns])
+
+    def get_query(self) -> "Query":
+        endpoint = request.endpoint if has_request_context() else None
+        if endpoint == f"{self.endpoint}.export":
+            options = [*self._export_eager_load_options, *self._export_load_only_options]
+        elif endpoint == f"{self.endpoint}.index_view":
+            options = [*self._list_eager_load_options, *self._list_load_only_options]
+        else:
+            # actions and anything else working on the models get every column
+            options = self._list_eager_load_options
+        return super().get_query().options(*options)
@@ -0,0 +1,247 @@
+import gzip
+import io
+import logging
+import time
+
+from collections.abc import Callable
+from contextlib import closing
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from flask import abort, current_app, flash, redirect, request, send_file
+from flask_admin import expose
+from flask_admin.helpers import get_redirect_target
+from rq import Queue, get_current_job
+from rq.exceptions import NoSuchJobError
+from rq.job import Job
+from werkzeug.utils import secure_filename
+
+from event_horizon.admin.copy_export import CopyExportMixin, CopyStream
+from event_horizon.admin.time_windows import TIME_WINDOWS, TimeWindowMixin
+
+from event_horizon.settings import (
+    EXPORT_ARTEFACTS_DIR,
+    EXPORT_ARTEFACTS_TTL,
+    EXPORT_JOB_TIMEOUT,
+    EXPORT_QUEUE_NAME,
+    redis,
+)
+
+if TYPE_CHECKING:
+    from event_horizon.admin.model_views import BaseModelView
+
+logger = logging.getLogger("export-jobs")
+
+# ids of the latest export jobs of each view, newest first
+EXPORT_JOBS_KEY = "event-horizon:export-jobs:{endpoint}"
+MAX_LISTED_JOBS = 20
+# a running job's progress is saved at most this often
+PROGRESS_INTERVAL = 2.0
+# rows loaded at a time by background exports
+EXPORT_BATCH_SIZE = 1000
+# the export jobs page reloads this often while a job is running
+EXPORT_JOBS_REFRESH_SECONDS = 5
+
+export_queue = Queue(EXPORT_QUEUE_NAME, connection=redis)
+
+
+def artefact_path(job_id: str) -> Path:
+    return Path(EXPORT_ARTEFACTS_DIR) / f"{job_id}.csv.gz"
+
+
+def expire_artefacts() -> int:
+    """Delete the artefacts of jobs that finished more than EXPORT_ARTEFACTS_TTL seconds ago, their jobs have expired"""
+    expired = 0
+    oldest = time.time() - EXPORT_ARTEFACTS_TTL
+    for path in Path(EXPORT_ARTEFACTS_DIR).glob("*.csv.gz*"):
+        if path.stat().st_mtime < oldest:
+            path.unlink(missing_ok=True)
+            expired += 1
+
+    return expired
+
+
+def enqueue_export(view: "BackgroundExportMixin", query_string: str, requested_by: str, filters: list[str]) -> Job:
+    """
+    Queue an export of the view's list for the search, filters and sort order in query_string, filters describes them
+    to users.
+    """
+    job = export_queue.enqueue(
+        run_export,
+        view.endpoint,
+        query_string,
+        job_timeout=EXPORT_JOB_TIMEOUT,
+        result_ttl=EXPORT_ARTEFACTS_TTL,
+        failure_ttl=EXPORT_ARTEFACTS_TTL,
+        meta={
+            "endpoint": view.endpoint,
+            "name": view.name,
+            "requested_by": requested_by,
+            "filters": filters,
+            "rows": 0,
+        },
+    )
+    key = EXPORT_JOBS_KEY.format(endpoint=view.endpoint)
+    with redis.pipeline() as pipe:
+        pipe.lpush(key, job.id)
+        pipe.ltrim(key, 0, MAX_LISTED_JOBS - 1)
+        pipe.expire(key, EXPORT_ARTEFACTS_TTL)
+        pipe.execute()
+
+    return job
+
+
+def list_exports(endpoint: str) -> list[Job]:
+    job_ids = [job_id.decode() for job_id in redis.lrange(EXPORT_JOBS_KEY.format(endpoint=endpoint), 0, -1)]
+    return [job for job in Job.fetch_many(job_ids, connection=redis) if job is not None]
+
+
+def _get_view(endpoint: str) -> "BaseModelView":
+    for admin in current_app.extensions["admin"]:
+        for view in admin._views:
+            if view.endpoint == endpoint:
+                return view
+
+    raise ValueError(f"No admin view with endpoint {endpoint!r}")
+
+
+def run_export(endpoint: str, query_string: str) -> int:
+    """
+    Write the view's export to a gzipped CSV artefact, returns the number of rows exported.
+
+    Runs on the export worker, the view builds its query in a request for its export url so that the job exports
+    exactly what the user was looking at.
+    """
+    job = get_current_job()
+    view = _get_view(endpoint)
+    expire_artefacts()
+
+    last_saved = time.monotonic()
+
+    def save_progress(rows: int) -> None:
+        nonlocal last_saved
+        if job is not None and time.monotonic() - last_saved >= PROGRESS_INTERVAL:
+            job.meta["rows"] = rows
+            job.save_meta()
+            last_saved = time.monotonic()
+
+    path = artefact_path(job.id if job is not None else endpoint)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = path.with_name(f"{path.name}.partial")
+    try:
+        with current_app.test_request_context(f"{view.url}/export/csv/?{query_string}"):
+            if view._deferred_init is not None:
+                view._complete_deferred_init()
+
+            with gzip.open(partial_path, "wb") as artefact:
+                rows = view.write_export_csv(artefact, save_progress)
+
+        partial_path.rename(path)
+    finally:
+        partial_path.unlink(missing_ok=True)
+        # the worker keeps its app context between jobs, don't hold on to this job's session
+        view.session.remove()
+
+    logger.info("Exported %d %s rows to %s", rows, view.name, path)
+    if job is not None:
+        job.meta.update(rows=rows, size=path.stat().st_size)
+        job.save_meta()
+
+    return rows
+
+
+class BackgroundExportMixin(CopyExportMixin, TimeWindowMixin):
+    # Let users queue exports as background jobs that write a gzipped CSV file, see run_export.
+    background_export: bool = False
+
+    def write_export_csv(self, file: io.BufferedIOBase, progress: Callable[[int], None] | None = None) -> int:
+        """
+        Write the current request's export to file as CSV without export_max_rows' limit, returning the number of rows.
+
+        progress is called with the number of rows written so far, it is approximate for COPY exports.
+        """
+        file.write(self._get_export_csv_row([label for _, label in self._export_columns]))
+        if (stream := self._copy_export_stream()) is not None:
+            return self._write_copy_export(file, stream, progress)
+
+        return self._write_model_export(file, progress)
+
+    @staticmethod
+    def _write_copy_export(file: io.BufferedIOBase, stream: CopyStream, progress: Callable[[int], None] | None) -> int:
+        written = 0
+        with closing(stream):
+            for chunk in stream:
+                file.write(chunk)
+                written += chunk.count(b"\n")
+                if progress is not None:
+                    progress(written)
+
+        return stream.rowcount if stream.rowcount is not None else written
+
+    def _write_model_export(self, file: io.BufferedIOBase, progress: Callable[[int], None] | None) -> int:
+        # the rows are streamed in batches and never counted, unlike get_list
+        written = 0
+        for row in self._apply_export_args(self.get_query()).yield_per(EXPORT_BATCH_SIZE):
+            file.write(self._get_export_csv_row([self.get_export_value(row, name) for name, _ in self._export_columns]))
+            written += 1
+            if progress is not None and written % EXPORT_BATCH_SIZE == 0:
+                progress(written)
+
+        return written
+
+    def _describe_list_args(self) -> list[str]:
+        """The current request's search, filters and time window as shown to users"""
+        view_args = self._get_list_extra_args()
+        description = [f"Search: {view_args.search}"] if view_args.search else []
+        for idx, _, value in view_args.filters or []:
+            flt = self._filters[idx]
+            description.append(f"{flt.name} {flt.operation()} {value}")
+        if (window := self._get_time_window()) is not None:
+            description.append(TIME_WINDOWS[window][0])
+
+        return description
+
+    @expose("/export-jobs/", methods=("GET", "POST"))
+    def export_jobs_view(self) -> Any:
+        if not self.can_export or not self.background_export:
+            return abort(404)
+
+        if request.method == "POST":
+            query_string, requested_by = request.form.get("query", ""), self.sso_username
+            # describe the list the export was requested from rather than this request
+            with current_app.test_request_context(f"{self.url}/export/csv/?{query_string}"):
+                job = enqueue_export(self, query_string, requested_by, self._describe_list_args())
+            flash(f"Export {job.id} queued, it will be ready to download from this page.")
+            return redirect(self.get_url(".export_jobs_view", url=get_redirect_target()))
+
+        jobs = list_exports(self.endpoint)
+        running = any(job.get_status() in ("queued", "deferred", "scheduled", "started") for job in jobs)
+        return self.render(
+            "eh_export_jobs.html",
+            jobs=jobs,
+            query=request.args.get("query"),
+            refresh=EXPORT_JOBS_REFRESH_SECONDS if running else None,
+            return_url=get_redirect_target() or self.get_url(".index_view"),
+        )
+
+    @expose("/export-jobs/<job_id>/download/")
+    def export_job_download_view(self, job_id: str) -> Any:
+        if not self.can_export or not self.background_export:
+            return abort(404)
+
+        try:
+            job = Job.fetch(job_id, connection=redis)
+        except NoSuchJobError:
+            job = None
+
+        path = artefact_path(job_id)
+        if job is None or job.meta.get("endpoint") != self.endpoint or not job.is_finished or not path.exists():
+            flash("This export is not available, it may have expired.", category="error")
+            return redirect(self.get_url(".export_jobs_view"))
+
+        return send_file(
+            path.resolve(),
+            mimetype="application/gzip",
+            as_attachment=True,
+            download_name=f"{secure_filename(job.meta['name'])}_{job_id}.csv.gz",
+        )
@@ -0,0 +1,115 @@
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from flask_admin.contrib.sqla.fields import QuerySelectField, QuerySelectMultipleField
+from flask_admin.contrib.sqla.form import AdminModelConverter
+from sqlalchemy import inspect
+from sqlalchemy.orm import scoped_session
+from wtforms import Form, ValidationError
+
+from event_horizon.db import ReferenceDataMixin
+from event_horizon.reference_cache import reference_cache
+
+
+class _CachedChoicesMixin:
+    """
+    Lists the choices of a reference data model from the reference cache rather than loading the whole table each
+    time the form is rendered, only the submitted models are loaded. A query set on the field is used as it is.
+    """
+
+    def __init__(self, *args: Any, model: type, session: scoped_session, **kwargs: Any) -> None:
+        super().__init__(*args, query_factory=lambda: session.query(model), **kwargs)  # type: ignore [call-arg]
+        self.model = model
+        self.session = session
+
+    def _get_choices(self) -> list[list[str]]:
+        return reference_cache.get(
+            inspect(self.model).local_table.name,
+            "choices",
+            lambda: [[str(self.get_pk(obj)), str(self.get_label(obj))] for obj in self.query_factory()],  # type: ignore
+        )
+
+    def _load(self, pks: Iterable[str]) -> tuple[list, bool]:
+        """The models with the submitted primary keys and whether they were all found"""
+        pk_column = inspect(self.model).primary_key[0]
+        values = set()
+        for pk in pks:
+            try:
+                values.add(pk_column.type.python_type(pk))
+            except (ValueError, NotImplementedError):
+                return [], False
+
+        models = self.session.query(self.model).filter(pk_column.in_(values)).all() if values else []
+        return models, len(models) == len(values)
+
+
+class CachedQuerySelectField(_CachedChoicesMixin, QuerySelectField):
+    def _get_data(self) -> Any:
+        if self.query is None and self._formdata is not None:
+            models, _ = self._load([self._formdata])
+            self._set_data(models[0] if models else None)
+        return super()._get_data()
+
+    data = property(_get_data, QuerySelectField._set_data)
+
+    def iter_choices(self) -> Iterator[tuple[str, str, bool]]:
+        if self.query is not None:
+            yield from super().iter_choices()
+            return
+
+        if self.allow_blank:
+            yield ("__None", self.blank_text, self.data is None)
+
+        selected = None if self.data is None else str(self.get_pk(self.data))
+        for pk, label in self._get_choices():
+            yield (pk, label, pk == selected)
+
+    def pre_validate(self, form: Form) -> None:
+        if self.query is not None:
+            return super().pre_validate(form)
+
+        if not self.allow_blank and self.data is None:
+            raise ValidationError(self.gettext("Not a valid choice"))
+
+
+class CachedQuerySelectMultipleField(_CachedChoicesMixin, QuerySelectMultipleField):
+    def _get_data(self) -> Any:
+        if self.query is None and self._formdata is not None:
+            models, found = self._load(self._formdata)
+            self._invalid_formdata = not found
+            self._set_data(models)
+        return super()._get_data()
+
+    data = property(_get_data, QuerySelectMultipleField._set_data)
+
+    def iter_choices(self) -> Iterator[tuple[str, str, bool]]:
+        if self.query is not None:
+            yield from super().iter_choices()
+            return
+
+        selected = {str(self.get_pk(obj)) for obj in self.data}
+        for pk, label in self._get_choices():
+            yield (pk, label, pk in selected)
+
+    def pre_validate(self, form: Form) -> None:
+        if self.query is not None:
+            return super().pre_validate(form)
+
+        if self._invalid_formdata:
+            raise ValidationError(self.gettext("Not a valid choice"))
+
+
+class ReferenceDataModelConverter(AdminModelConverter):
+    """Relationships to reference data models are chosen from select fields listing the reference cache's choices"""
+
+    def _model_select_field(self, prop: Any, multiple: bool, remote_model: type, **kwargs: Any) -> Any:
+        if (
+            issubclass(remote_model, ReferenceDataMixin)
+            and "query_factory" not in kwargs
+            and prop.key not in getattr(self.view, "_form_ajax_refs", {})
+            and len(inspect(remote_model).primary_key) == 1
+        ):
+            field_class = CachedQuerySelectMultipleField if multiple else CachedQuerySelectField
+            return field_class(model=remote_model, session=self.session, **kwargs)
+
+        return super()._model_select_field(prop, multiple, remote_model, **kwargs)
@@ -0,0 +1,113 @@
+from datetime import datetime
+from itertools import starmap
+from typing import TYPE_CHECKING, Any
+
+from flask import flash, request
+from flask_admin.contrib.sqla import ModelView
+from flask_admin.model.base import ViewArgs
+from flask_admin.tools import iterdecode, iterencode
+from sqlalchemy import inspect, tuple_
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Query  # pragma: no cover
+    from sqlalchemy.orm.attributes import InstrumentedAttribute  # pragma: no cover
+
+KEYSET_CURSOR_ARGS = ("after", "before")
+
+
+def encode_cursor(fields: list["InstrumentedAttribute"], row: object) -> str:
+    values = (getattr(row, field.key) for field in fields)
+    return iterencode(value.isoformat() if isinstance(value, datetime) else str(value) for value in values)
+
+
+def _decode_value(field: "InstrumentedAttribute", value: str) -> Any:
+    python_type = field.property.columns[0].type.python_type
+    return python_type.fromisoformat(value) if python_type is datetime else python_type(value)
+
+
+def decode_cursor(fields: list["InstrumentedAttribute"], cursor: str) -> tuple:
+    values = iterdecode(cursor)
+    if len(values) != len(fields):
+        raise ValueError(f"Expected {len(fields)} cursor values, got {len(values)}")
+
+    return tuple(starmap(_decode_value, zip(fields, values, strict=True)))
+
+
+def seek(
+    query: "Query", fields: list["InstrumentedAttribute"], cursor: tuple | None, *, desc: bool, backwards: bool
+) -> "Query":
+    """Order the query by fields and skip to the rows after the cursor, or before it when seeking backwards"""
+    if cursor is not None:
+        keyset = tuple_(*fields)
+        query = query.filter(keyset < cursor if desc != backwards else keyset > cursor)
+
+    return query.order_by(None).order_by(*(field.asc() if desc == backwards else field.desc() for field in fields))
+
+
+class KeysetPaginationMixin(ModelView):
+    # Page through the list with (column_default_sort, primary key) cursors instead of OFFSET and skip the total
+    # count. Only used while the list is in its default order, choosing another sort column falls back to OFFSET.
+    keyset_pagination: bool = False
+
+    def _get_keyset_order(self) -> tuple[list["InstrumentedAttribute"], bool] | None:
+        order = list(self._get_default_order())
+        if len(order) != 1:
+            return None
+
+        sort_field, sort_joins, sort_desc = order[0]
+        if sort_joins or getattr(sort_field, "class_", None) is not self.model:
+            return None
+
+        mapper = inspect(self.model)
+        pk_fields = [getattr(self.model, mapper.get_property_by_column(col).key) for col in mapper.primary_key]
+        return [sort_field, *(field for field in pk_fields if field.key != sort_field.key)], bool(sort_desc)
+
+    def _get_keyset_cursor(self, fields: list["InstrumentedAttribute"]) -> tuple[tuple | None, bool]:
+        """The requested cursor and whether it seeks backwards, no cursor if it is missing or invalid"""
+        after, before = (request.args.get(arg) for arg in KEYSET_CURSOR_ARGS)
+        if not (cursor_arg := before or after):
+            return None, False
+
+        try:
+            return decode_cursor(fields, cursor_arg), before is not None
+        except (ValueError, TypeError):
+            flash("Invalid page cursor, showing the first page.", category="error")
+            return None, False
+
+    def _get_keyset_url(self, cursor_arg: str, fields: list["InstrumentedAttribute"], row: object) -> str:
+        view_args = self._get_list_extra_args()
+        view_args.extra_args[cursor_arg] = encode_cursor(fields, row)
+        return self._get_list_url(view_args)
+
+    def _get_list_extra_args(self) -> ViewArgs:
+        # cursors only make sense for the current search, filters and sort order, leave them out of every other url
+        view_args = super()._get_list_extra_args()
+        for arg in KEYSET_CURSOR_ARGS:
+            view_args.extra_args.pop(arg, None)
+        return view_args
+
+    def _get_keyset_page(
+        self,
+        keyset_order: tuple[list["InstrumentedAttribute"], bool],
+        search: str | None,
+        filters: list | None,
+        page_size: int,
+    ) -> list:
+        fields, desc = keyset_order
+        cursor, backwards = self._get_keyset_cursor(fields)
+
+        # search, filters and their joins are applied as usual, only the ordering and paging are replaced
+        _, query = super().get_list(None, None, None, search, filters, execute=False, page_size=False)
+        rows = seek(query, fields, cursor, desc=desc, backwards=backwards).limit(page_size + 1).all()
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        # a previous page is fetched by seeking backwards from its first row and reversing the result
+        if backwards:
+            rows.reverse()
+
+        has_previous, has_next = (has_more, True) if backwards else (cursor is not None, has_more)
+        self._template_args["keyset_pager"] = {
+            "previous_url": self._get_keyset_url("before", fields, rows[0]) if has_previous and rows else None,
+            "next_url": self._get_keyset_url("after", fields, rows[-1]) if has_next and rows else None,
+        }
+        return rows
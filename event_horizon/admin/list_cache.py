@@ -0,0 +1,168 @@
+import hashlib
+import json
+import logging
+import time
+import uuid
+
+from collections.abc import Callable
+from typing import Any
+
+from flask_admin.contrib.sqla import ModelView, tools
+from redis import Redis
+from redis.exceptions import RedisError
+
+from event_horizon.admin.list_counts import ListCount
+from event_horizon.settings import (
+    LIST_CACHE_LOCK_TIMEOUT,
+    LIST_CACHE_STALE_TTL,
+    LIST_CACHE_TTL,
+    redis,
+)
+
+logger = logging.getLogger("list-cache")
+
+LIST_CACHE_KEY = "event-horizon:list:{view}:{digest}"
+# how often a request waiting for another one to load the same list checks for its result
+POLL_INTERVAL = 0.05
+
+
+class ListResultCache:
+    """
+    Stale-while-revalidate cache of list view results in Redis, keyed by view and the list's parameters e.g. its
+    search, filters, sort order and page.
+
+    Results are fresh for ttl seconds and then served stale for up to stale_ttl more seconds while a single request
+    refreshes them. Identical requests made while a result is being loaded for the first time wait for it rather than
+    running the same query, for as long as the loading request holds its lock, at most lock_timeout seconds. If the
+    lock is released or expires without a result, e.g. the loading request failed, one of the waiting requests takes
+    it over. Redis being unavailable only costs the query.
+    """
+
+    def __init__(self, redis: Redis, ttl: int, stale_ttl: int, lock_timeout: int) -> None:
+        self.redis = redis
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+
+    @staticmethod
+    def make_key(view: str, params: dict) -> str:
+        digest = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return LIST_CACHE_KEY.format(view=view, digest=digest)
+
+    def _read(self, key: str) -> tuple[float, Any] | None:
+        try:
+            cached = self.redis.get(key)
+        except RedisError:
+            logger.warning("Failed to read %s from the list cache", key, exc_info=True)
+            return None
+
+        if cached is None:
+            return None
+
+        stored_at, value = json.loads(cached)
+        return stored_at, value
+
+    def _lock(self, key: str) -> str | None:
+        """A token to unlock the key with if this request should load it, None if another request already is"""
+        token = uuid.uuid4().hex
+        try:
+            locked = self.redis.set(f"{key}:lock", token, nx=True, ex=self.lock_timeout)
+        except RedisError:
+            logger.warning("Failed to lock %s in the list cache", key, exc_info=True)
+            return token
+
+        return token if locked else None
+
+    def _unlock(self, key: str, token: str) -> None:
+        try:
+            # leave the lock alone if it timed out and was taken by another request, at worst the list is loaded twice
+            if self.redis.get(f"{key}:lock") == token.encode():
+                self.redis.delete(f"{key}:lock")
+        except RedisError:
+            logger.warning("Failed to unlock %s in the list cache", key, exc_info=True)
+
+    def _load(self, key: str, token: str, loader: Callable[[], Any]) -> Any:
+        try:
+            value = json.loads(json.dumps(loader()))
+            try:
+                self.redis.set(key, json.dumps([time.time(), value]), ex=self.ttl + self.stale_ttl)
+            except RedisError:
+                logger.warning("Failed to write %s to the list cache", key, exc_info=True)
+        finally:
+            self._unlock(key, token)
+
+        return value
+
+    def _wait(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Wait for the request holding the key's lock to load it, or load it once the lock is free"""
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            if (entry := self._read(key)) is not None:
+                return entry[1]
+
+            # the loading request failed or its lock expired, only one of the waiting requests loads the result
+            if (token := self._lock(key)) is not None:
+                return self._load(key, token, loader)
+
+        logger.warning("Timed out waiting for %s to be loaded, loading it again", key)
+        return loader()
+
+    def get(self, view: str, params: dict, loader: Callable[[], Any]) -> Any:
+        """The view's cached result for params, loader is called to load it when missing or stale"""
+        if not self.ttl:
+            return loader()
+
+        key = self.make_key(view, params)
+        if (entry := self._read(key)) is not None:
+            stored_at, value = entry
+            if stored_at + self.ttl > time.time() or (token := self._lock(key)) is None:
+                return value
+
+            return self._load(key, token, loader)
+
+        if (token := self._lock(key)) is not None:
+            return self._load(key, token, loader)
+
+        return self._wait(key, loader)
+
+
+list_cache = ListResultCache(
+    redis,
+    ttl=LIST_CACHE_TTL,
+    stale_ttl=LIST_CACHE_STALE_TTL,
+    lock_timeout=LIST_CACHE_LOCK_TIMEOUT,
+)
+
+
+class ListCacheMixin(ModelView):
+    # Cache the primary keys and count of the rows listed for each search, filter, sort order and page in Redis, see
+    # ListResultCache. Only the listed rows are loaded from the database while a result is cached, so edits show up
+    # straight away but new rows only once it expires. Meant for read-only, heavily browsed views.
+    cache_list_results: bool = False
+
+    def _get_cached_list(
+        self, params: dict, load_page: Callable[[], tuple[int | None, list]]
+    ) -> tuple[ListCount | None, list]:
+        """The page of rows listed for params, load_page lists them when they aren't cached"""
+
+        def load() -> dict:
+            count, rows = load_page()
+            return {
+                "count": None if count is None else [int(count), str(count)],
+                "pks": [self.get_pk_value(row) for row in rows],
+                "keyset_pager": self._template_args.get("keyset_pager"),
+            }
+
+        result = list_cache.get(self.endpoint, params, load)
+        if result["keyset_pager"] is not None:
+            self._template_args["keyset_pager"] = result["keyset_pager"]
+
+        # the cached rows are loaded again by primary key, in the cached order, rows deleted since are left out
+        rows = {}
+        if result["pks"]:
+            for row in tools.get_query_for_ids(self.get_query(), self.model, result["pks"]).all():
+                rows[self.get_pk_value(row)] = row
+
+        count = None if result["count"] is None else ListCount(*result["count"])
+        return count, [rows[pk] for pk in result["pks"] if pk in rows]
@@ -0,0 +1,67 @@
+from typing import TYPE_CHECKING, Literal
+
+from flask_admin.contrib.sqla import ModelView
+from sqlalchemy import func, inspect
+from sqlalchemy.sql import text
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Query  # pragma: no cover
+
+
+class ListCount(int):
+    """
+    A row count that is displayed along with how it was counted, e.g. ~1200 or 10000+
+    """
+
+    label: str
+
+    def __new__(cls, value: int, label: str | None = None) -> "ListCount":
+        count = super().__new__(cls, value)
+        count.label = str(value) if label is None else label
+        return count
+
+    def __str__(self) -> str:
+        return self.label
+
+
+class ListCountMixin(ModelView):
+    # How the list's total is counted: "exact" runs COUNT(*) over the filtered query, "estimated" uses the planner's
+    # estimate (pg_class.reltuples when unfiltered, EXPLAIN otherwise) and "capped" stops counting after count_cap rows.
+    count_strategy: Literal["exact", "estimated", "capped"] = "exact"
+    count_cap: int = 10_000
+    # Render the rows straight away and fetch the total from count_view once the page has loaded.
+    deferred_count: bool = False
+
+    def _estimate_count(self, query: "Query", *, filtered: bool) -> int | None:
+        if self.session.get_bind().dialect.name != "postgresql":
+            return None
+
+        if not filtered:
+            reltuples = self.session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": inspect(self.model).local_table.fullname},
+            ).scalar()
+            # tables that have never been vacuumed or analysed have no estimate
+            if reltuples is not None and reltuples >= 0:
+                return reltuples
+
+        compiled = query.enable_eagerloads(False).statement.compile(
+            dialect=self.session.get_bind().dialect, compile_kwargs={"render_postcompile": True}
+        )
+        plan = self.session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _count_list_rows(self, query: "Query", *, filtered: bool) -> ListCount:
+        query = query.limit(None).offset(None).order_by(None)
+        if (
+            self.count_strategy == "estimated"
+            and (estimate := self._estimate_count(query, filtered=filtered)) is not None
+        ):
+            return ListCount(estimate, f"~{estimate}")
+
+        if self.count_strategy == "capped":
+            capped = query.enable_eagerloads(False).limit(self.count_cap + 1).subquery()
+            count = self.session.query(func.count()).select_from(capped).scalar()
+            return ListCount(self.count_cap, f"{self.count_cap}+") if count > self.count_cap else ListCount(count)
+
+        return ListCount(query.count())
@@ -1,12 +1,31 @@
 import logging
+import threading
+from collections.abc import Callable
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, ClassVar
+from inspect import signature
+from typing import TYPE_CHECKING, Any, ClassVar
 
-from flask import abort, flash, redirect, session, url_for
-from flask_admin.contrib.sqla import ModelView
+from flask import abort, flash, redirect, request, session, url_for
+from flask_admin import BaseView, expose
+from flask_admin.contrib.sqla import ModelView, filters, tools
+from flask_admin.model.base import ViewArgs
+from sqlalchemy import inspect, select
+
+from event_horizon.admin.ajax_loaders import IndexedAjaxModelLoader
+from event_horizon.admin.eager_loading import ColumnLoadingMixin
+from event_horizon.admin.export_jobs import BackgroundExportMixin
+from event_horizon.admin.fields import ReferenceDataModelConverter
+from event_horizon.admin.keyset_pagination import KEYSET_CURSOR_ARGS, KeysetPaginationMixin
+from event_horizon.admin.list_cache import ListCacheMixin, list_cache
+from event_horizon.admin.list_counts import ListCountMixin
+from event_horizon.admin.search import SearchPlannerMixin, column_search_kind
+from event_horizon.db import ReferenceDataMixin, is_mapped, prepare_deferred_automap_base
+from event_horizon.reference_cache import reference_cache
 
 if TYPE_CHECKING:
+    from sqlalchemy.orm.attributes import InstrumentedAttribute  # pragma: no cover
     from werkzeug.wrappers import Response  # pragma: no cover
+    from wtforms import Form  # pragma: no cover
 
 
 class UserSessionMixin:
@@ -78,18 +97,201 @@ class AuthorisedModelView(ModelView, UserSessionMixin):
         return self.can_edit
 
 
-class BaseModelView(AuthorisedModelView):
+class BaseModelView(
+    ColumnLoadingMixin,
+    SearchPlannerMixin,
+    KeysetPaginationMixin,
+    ListCountMixin,
+    ListCacheMixin,
+    BackgroundExportMixin,
+    AuthorisedModelView,
+):
     """
-    Set some baseline behaviour for all ModelViews
+    Set some baseline behaviour for all ModelViews, the opt-in list, search and export features are set up by the
+    mixins it is made of
     """
 
     list_template = "eh_list.html"
     edit_template = "eh_edit.html"
     create_template = "eh_create.html"
+    # relationships to ReferenceDataMixin models list their choices from the reference cache
+    model_form_converter = ReferenceDataModelConverter
     column_default_sort: None | str | tuple[str, bool] = ("created_at", True)
     form_excluded_columns: tuple[str, ...] = ("created_at", "updated_at")
+    _deferred_init: tuple[tuple, dict] | None = None
+
+    def __init__(self, model: type, *args: Any, **kwargs: Any) -> None:
+        if is_mapped(model):
+            super().__init__(model, *args, **kwargs)
+            return
+
+        # The model's database has not been reflected yet, only set up what is needed to register the view and
+        # its menu entry and finish initialising the view the first time it is accessed.
+        self._deferred_init = ((model, *args), kwargs)
+        self._deferred_init_lock = threading.Lock()
+        params = signature(ModelView.__init__).bind(self, model, *args, **kwargs)
+        params.apply_defaults()
+        self.model = model
+        self.session = params.arguments["session"]
+        BaseView.__init__(
+            self,
+            params.arguments["name"] or self._prettify_class_name(model.__name__),
+            params.arguments["category"],
+            params.arguments["endpoint"],
+            params.arguments["url"],
+            params.arguments["static_folder"],
+            menu_class_name=params.arguments["menu_class_name"],
+            menu_icon_type=params.arguments["menu_icon_type"],
+            menu_icon_value=params.arguments["menu_icon_value"],
+        )
+
+    def _complete_deferred_init(self) -> None:
+        with self._deferred_init_lock:
+            if self._deferred_init is None:
+                return
+
+            args, kwargs = self._deferred_init
+            prepare_deferred_automap_base(self.model)
+            # keep what was set up when the view was registered with the admin
+            registration = {attr: getattr(self, attr) for attr in ("admin", "blueprint", "url", "menu")}
+            super().__init__(*args, **kwargs)
+            self.__dict__.update(registration)
+            self._deferred_init = None
+
+    def _handle_view(self, name: str, **kwargs: Any) -> Any:
+        if (resp := super()._handle_view(name, **kwargs)) is not None or self._deferred_init is None:
+            return resp
+
+        try:
+            self._complete_deferred_init()
+        except Exception as ex:
+            logging.exception("Failed to prepare models for %s", self.name, exc_info=ex)
+            return abort(503)
+
+        return None
+
+    def _invalidate_reference_data(self) -> None:
+        if issubclass(self.model, ReferenceDataMixin):
+            reference_cache.invalidate(inspect(self.model).local_table.name)
+
+    def after_model_change(self, form: "Form", model: Any, is_created: bool) -> None:  # noqa: ARG002
+        self._invalidate_reference_data()
+
+    def after_model_delete(self, model: Any) -> None:  # noqa: ARG002
+        self._invalidate_reference_data()
+
+    def handle_action(self, return_view: str | None = None) -> "Response":
+        try:
+            return super().handle_action(return_view)
+        finally:
+            self._invalidate_reference_data()
+
+    def _get_reference_filter_options(self, field: "InstrumentedAttribute") -> Callable[[], list[tuple[str, str]]]:
+        def options() -> list[tuple[str, str]]:
+            values = reference_cache.get(
+                inspect(field.class_).local_table.name,
+                f"values:{field.key}",
+                lambda: self.session.scalars(select(field).where(field.isnot(None)).distinct().order_by(field)).all(),
+            )
+            return [(value, value) for value in values]
+
+        return options
+
+    def scaffold_filters(self, name: Any) -> list | None:
+        flts = super().scaffold_filters(name)
+        if not isinstance(name, str) or not flts:
+            return flts
+
+        # equality filters on the text columns of reference data, e.g. retailerrewards.slug, choose from their values
+        field, _ = tools.get_field_with_path(self.model, name)
+        if (
+            isinstance(getattr(field, "class_", None), type)
+            and issubclass(field.class_, ReferenceDataMixin)
+            and not tools.is_relationship(field)
+            and column_search_kind(field) == "text"
+        ):
+            for flt in flts:
+                if type(flt) in (filters.FilterEqual, filters.FilterNotEqual) and flt.options is None:
+                    flt.options = self._get_reference_filter_options(field)
+
+        return flts
+
+    def _create_ajax_loader(self, name: str, options: dict) -> IndexedAjaxModelLoader:
+        # form_ajax_refs point at large tables, look them up with index friendly prefix and exact matches
+        return IndexedAjaxModelLoader(name, self.session, getattr(self.model, name).prop.mapper.class_, **options)
+
+    @property
+    def simple_list_pager(self) -> bool:
+        # Flask-Admin only counts exactly, every other strategy is counted by get_list or count_view
+        return self.keyset_pagination or self.deferred_count or self.count_strategy != "exact"
+
+    @expose("/count/")
+    def count_view(self) -> dict:
+        view_args = self._get_list_extra_args()
+        _, query = super().get_list(
+            None, None, None, view_args.search, view_args.filters, execute=False, page_size=False
+        )
+
+        def load() -> dict:
+            count = self._count_list_rows(query, filtered=self._is_filtered(view_args.search, view_args.filters))
+            return {"count": int(count), "label": str(count)}
+
+        if not self.cache_list_results:
+            return load()
+
+        return list_cache.get(self.endpoint, {"count": self._get_list_cache_params(view_args)}, load)
+
+    def _is_filtered(self, search: str | None, filters: list | None) -> bool:
+        return bool(search or filters) or self._is_time_windowed()
+
+    def get_list(  # noqa: PLR0913
+        self,
+        page: int | None,
+        sort_column: str | None,
+        sort_desc: bool,
+        search: str | None,
+        filters: list | None,
+        execute: bool = True,
+        page_size: int | None = None,
+    ) -> tuple[int | None, Any]:
+        if page_size is None:
+            page_size = self.page_size
+
+        self._set_time_window_selector()
+        if self.cache_list_results and execute and page_size and request.endpoint == f"{self.endpoint}.index_view":
+            params = {"page": page, "sort": sort_column, "desc": sort_desc, "page_size": page_size}
+            params |= self._get_list_cache_params(ViewArgs(search=search, filters=filters))
+            return self._get_cached_list(
+                params, lambda: self._get_list(page, sort_column, sort_desc, search, filters, True, page_size)
+            )
+
+        return self._get_list(page, sort_column, sort_desc, search, filters, execute, page_size)
+
+    def _get_list(  # noqa: PLR0913
+        self,
+        page: int | None,
+        sort_column: str | None,
+        sort_desc: bool,
+        search: str | None,
+        filters: list | None,
+        execute: bool,
+        page_size: int | None,
+    ) -> tuple[int | None, Any]:
+        keyset_order = self._get_keyset_order() if self.keyset_pagination and sort_column is None else None
+        if keyset_order is not None and execute and page_size:
+            return None, self._get_keyset_page(keyset_order, search, filters, page_size)
+
+        count, query = super().get_list(page, sort_column, sort_desc, search, filters, False, page_size)
+        if count is None and not self.keyset_pagination and not self.deferred_count:
+            count = self._count_list_rows(query, filtered=self._is_filtered(search, filters))
+
+        return count, query.all() if execute else query
+
+    def _get_list_cache_params(self, view_args: ViewArgs) -> dict:
+        params = {"search": view_args.search, "filters": view_args.filters, "window": self._get_time_window()}
+        return params | {arg: request.args.get(arg) for arg in KEYSET_CURSOR_ARGS}
 
-    def get_list_columns(self) -> list[str]:
+    def get_list_columns(self) -> list[tuple[str, str]]:
         # Shunt created_at and updated_at to the end of the table
         list_columns = super().get_list_columns()
         for name in ("created_at", "updated_at"):
@@ -0,0 +1,172 @@
+import re
+import uuid
+
+from functools import cache
+from typing import TYPE_CHECKING, Literal
+
+from flask_admin.contrib.sqla import ModelView
+from sqlalchemy import Enum, false, func, or_, text
+from sqlalchemy.dialects.postgresql import UUID
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.orm import Query
+    from sqlalchemy.sql.elements import ColumnElement
+    from sqlalchemy.sql.schema import Column, Table
+
+# terms are classified as one of "uuid", "integer", "email" or "text", columns as one of "uuid", "integer", "email",
+# "reward_code", "transaction_id" or "text"
+SearchKind = Literal["uuid", "integer", "email", "reward_code", "transaction_id", "text"]
+
+# search terms starting with this are matched anywhere in every searchable column
+FUZZY_SEARCH_PREFIX = "%"
+# integer terms out of a BIGINT's range can't be an id
+MAX_INTEGER = 2**63 - 1
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+# indexes case insensitive prefix matches can use, as pg_indexes shows them e.g. lower((email)::text) text_pattern_ops
+PREFIX_INDEX_RE = re.compile(r'lower\(\(?"?(\w+)"?\)?(?:::[\w ]+)?\) (?:text|varchar)_pattern_ops')
+
+
+def classify_term(term: str) -> SearchKind:
+    try:
+        uuid.UUID(term)
+    except ValueError:
+        pass
+    else:
+        return "uuid"
+
+    if term.isdigit() and int(term) <= MAX_INTEGER:
+        return "integer"
+
+    return "email" if EMAIL_RE.match(term) else "text"
+
+
+def _string_column_kind(key: str) -> SearchKind:
+    if key.endswith("uuid"):
+        return "uuid"
+    if key == "code" or key.endswith("_code"):
+        return "reward_code"
+    if key.endswith("transaction_id"):
+        return "transaction_id"
+    return "email" if "email" in key else "text"
+
+
+def column_search_kind(column: "ColumnElement") -> SearchKind | None:
+    """How a searchable column is matched, None for columns that are only matched by fuzzy searches e.g. enums"""
+    column_type = getattr(column, "type", None)
+    if isinstance(column_type, UUID):
+        return "uuid"
+
+    try:
+        python_type = column_type.python_type  # type: ignore [union-attr]
+    except (AttributeError, NotImplementedError):
+        python_type = None
+
+    # enums have no LIKE operator in postgres
+    if python_type is str and not isinstance(column_type, Enum):
+        return _string_column_kind(column.key)
+
+    return "integer" if python_type is int else None
+
+
+@cache
+def _pattern_indexed_columns(bind: "Engine", schema: str | None, table_name: str) -> frozenset[str]:
+    with bind.connect() as conn:
+        indexdefs = conn.execute(
+            text(
+                "SELECT indexdef FROM pg_indexes "
+                "WHERE schemaname = COALESCE(:schema, current_schema()) AND tablename = :table"
+            ),
+            {"schema": schema, "table": table_name},
+        ).scalars()
+        return frozenset(match.group(1) for indexdef in indexdefs for match in PREFIX_INDEX_RE.finditer(indexdef))
+
+
+def prefix_indexed_columns(bind: "Engine", table: "Table") -> frozenset[str]:
+    """
+    Names of the table's columns with a lower(column) text_pattern_ops index, which case insensitive prefix matches
+    need. Looked up once per table, indexes created since are used once the app restarts.
+    """
+    if bind.dialect.name != "postgresql":
+        return frozenset()
+
+    return _pattern_indexed_columns(bind, table.schema, table.name)
+
+
+def search_condition(
+    column: "ColumnElement", column_kind: SearchKind, term: str, *, prefix_indexed: bool = False
+) -> "ColumnElement | None":
+    """
+    An index friendly condition matching the term against the column, or None if the term can't be one of its values.
+
+    UUIDs and integers are compared for equality. Reward codes and transaction ids are case sensitive and compared for
+    equality with anything but an email address. Email addresses are only compared for equality with email columns,
+    as entered and lower cased. Other terms are matched case insensitively as a prefix of the text and email columns
+    that have an index for it, see prefix_indexed_columns, and compared for equality otherwise.
+    """
+    match classify_term(term), column_kind:
+        case "uuid", "uuid":
+            return column == (str(uuid.UUID(term)) if isinstance(column.type, UUID) else term)
+        case "integer", "integer":
+            return column == int(term)
+        case "email", "email":
+            return column.in_(sorted({term, term.lower()}))
+        case "integer" | "text", "text" | "email" if prefix_indexed:
+            return func.lower(column).startswith(term.lower(), autoescape=True)
+        case (
+            ("integer" | "text" | "uuid", "reward_code" | "transaction_id")
+            | ("integer" | "text", "text" | "email")
+            | ("uuid", "text")
+        ):
+            return column == term
+
+    return None
+
+
+class SearchPlannerMixin(ModelView):
+    # Match each search term only against the searchable columns it can be a value of, see search_condition, instead of
+    # ILIKE '%term%' on every column. Searches starting with FUZZY_SEARCH_PREFIX still use ILIKE.
+    search_planner: bool = False
+
+    def search_placeholder(self) -> str | None:
+        placeholder = super().search_placeholder()
+        if placeholder and self.search_planner:
+            placeholder += f" ({FUZZY_SEARCH_PREFIX} to match anywhere)"
+        return placeholder
+
+    def _get_search_condition(self, column: "ColumnElement", field: "Column", term: str) -> "ColumnElement | None":
+        """The condition matching the term against column, the searchable field or its alias in a joined query"""
+        if (column_kind := column_search_kind(field)) is None:
+            return None
+
+        prefix_indexed = field.name in prefix_indexed_columns(self.session.get_bind(), field.table)
+        return search_condition(column, column_kind, term, prefix_indexed=prefix_indexed)
+
+    def _filter_search_term(self, query: "Query", joins: dict, term: str) -> tuple["Query", dict]:
+        conditions = []
+        for field, path in self._search_fields:
+            if self._get_search_condition(field, field, term) is None:
+                # the term can't be a value of this column, don't join its relationships either
+                continue
+
+            query, joins, alias = self._apply_path_joins(query, joins, path, inner_join=False)
+            conditions.append(
+                self._get_search_condition(field if alias is None else getattr(alias, field.key), field, term)
+            )
+
+        return query.filter(or_(*conditions) if conditions else false()), joins
+
+    def _apply_search(  # noqa: PLR0913
+        self, query: "Query", count_query: "Query | None", joins: dict, count_joins: dict, search: str
+    ) -> tuple["Query", "Query | None", dict, dict]:
+        if not self.search_planner or search.startswith(FUZZY_SEARCH_PREFIX):
+            return super()._apply_search(
+                query, count_query, joins, count_joins, search.removeprefix(FUZZY_SEARCH_PREFIX)
+            )
+
+        for term in search.split():
+            query, joins = self._filter_search_term(query, joins, term)
+            if count_query is not None:
+                count_query, count_joins = self._filter_search_term(count_query, count_joins, term)
+
+        return query, count_query, joins, count_joins
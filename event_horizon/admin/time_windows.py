@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from flask import flash, has_request_context, request
+from flask_admin.contrib.sqla import ModelView
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Query  # pragma: no cover
+
+TIME_WINDOW_ARG = "window"
+# time windows offered by views with a time_window_column, None is the "all time" escape hatch
+TIME_WINDOWS: dict[str, tuple[str, timedelta | None]] = {
+    "1d": ("Last 24 hours", timedelta(days=1)),
+    "7d": ("Last 7 days", timedelta(days=7)),
+    "30d": ("Last 30 days", timedelta(days=30)),
+    "90d": ("Last 90 days", timedelta(days=90)),
+    "all": ("All time", None),
+}
+
+
+class TimeWindowMixin(ModelView):
+    # Only list, count and export rows whose time_window_column falls in the selected time window, default_time_window
+    # unless another one (or "all") is picked from the list view's window selector. The column should be indexed.
+    time_window_column: str | None = None
+    default_time_window: str = "7d"
+
+    def get_query(self) -> "Query":
+        return self._apply_time_window(super().get_query())
+
+    def get_count_query(self) -> "Query":
+        return self._apply_time_window(super().get_count_query())
+
+    def _get_time_window(self) -> str | None:
+        """The selected time window, None when the view has no time_window_column or outside of the list views"""
+        if self.time_window_column is None or not has_request_context():
+            return None
+
+        # actions, details and edits address rows by primary key, whichever window they were listed in
+        if request.endpoint not in {f"{self.endpoint}.{name}" for name in ("index_view", "count_view", "export")}:
+            return None
+
+        window = request.args.get(TIME_WINDOW_ARG, self.default_time_window)
+        return window if window in TIME_WINDOWS else self.default_time_window
+
+    def _is_time_windowed(self) -> bool:
+        """Whether the listed rows are limited to a time window"""
+        return (window := self._get_time_window()) is not None and TIME_WINDOWS[window][1] is not None
+
+    def _apply_time_window(self, query: "Query") -> "Query":
+        if (window := self._get_time_window()) is None or (period := TIME_WINDOWS[window][1]) is None:
+            return query
+
+        column = getattr(self.model, self.time_window_column)  # type: ignore [arg-type]
+        since = datetime.now(tz=timezone.utc) - period
+        if not getattr(column.type, "timezone", False):
+            since = since.replace(tzinfo=None)
+        return query.filter(column >= since)
+
+    def _get_time_window_options(self, window: str) -> dict:
+        view_args = self._get_list_extra_args()
+        options = []
+        for key, (label, _) in TIME_WINDOWS.items():
+            view_args.extra_args[TIME_WINDOW_ARG] = key
+            options.append((label, self._get_list_url(view_args.clone(page=None)), key == window))
+
+        return {"label": TIME_WINDOWS[window][0], "arg": TIME_WINDOW_ARG, "value": window, "options": options}
+
+    def _set_time_window_selector(self) -> None:
+        """Pass the list view's window selector to its template, flashing an error for an unknown window"""
+        if (window := self._get_time_window()) is None:
+            return
+
+        if request.args.get(TIME_WINDOW_ARG, window) != window:
+            flash(f"Unknown time window, showing the {TIME_WINDOWS[window][0].lower()}.", category="error")
+        self._template_args["time_window"] = self._get_time_window_options(window)
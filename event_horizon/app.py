@@ -1,36 +1,68 @@
 import logging
 
+from datetime import timedelta
+from functools import partial
 from typing import Any
 
+import click
 import sentry_sdk
 
 from authlib.integrations.flask_client import OAuth
 from flask import Blueprint, Flask, Response
 from flask_wtf.csrf import CSRFProtect
 from retry_tasks_lib.admin.views import register_tasks_admin
+from rq import SimpleWorker
 from sentry_sdk.integrations.flask import FlaskIntegration
 from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
+from sqlalchemy import inspect
 
+from event_horizon.activity_utils.outbox import activity_outbox, run_relay
+from event_horizon.activity_utils.tasks import activity_publisher, publish_activity, resume_journals
 from event_horizon.admin import event_horizon_admin
+from event_horizon.admin.export_jobs import export_queue
 from event_horizon.admin.model_views import BaseModelView
 from event_horizon.carina import CARINA_MENU_TITLE
 from event_horizon.carina.db import db_session as carina_db_session
 from event_horizon.carina.db.models import Base as CarinaModelBase
 from event_horizon.carina.db.session import engine as carina_engine
+from event_horizon.db import defer_automap_prepare
 from event_horizon.hubble.db import db_session as hubble_db_session
 from event_horizon.hubble.db.models import Base as HubbleModelBase
 from event_horizon.hubble.db.session import engine as hubble_engine
+from event_horizon.invalidation import invalidation_bus
+from event_horizon.metrics import init_metrics, metrics_bp
 from event_horizon.polaris import POLARIS_MENU_TITLE
 from event_horizon.polaris.db import db_session as polaris_db_session
 from event_horizon.polaris.db.models import Base as PolarisModelBase
 from event_horizon.polaris.db.session import engine as polaris_engine
-from event_horizon.settings import OAUTH_SERVER_METADATA_URL, QUERY_LOG_LEVEL, ROUTE_BASE, SENTRY_DSN, SENTRY_ENV, redis
+from event_horizon.query_stats import init_query_stats, instrument_engine
+from event_horizon.schema_snapshot import prepare_automap_base, refresh_schema_snapshot
+from event_horizon.settings import (
+    ACTIVITY_OUTBOX_POLL_INTERVAL,
+    ACTIVITY_OUTBOX_RETENTION,
+    ACTIVITY_PUBLISH_BATCH_SIZE,
+    ACTIVITY_PUBLISH_MODE,
+    OAUTH_SERVER_METADATA_URL,
+    QUERY_LOG_LEVEL,
+    ROUTE_BASE,
+    SCHEMA_SNAPSHOT_DIR,
+    SENTRY_DSN,
+    SENTRY_ENV,
+    redis,
+)
 from event_horizon.vela import VELA_MENU_TITLE
 from event_horizon.vela.db import db_session as vela_db_session
 from event_horizon.vela.db.models import Base as VelaModelBase
 from event_horizon.vela.db.session import engine as vela_engine
 from event_horizon.version import __version__
 
+REFLECTED_DATABASES = (
+    ("carina", CarinaModelBase, carina_engine),
+    ("polaris", PolarisModelBase, polaris_engine),
+    ("vela", VelaModelBase, vela_engine),
+    ("hubble", HubbleModelBase, hubble_engine),
+)
+
 oauth = OAuth()
 oauth.register(
     "event_horizon",
@@ -45,11 +77,56 @@ class RelativeLocationHeaderResponse(Response):
     autocorrect_location_header = False
 
 
+def start_background_threads() -> None:
+    # only started by the web server, see gunicorn.conf.py, each gunicorn worker listens for the others' changes and
+    # publishes its own activities. CLI commands publish their activities as they go
+    invalidation_bus.start()
+    if ACTIVITY_PUBLISH_MODE == "async":
+        activity_publisher.start()
+
+
+def register_commands(app: Flask) -> None:
+    @app.cli.command("refresh-schema-snapshots")
+    def refresh_schema_snapshots() -> None:
+        """Reflect every database and overwrite its persisted schema snapshot."""
+        if not SCHEMA_SNAPSHOT_DIR:
+            raise click.UsageError("SCHEMA_SNAPSHOT_DIR is not set.")
+
+        for name, _model_base, engine in REFLECTED_DATABASES:
+            click.echo(f"{name}: schema snapshot written to {refresh_schema_snapshot(name, engine)}")
+
+    @app.cli.command("export-worker")
+    def export_worker() -> None:
+        """Run background export jobs."""
+        # jobs run in this process, which keeps the reflected models and connection pools between jobs
+        SimpleWorker([export_queue], connection=redis).work()
+
+    @app.cli.command("resume-activity-publishes")
+    def resume_activity_publishes() -> None:
+        """Publish the rest of the activity journals whose publishing died part way."""
+        click.echo(f"{resume_journals()} activities published")
+
+    @app.cli.command("activity-outbox-relay")
+    def activity_outbox_relay() -> None:
+        """Publish the activities written to the outbox."""
+        if not inspect(polaris_engine).has_table(activity_outbox.name):
+            raise click.ClickException(f"{activity_outbox.name} is missing, it is created by polaris' migrations.")
+
+        run_relay(
+            polaris_db_session,
+            partial(publish_activity, confirmed=True),
+            batch_size=ACTIVITY_PUBLISH_BATCH_SIZE,
+            poll_interval=ACTIVITY_OUTBOX_POLL_INTERVAL,
+            retention=timedelta(seconds=ACTIVITY_OUTBOX_RETENTION),
+        )
+
+
 def create_app(config_name: str = "event_horizon.settings") -> Flask:
-    CarinaModelBase.prepare(carina_engine, reflect=True)
-    PolarisModelBase.prepare(polaris_engine, reflect=True)
-    VelaModelBase.prepare(vela_engine, reflect=True)
-    HubbleModelBase.prepare(hubble_engine, reflect=True)
+    # each database is reflected on first use of one of its models, so that an unreachable database
+    # only affects the views and helpers that depend on it.
+    for name, model_base, engine in REFLECTED_DATABASES:
+        defer_automap_prepare(model_base, partial(prepare_automap_base, name, model_base, engine))
+        instrument_engine(name, engine)
 
     from event_horizon.carina import register_carina_admin
     from event_horizon.hubble import register_hubble_admin
@@ -77,6 +154,8 @@ def create_app(config_name: str = "event_horizon.settings") -> Flask:
     app = Flask(__name__)
     app.config.from_object(config_name)
     app.response_class = RelativeLocationHeaderResponse
+    init_metrics(app)
+    init_query_stats(app)
 
     register_polaris_admin(event_horizon_admin)
     register_tasks_admin(
@@ -116,10 +195,13 @@ def create_app(config_name: str = "event_horizon.settings") -> Flask:
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(healthz_bp)
+    app.register_blueprint(metrics_bp)
 
     eh_bp = Blueprint("eh", __name__, static_url_path=f"{ROUTE_BASE}/eh/static", static_folder="static")
     app.register_blueprint(eh_bp)
 
+    register_commands(app)
+
     @app.teardown_appcontext
     def remove_session(exception: BaseException | None = None) -> Any:
         carina_db_session.remove()
@@ -21,6 +21,7 @@ from event_horizon.carina.validators import (
     validate_required_fields_values_yaml,
     validate_retailer_fetch_type,
 )
+from event_horizon.metrics import outbound_request_hook
 
 if TYPE_CHECKING:
     from jinja2.runtime import Context
@@ -56,6 +57,7 @@ class FetchTypeAdmin(BaseModelView):
     can_create = False
     can_edit = False
     can_delete = False
+    cache_list_results = True
     column_searchable_list = ("name",)
     column_formatters: ClassVar[dict[str, Callable]] = {
         "required_fields": lambda v, c, model, p: Markup("<pre>")
@@ -123,6 +125,7 @@ class RewardConfigAdmin(BaseModelView):
                 f"{settings.CARINA_BASE_URL}/{reward_config.retailer.slug}/rewards/{reward_config.reward_slug}",
                 headers={"Authorization": f"token {settings.CARINA_AUTH_TOKEN}"},
                 timeout=settings.REQUEST_TIMEOUT,
+                hooks={"response": outbound_request_hook("carina")},
             )
             if 200 <= resp.status_code <= 204:
                 flash("Successfully diactivated reward_config")
@@ -150,6 +153,7 @@ class RewardAdmin(BaseModelView):
         "rewardconfig": reward_config_format,
         "rewardfilelog": reward_file_log_format,
     }
+    column_eager_loads = ("rewardconfig.retailer",)
 
     def is_accessible(self) -> bool:
         return super().is_accessible() if self.is_read_write_user else False
@@ -219,6 +223,7 @@ class ReadOnlyRewardAdmin(RewardAdmin):
     column_details_exclude_list: ClassVar[list[str]] = ["code"]
     column_export_exclude_list: ClassVar[list[str]] = ["code"]
     column_exclude_list: ClassVar[list[str]] = ["code"]
+    defer_unlisted_columns = True
 
     def is_accessible(self) -> bool:
         if self.is_read_write_user:
@@ -229,13 +234,17 @@ class ReadOnlyRewardAdmin(RewardAdmin):
 
 class RewardUpdateAdmin(BaseModelView):
     column_searchable_list = ("id", "reward_uuid", "reward.code")
+    search_planner = True
     column_filters = ("reward.retailer.slug",)
+    # the reward column is rendered with Reward.__repr__
+    column_eager_loads = ("reward.retailer",)
 
 
 class RewardCampaignAdmin(BaseModelView):
     can_create = False
     can_edit = False
     can_delete = False
+    cache_list_results = True
     column_searchable_list = ("id",)
     column_filters = ("retailer.slug", "reward_slug", "campaign_slug", "campaign_status")
 
@@ -244,5 +253,6 @@ class RewardFileLogAdmin(BaseModelView):
     can_create = False
     can_edit = False
     can_delete = False
+    cache_list_results = True
     column_searchable_list = ("id", "file_name")
     column_filters = ("file_name", "file_agent_type", "created_at")
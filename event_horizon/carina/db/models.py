@@ -1,14 +1,14 @@
-from sqlalchemy.ext.automap import AutomapBase, automap_base
+from sqlalchemy.ext.automap import AutomapBase
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.schema import MetaData
 
-from event_horizon.db import UpdatedAtMixin
+from event_horizon.db import ReferenceDataMixin, UpdatedAtMixin, lazy_automap_base
 
 metadata = MetaData()
-Base: AutomapBase = automap_base(metadata=metadata)
+Base: AutomapBase = lazy_automap_base(metadata)
 
 
-class Retailer(Base, UpdatedAtMixin):
+class Retailer(Base, UpdatedAtMixin, ReferenceDataMixin):
     __tablename__ = "retailer"
 
     fetch_types = relationship("FetchType", back_populates="retailers", secondary="retailer_fetch_type")
@@ -23,7 +23,7 @@ class Retailer(Base, UpdatedAtMixin):
         return self.slug
 
 
-class FetchType(Base, UpdatedAtMixin):
+class FetchType(Base, UpdatedAtMixin, ReferenceDataMixin):
     __tablename__ = "fetch_type"
 
     retailers = relationship(
@@ -43,7 +43,7 @@ class FetchType(Base, UpdatedAtMixin):
         return self.name
 
 
-class RetailerFetchType(Base, UpdatedAtMixin):
+class RetailerFetchType(Base, UpdatedAtMixin, ReferenceDataMixin):
     __tablename__ = "retailer_fetch_type"
 
     retailer = relationship("Retailer", back_populates="retailerfetchtype_collection", overlaps="fetch_types,retailers")
@@ -55,7 +55,7 @@ class RetailerFetchType(Base, UpdatedAtMixin):
         return f"{self.__class__.__name__}({self.retailer.slug}, {self.fetchtype.name})"
 
 
-class RewardConfig(Base, UpdatedAtMixin):
+class RewardConfig(Base, UpdatedAtMixin, ReferenceDataMixin):
     __tablename__ = "reward_config"
 
     def __repr__(self) -> str:
@@ -1,6 +1,19 @@
-from event_horizon.carina.db import RewardCampaign, db_session
+from sqlalchemy.future import select
+
+from event_horizon.carina.db import FetchType, Retailer, RetailerFetchType, RewardCampaign, db_session
+from event_horizon.reference_cache import reference_cache
 
 
 def delete_reward_campaign(campaign_slug: str) -> None:
     db_session.execute(RewardCampaign.__table__.delete().where(RewardCampaign.campaign_slug == campaign_slug))
     db_session.commit()
+
+
+def get_retailer_fetch_type_ids(retailer_id: int) -> list[int]:
+    return reference_cache.get(
+        RetailerFetchType.__tablename__,
+        retailer_id,
+        lambda: db_session.scalars(
+            select(FetchType.id).where(FetchType.retailers.any(Retailer.id == retailer_id))
+        ).all(),
+    )
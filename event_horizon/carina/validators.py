@@ -6,6 +6,8 @@ import yaml
 
 from wtforms.validators import StopValidation
 
+from event_horizon.carina.utils import get_retailer_fetch_type_ids
+
 FIELD_TYPES = {
     "integer": int,
     "float": float,
@@ -15,7 +17,7 @@ INVALID_YAML_ERROR = StopValidation("The submitted YAML is not valid.")
 
 
 def validate_retailer_fetch_type(form: wtforms.Form, field: wtforms.Field) -> None:
-    if field.data not in form.retailer.data.fetch_types:
+    if field.data.id not in get_retailer_fetch_type_ids(form.retailer.data.id):
         raise wtforms.ValidationError("Fetch Type not allowed for this retailer")
 
 
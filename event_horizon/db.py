@@ -1,4 +1,22 @@
-from sqlalchemy import Column, DateTime, text
+import os
+import threading
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from sqlalchemy import Column, DateTime, create_engine, event, text
+from sqlalchemy.ext.automap import AutomapBase, automap_base
+from sqlalchemy.orm import DeclarativeMeta
+from sqlalchemy.orm.instrumentation import manager_of_class
+from sqlalchemy.pool import NullPool, QueuePool
+
+if TYPE_CHECKING:
+    from sqlalchemy import MetaData
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.pool import Pool
+    from sqlalchemy.pool.base import _ConnectionFairy, _ConnectionRecord
 
 utc_timestamp_sql = text("TIMEZONE('utc', CURRENT_TIMESTAMP)")
 
@@ -14,3 +32,194 @@ class UpdatedAtMixin:
         onupdate=utc_timestamp_sql,
         nullable=False,
     )
+
+
+class ReferenceDataMixin:
+    """
+    Marks small, rarely changing tables, e.g. retailers and fetch types. Lookups on them are served from the reference
+    cache, which is invalidated when they are changed through the admin.
+    """
+
+
+@dataclass
+class _DeferredPrepare:
+    prepare: Callable[[], None]
+    lock: threading.RLock = field(default_factory=threading.RLock)
+    prepared: bool = False
+    preparing: bool = False
+
+
+class LazyAutomapMeta(DeclarativeMeta):
+    """
+    Metaclass for automap bases that are reflected on first use rather than when the app starts.
+
+    Until the base is prepared its models only carry the columns declared on them, the first lookup of any other
+    public attribute (e.g. AccountHolder.email), use of the model in a statement or instantiation prepares the
+    base and retries the lookup.
+    """
+
+    def __getattr__(cls, name: str) -> Any:  # noqa: N805
+        if not name.startswith("_") or name == "__clause_element__":
+            try:
+                prepared = prepare_deferred_automap_base(cls)
+            except Exception as ex:
+                # hasattr() and getattr() with a default only expect an AttributeError, preparing is retried next time
+                raise AttributeError(
+                    f"type object {cls.__name__!r} has no attribute {name!r}, reflecting its database failed"
+                ) from ex
+
+            if prepared:
+                return getattr(cls, name)
+
+        raise AttributeError(f"type object {cls.__name__!r} has no attribute {name!r}")
+
+    def __call__(cls, *args: Any, **kwargs: Any) -> Any:  # noqa: N805
+        prepare_deferred_automap_base(cls)
+        return super().__call__(*args, **kwargs)
+
+
+def lazy_automap_base(metadata: "MetaData") -> AutomapBase:
+    return automap_base(metadata=metadata, metaclass=LazyAutomapMeta)
+
+
+def defer_automap_prepare(base: type[AutomapBase], prepare: Callable[[], None]) -> None:
+    """Register how a lazy automap base is prepared, it will be called once on first use of any of its models."""
+    base._deferred_prepare = _DeferredPrepare(prepare)
+
+
+def is_mapped(model: type) -> bool:
+    return (manager := manager_of_class(model)) is not None and manager.is_mapped
+
+
+def prepare_deferred_automap_base(model: type) -> bool:
+    """
+    Prepare the lazy automap base of a model if it has not been prepared yet.
+
+    Returns True if the base was not prepared when called and is on return, lookups that failed before the call
+    are worth retrying. Returns False for models not using a deferred base, for bases that were already prepared
+    and while the base is being prepared by this same thread.
+    """
+    deferred: _DeferredPrepare | None = getattr(model, "_deferred_prepare", None)
+    if deferred is None or deferred.prepared:
+        return False
+
+    with deferred.lock:
+        if deferred.preparing:
+            return False
+
+        if not deferred.prepared:
+            deferred.preparing = True
+            try:
+                deferred.prepare()
+            finally:
+                deferred.preparing = False
+            deferred.prepared = True
+
+    return True
+
+
+@dataclass
+class PoolStats:
+    """
+    Checkout counters for one database's connection pool, used to size pools against the gunicorn layout.
+
+    wait is the time spent acquiring a connection from the pool (including opening a new one when the pool
+    has none idle), held is the time a connection stays checked out before being returned.
+    """
+
+    checkouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    held_seconds_total: float = 0.0
+    held_seconds_max: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def record_held(self, seconds: float) -> None:
+        with self._lock:
+            self.held_seconds_total += seconds
+            self.held_seconds_max = max(self.held_seconds_max, seconds)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "held_seconds_total": self.held_seconds_total,
+                "held_seconds_max": self.held_seconds_max,
+            }
+
+
+class _TimedCheckoutMixin:
+    # keyed by the pool's logging name, which survives the pool being recreated on dispose()
+    stats: ClassVar[dict[str, PoolStats]] = {}
+    logging_name: str
+
+    def connect(self) -> "_ConnectionFairy":
+        start = perf_counter()
+        conn = super().connect()  # type: ignore [misc]
+        self.stats.setdefault(self.logging_name, PoolStats()).record_wait(perf_counter() - start)
+        return conn
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedNullPool(_TimedCheckoutMixin, NullPool):
+    pass
+
+
+POOL_CLASSES: dict[str, type["Pool"]] = {"queue": TimedQueuePool, "null": TimedNullPool}
+
+
+def create_db_engine(db_name: str, database_uri: str, pool_config: dict, **kwargs: Any) -> "Engine":
+    pool_config = pool_config.copy()
+    pool_class = POOL_CLASSES[pool_config.pop("pool_class")]
+    if pool_class is TimedNullPool:
+        # NullPool opens a connection per checkout, sizing and recycling do not apply
+        pool_config = {"pool_pre_ping": pool_config["pool_pre_ping"]}
+
+    engine = create_engine(
+        database_uri,
+        poolclass=pool_class,
+        pool_logging_name=db_name,
+        **pool_config,
+        **kwargs,
+    )
+    stats = _TimedCheckoutMixin.stats.setdefault(db_name, PoolStats())
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn: Any, connection_record: "_ConnectionRecord", connection_proxy: Any) -> None:
+        connection_record.info["checked_out_at"] = perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn: Any, connection_record: "_ConnectionRecord") -> None:
+        if (checked_out_at := connection_record.info.pop("checked_out_at", None)) is not None:
+            stats.record_held(perf_counter() - checked_out_at)
+
+    # connections must never be shared between a gunicorn master and its workers, drop the parent's
+    # pooled connections in the child without closing them from under the parent.
+    os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
+
+    return engine
+
+
+def get_pool_stats(engine: "Engine") -> dict:
+    pool = engine.pool
+    stats = _TimedCheckoutMixin.stats.get(pool.logging_name, PoolStats()).as_dict()
+    if isinstance(pool, QueuePool):
+        stats |= {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
+
+    return stats
@@ -2,6 +2,7 @@ from sqlalchemy.future import select
 
 from event_horizon.carina.db import Retailer
 from event_horizon.carina.db import db_session as carina_db_session
+from event_horizon.reference_cache import reference_cache
 from event_horizon.vela.db import Campaign, RetailerRewards
 from event_horizon.vela.db import db_session as vela_db_session
 
@@ -11,17 +12,20 @@ def sync_retailer_insert(retailer_slug: str, retailer_status: str) -> None:
     vela_db_session.commit()
     carina_db_session.add(Retailer(slug=retailer_slug, status=retailer_status))
     carina_db_session.commit()
+    reference_cache.invalidate(RetailerRewards.__tablename__, Retailer.__tablename__)
 
 
 def check_activate_campaign_for_retailer(retailer_slug: str) -> list[int]:
-    return (
-        vela_db_session.execute(
+    return reference_cache.get(
+        Campaign.__tablename__,
+        f"active:{retailer_slug}",
+        lambda: vela_db_session.execute(
             select(Campaign.id)
             .join(RetailerRewards)
             .where(RetailerRewards.slug == retailer_slug, Campaign.status == "ACTIVE")
         )
         .scalars()
-        .all()
+        .all(),
     )
 
 
@@ -37,3 +41,5 @@ def sync_activate_retailer(retailer_id: int) -> None:
         carina_db_session.rollback()
         vela_db_session.rollback()
         raise ex
+    finally:
+        reference_cache.invalidate(RetailerRewards.__tablename__, Retailer.__tablename__)
@@ -1,16 +1,27 @@
 from collections.abc import Callable
 from typing import ClassVar
 
-from event_horizon.admin.custom_filters import StringInArrayColumn, StringNotInArrayColumn
+from event_horizon.admin.custom_filters import (
+    ArrayContainsAll,
+    ArrayContainsAny,
+    StringInArrayColumn,
+    StringNotInArrayColumn,
+)
 from event_horizon.admin.custom_formatters import format_json_field
 from event_horizon.admin.model_views import BaseModelView
 from event_horizon.hubble.db import Activity
 
 
 class ActivityAdmin(BaseModelView):
+    keyset_pagination = True
+    time_window_column = "underlying_datetime"
+    count_strategy = "estimated"
+    deferred_count = True
     can_create = False
     can_edit = False
     can_delete = False
+    cache_list_results = True
+    defer_unlisted_columns = True
     column_list = (
         "type",
         "summary",
@@ -39,14 +50,19 @@ class ActivityAdmin(BaseModelView):
         "created_at",
     )
     column_searchable_list = ("user_id",)
+    search_planner = True
     column_filters = (
         "underlying_datetime",
         "type",
         "retailer",
         "activity_identifier",
         "summary",
+        ArrayContainsAll(Activity.reasons, "Reasons"),
+        ArrayContainsAny(Activity.reasons, "Reasons"),
         StringInArrayColumn(Activity.reasons, "Reasons"),
         StringNotInArrayColumn(Activity.reasons, "Reasons"),
+        ArrayContainsAll(Activity.campaigns, "Campaigns"),
+        ArrayContainsAny(Activity.campaigns, "Campaigns"),
         StringInArrayColumn(Activity.campaigns, "Campaigns"),
         StringNotInArrayColumn(Activity.campaigns, "Campaigns"),
     )
@@ -1,10 +1,12 @@
 from sqlalchemy import Column, String
 from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy.ext.automap import AutomapBase, automap_base
+from sqlalchemy.ext.automap import AutomapBase
 from sqlalchemy.sql.schema import MetaData
 
+from event_horizon.db import lazy_automap_base
+
 metadata = MetaData()
-Base: AutomapBase = automap_base(metadata=metadata)
+Base: AutomapBase = lazy_automap_base(metadata)
 
 
 class Activity(Base):
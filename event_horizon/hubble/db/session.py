@@ -1,9 +1,8 @@
-from sqlalchemy import create_engine
 from sqlalchemy.orm import scoped_session, sessionmaker
-from sqlalchemy.pool import NullPool
 
-from event_horizon.settings import HUBBLE_DATABASE_URI
+from event_horizon.db import create_db_engine
+from event_horizon.settings import HUBBLE_DATABASE_URI, HUBBLE_DB_POOL
 
-engine = create_engine(HUBBLE_DATABASE_URI, poolclass=NullPool)
+engine = create_db_engine("hubble", HUBBLE_DATABASE_URI, HUBBLE_DB_POOL)
 SyncSessionMaker = sessionmaker(bind=engine, future=True, expire_on_commit=False)
 db_session = scoped_session(SyncSessionMaker)
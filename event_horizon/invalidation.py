@@ -0,0 +1,113 @@
+import json
+import logging
+import threading
+import uuid
+
+from collections.abc import Callable
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from event_horizon.settings import CACHE_INVALIDATION_CHANNEL, redis
+
+logger = logging.getLogger("invalidation-bus")
+
+# passed to handlers instead of a table when changes may have been missed, e.g. while reconnecting to redis
+ALL_TABLES = "*"
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+
+Handler = Callable[[str], None]
+
+
+class InvalidationBus:
+    """
+    Tells every worker process, on this and other pods, that a table's rows have changed so that they drop whatever
+    they have cached from it.
+
+    publish() runs this process' handlers straight away and broadcasts the change over Redis pub/sub, other processes
+    run their handlers from the listener thread started by start().
+    """
+
+    def __init__(self, redis: Redis, channel: str) -> None:
+        self.redis = redis
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._handlers: list[Handler] = []
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def subscribe(self, handler: Handler) -> Handler:
+        self._handlers.append(handler)
+        return handler
+
+    def _dispatch(self, table: str) -> None:
+        for handler in self._handlers:
+            try:
+                handler(table)
+            except Exception:
+                logger.exception("Invalidation handler %r failed for %s", handler, table)
+
+    def publish(self, table: str) -> None:
+        self._dispatch(table)
+        try:
+            self.redis.publish(self.channel, json.dumps({"origin": self.origin, "table": table}))
+        except RedisError:
+            logger.warning("Failed to publish a change to %s, other workers' caches will expire", table, exc_info=True)
+
+    def _handle_message(self, message: dict) -> None:
+        try:
+            event = json.loads(message["data"])
+            table = event["table"]
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Ignoring malformed invalidation event %r", message.get("data"))
+            return
+
+        if event.get("origin") != self.origin:
+            self._dispatch(table)
+
+    def _listen(self, stop: threading.Event) -> None:
+        delay = RECONNECT_DELAY
+        missed_events = False
+        while not stop.is_set():
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                if missed_events:
+                    self._dispatch(ALL_TABLES)
+                    missed_events = False
+
+                delay = RECONNECT_DELAY
+                while not stop.is_set():
+                    if (message := pubsub.get_message(timeout=1.0)) is not None:
+                        self._handle_message(message)
+            except RedisError:
+                logger.warning("Invalidation bus disconnected, reconnecting in %.0fs", delay, exc_info=True)
+                missed_events = True
+                stop.wait(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+            finally:
+                pubsub.close()
+
+    def start(self) -> None:
+        """Listen for other processes' changes in a daemon thread, call once the process has forked"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._stop = threading.Event()
+            self._thread = threading.Thread(
+                target=self._listen, args=(self._stop,), name="invalidation-bus", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stop.set()
+            if self._thread is not None:
+                self._thread.join(timeout=5)
+                self._thread = None
+
+
+invalidation_bus = InvalidationBus(redis, CACHE_INVALIDATION_CHANNEL)
@@ -1,15 +1,45 @@
 import json
+import logging
+import os
+import tempfile
+import time
 
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
 from typing import Any, cast
 
+from azure.core.exceptions import ResourceNotFoundError
 from azure.identity import DefaultAzureCredential
-from azure.keyvault.secrets import SecretClient
+from azure.keyvault.secrets import KeyVaultSecret, SecretClient, SecretProperties
+from cryptography.fernet import Fernet, InvalidToken
+
+logger = logging.getLogger("key-vault")
 
 
 class KeyVault:
-    def __init__(self, vault_url: str | None = None, /, *, client: SecretClient | None = None) -> None:
+    def __init__(  # noqa: PLR0913
+        self,
+        vault_url: str | None = None,
+        /,
+        *,
+        client: "SecretClient | LocalSecretClient | None" = None,
+        cache_ttl: int = 0,
+        disk_cache_path: str | None = None,
+        disk_cache_key: str | None = None,
+    ) -> None:
+        """
+        Secrets are cached in memory for cache_ttl seconds, caching is disabled when it is 0.
+
+        Providing both disk_cache_path and disk_cache_key (a Fernet key) also keeps an encrypted copy of the
+        cached secrets on disk, secrets read back from it are subject to the same cache_ttl.
+        """
         if not (client or vault_url):
             raise ValueError("must provide either vault_url or client")
+        if bool(disk_cache_path) != bool(disk_cache_key):
+            raise ValueError("disk_cache_path and disk_cache_key must be provided together")
+
         self.client = client or SecretClient(
             vault_url=cast(str, vault_url),
             credential=DefaultAzureCredential(
@@ -17,6 +47,88 @@ class KeyVault:
                 exclude_shared_token_cache_credential=True,
             ),
         )
+        self.cache_ttl = cache_ttl
+        self._cache: dict[str, tuple[str | None, float]] = {}
+        self._cache_lock = Lock()
+        self._disk_cache_path = Path(disk_cache_path) if disk_cache_path else None
+        self._fernet = Fernet(disk_cache_key) if disk_cache_key else None
+        if self.cache_ttl and self._disk_cache_path:
+            self._load_disk_cache()
+
+    def _get_cached(self, name: str) -> str | None:
+        with self._cache_lock:
+            if (cached := self._cache.get(name)) and cached[1] > time.time():
+                return cached[0]
+
+        return None
+
+    def _fetch(self, name: str) -> str | None:
+        if self.cache_ttl and (value := self._get_cached(name)) is not None:
+            return value
+
+        value = self.client.get_secret(name).value
+        if self.cache_ttl:
+            with self._cache_lock:
+                self._cache[name] = (value, time.time() + self.cache_ttl)
+
+        return value
+
+    def _load_disk_cache(self) -> None:
+        try:
+            token = self._disk_cache_path.read_bytes()  # type: ignore [union-attr]
+            # the token timestamp is when the cache was written, anything older than the ttl is discarded
+            cached = json.loads(self._fernet.decrypt(token, ttl=self.cache_ttl))  # type: ignore [union-attr]
+        except FileNotFoundError:
+            return
+        except InvalidToken:
+            logger.info("Discarding expired or unreadable secrets cache at %s", self._disk_cache_path)
+            return
+        except Exception:
+            logger.exception("Failed to load secrets cache from %s", self._disk_cache_path)
+            return
+
+        now = time.time()
+        with self._cache_lock:
+            self._cache.update(
+                {name: (value, expires_at) for name, (value, expires_at) in cached.items() if expires_at > now}
+            )
+
+    def _write_disk_cache(self) -> None:
+        path = cast(Path, self._disk_cache_path)
+        with self._cache_lock:
+            token = self._fernet.encrypt(json.dumps(self._cache).encode())  # type: ignore [union-attr]
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+            with os.fdopen(fd, "wb") as f:
+                f.write(token)
+            os.replace(tmp_path, path)
+        except Exception:
+            logger.exception("Failed to write secrets cache to %s", path)
+
+    def prefetch(self, names: Iterable[str], /, *, max_workers: int = 8) -> None:
+        """Fetch several secrets concurrently so that the following get_secret calls for them are served from
+        the cache. Secrets that do not exist are skipped here and will raise when requested with get_secret.
+        """
+        if not self.cache_ttl:
+            raise ValueError("prefetch requires a cache_ttl")
+
+        if not (missing := [name for name in dict.fromkeys(names) if self._get_cached(name) is None]):
+            return
+
+        def fetch(name: str) -> None:
+            try:
+                self._fetch(name)
+            except ResourceNotFoundError:
+                logger.warning("Secret %s not found in key vault", name)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing)), thread_name_prefix="key-vault") as pool:
+            # consume the results to raise any unexpected error
+            list(pool.map(fetch, missing))
+
+        if self._disk_cache_path:
+            self._write_disk_cache()
 
     def get_secret(self, name: str, /, *, key: str | None = "value") -> Any:
         """Return the content of a secret in the vault.
@@ -45,9 +157,39 @@ class KeyVault:
         44ef3c2b18b4484dbb9229226beaa98c
 
         """
-        secret = self.client.get_secret(name)
+        secret_value = self._fetch(name)
         try:
-            val = json.loads(secret.value)  # type: ignore [arg-type]
+            val = json.loads(secret_value)  # type: ignore [arg-type]
         except json.decoder.JSONDecodeError:
-            return secret.value
+            return secret_value
         return val[key] if key is not None else val
+
+
+class LocalSecretClient:
+    """
+    Stand-in for azure's SecretClient serving secrets from a mapping or a JSON file, for running and
+    benchmarking the app offline. latency simulates the round trip to the vault for each secret.
+    """
+
+    def __init__(self, secrets: dict[str, Any] | str, /, *, latency: float = 0.0) -> None:
+        if isinstance(secrets, str):
+            loaded: dict[str, Any] = json.loads(Path(secrets).read_text())
+        else:
+            loaded = secrets
+
+        self.secrets: dict[str, Any] = loaded
+        self.latency = latency
+
+    def get_secret(self, name: str, version: str | None = None, **kwargs: Any) -> KeyVaultSecret:  # noqa: ARG002
+        if self.latency:
+            time.sleep(self.latency)
+
+        try:
+            value = self.secrets[name]
+        except KeyError:
+            raise ResourceNotFoundError(f"secret {name} not found") from None
+
+        if not isinstance(value, str):
+            value = json.dumps(value)
+
+        return KeyVaultSecret(properties=SecretProperties(), value=value)
@@ -0,0 +1,144 @@
+import os
+
+from collections.abc import Callable
+from functools import wraps
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from flask import Blueprint, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+if TYPE_CHECKING:
+    from flask import Flask, Response
+    from requests import Response as RequestsResponse
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+REQUEST_DURATION = Histogram(
+    "event_horizon_request_duration_seconds",
+    "Time spent handling a request",
+    ["endpoint", "view_type", "method", "status"],
+)
+CUSTOM_ACTION_DURATION = Histogram(
+    "event_horizon_custom_action_duration_seconds",
+    "Time spent running a custom admin action",
+    ["action"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+DB_QUERY_DURATION = Histogram(
+    "event_horizon_db_query_duration_seconds",
+    "Time spent executing a database query",
+    ["database"],
+    buckets=FAST_BUCKETS,
+)
+ACTIVITIES_PUBLISHED = Counter(
+    "event_horizon_activities_published_total",
+    "Number of activities published",
+    ["activity_type"],
+)
+ACTIVITY_PUBLISH_FAILURES = Counter(
+    "event_horizon_activity_publish_failures_total",
+    "Number of activities the background publisher failed to publish",
+    ["activity_type"],
+)
+ACTIVITY_PUBLISH_DURATION = Histogram(
+    "event_horizon_activity_publish_duration_seconds",
+    "Time spent publishing a batch of activities",
+    ["activity_type"],
+    buckets=FAST_BUCKETS,
+)
+OUTBOUND_REQUEST_DURATION = Histogram(
+    "event_horizon_outbound_request_duration_seconds",
+    "Time until the response headers of a request to another service were received",
+    ["service", "method", "status"],
+    buckets=FAST_BUCKETS,
+)
+
+# Flask-Admin view methods, anything else exposed by an admin view is a custom action
+ADMIN_VIEW_TYPES = {
+    "index_view": "list",
+    "details_view": "details",
+    "edit_view": "edit",
+    "create_view": "create",
+    "delete_view": "delete",
+    "action_view": "action",
+    "count_view": "count",
+    "export": "export",
+    "ajax_lookup": "ajax",
+    "ajax_update": "ajax",
+}
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+def _view_type(endpoint: str | None) -> str:
+    if not endpoint or "." not in endpoint:
+        return "other"
+
+    blueprint_name, view_name = endpoint.rsplit(".", 1)
+    if blueprint_name in ("admin", "healthz", "metrics", "auth_views", "eh"):
+        return "other"
+
+    return ADMIN_VIEW_TYPES.get(view_name, "action")
+
+
+def init_metrics(app: "Flask") -> None:
+    @app.before_request
+    def _start_request_timer() -> None:
+        g.request_start_time = perf_counter()
+
+    @app.after_request
+    def _observe_request_duration(response: "Response") -> "Response":
+        if (start_time := g.pop("request_start_time", None)) is not None:
+            REQUEST_DURATION.labels(
+                endpoint=request.endpoint or "unknown",
+                view_type=_view_type(request.endpoint),
+                method=request.method,
+                status=response.status_code,
+            ).observe(perf_counter() - start_time)
+        return response
+
+
+def timed_custom_action(action_name: str) -> Callable[[F], F]:
+    def decorator(fn: F) -> F:
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with CUSTOM_ACTION_DURATION.labels(action=action_name).time():
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore [return-value]
+
+    return decorator
+
+
+def outbound_request_hook(service: str) -> Callable[..., None]:
+    """Return a requests response hook recording the latency of calls to the given service."""
+
+    def hook(response: "RequestsResponse", *args: Any, **kwargs: Any) -> None:
+        OUTBOUND_REQUEST_DURATION.labels(
+            service=service, method=response.request.method, status=response.status_code
+        ).observe(response.elapsed.total_seconds())
+
+    return hook
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics() -> tuple[bytes, int, dict]:
+    # every gunicorn worker writes its samples to PROMETHEUS_MULTIPROC_DIR, aggregate them on each scrape
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), 200, {"Content-Type": CONTENT_TYPE_LATEST}
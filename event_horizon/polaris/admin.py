@@ -22,6 +22,7 @@ from event_horizon.admin.custom_formatters import format_json_field
 from event_horizon.admin.model_views import BaseModelView, CanDeleteModelView
 from event_horizon.helpers import check_activate_campaign_for_retailer, sync_activate_retailer, sync_retailer_insert
 from event_horizon.hubble.account_activity_rtbf import anonymise_account_activities
+from event_horizon.metrics import outbound_request_hook, timed_custom_action
 from event_horizon.polaris.custom_actions import DeleteRetailerAction
 from event_horizon.polaris.db import AccountHolder, RetailerConfig
 from event_horizon.polaris.utils import generate_payloads_for_delete_account_holder_activity
@@ -38,6 +39,17 @@ if TYPE_CHECKING:
     from werkzeug.wrappers import Response
 
 
+# Edit forms only render the current account holder, other account holders are looked up by email prefix, id or uuid
+ACCOUNT_HOLDER_AJAX_REF = {
+    "fields": ("email",),
+    "exact_fields": ("id", "account_holder_uuid"),
+    # read by AccountHolder.__str__
+    "eager_loads": ("retailerconfig",),
+    "placeholder": "Email prefix, ID or UUID",
+    "minimum_input_length": 3,
+}
+
+
 def _account_holder_repr(
     v: type[BaseModelView],
     c: "Context",
@@ -65,6 +77,9 @@ def _account_holder_export_repr(
 
 
 class AccountHolderAdmin(BaseModelView):
+    keyset_pagination = True
+    count_strategy = "estimated"
+    deferred_count = True
     can_create = False
     column_filters = (
         "retailerconfig.slug",
@@ -86,6 +101,7 @@ class AccountHolderAdmin(BaseModelView):
     )
     column_labels: ClassVar[dict[str, str]] = {"retailerconfig": "Retailer"}
     column_searchable_list = ("id", "email", "account_holder_uuid", "account_number")
+    search_planner = True
     form_widget_args: ClassVar[dict[str, dict]] = {
         "opt_out_token": {"readonly": True},
     }
@@ -120,7 +136,7 @@ class AccountHolderAdmin(BaseModelView):
         # We are reflecting the db so we need to use the first method to ensure CASCADE is respected.
         # By default Flask Admin's delete action uses the second method which would leave orphans in our case.
         res = self.session.execute(AccountHolder.__table__.delete().where(AccountHolder.id.in_(account_holders_ids)))
-        sync_send_activity(activity_payloads, routing_key=ActivityType.ACCOUNT_DELETED.value)
+        sync_send_activity(activity_payloads, routing_key=ActivityType.ACCOUNT_DELETED.value, session=self.session)
         self.session.commit()
 
         flash(f"Deleted {res.rowcount} Account Holders.")
@@ -130,6 +146,7 @@ class AccountHolderAdmin(BaseModelView):
         "Anonymise account holder (RTBF)",
         "This action is not reversible. Are you sure you wish to proceed?",
     )
+    @timed_custom_action("anonymise-account-holder")
     def anonymise_user(self, account_holder_ids: list[str]) -> None:
         if len(account_holder_ids) != 1:
             flash("This action must be completed for account holders one at a time", category="error")
@@ -152,6 +169,7 @@ class AccountHolderAdmin(BaseModelView):
                     headers={"Authorization": f"token {settings.POLARIS_AUTH_TOKEN}"},
                     json={"status": "inactive"},
                     timeout=settings.REQUEST_TIMEOUT,
+                    hooks={"response": outbound_request_hook("polaris")},
                 )
                 if 200 <= resp.status_code <= 204:
                     flash("Account Holder successfully changed to INACTIVE")
@@ -172,8 +190,10 @@ class AccountHolderAdmin(BaseModelView):
 class AccountHolderProfileAdmin(BaseModelView):
     can_create = False
     column_searchable_list = ("accountholder.id", "accountholder.email", "accountholder.account_holder_uuid")
+    search_planner = True
     column_labels: ClassVar[dict[str, str]] = {"accountholder": "Account Holder"}
     column_formatters: ClassVar[dict[str, Callable]] = {"accountholder": _account_holder_repr}
+    form_ajax_refs: ClassVar[dict[str, dict]] = {"accountholder": ACCOUNT_HOLDER_AJAX_REF}
     column_default_sort = ("accountholder.created_at", True)
 
 
@@ -185,17 +205,22 @@ class AccountHolderRewardAdmin(BaseModelView):
         "accountholder.account_holder_uuid",
         "code",
     )
+    search_planner = True
     column_labels: ClassVar[dict[str, str]] = {"accountholder": "Account Holder"}
     column_filters = ("accountholder.retailerconfig.slug", "status", "reward_slug", "campaign_slug", "issued_date")
     column_formatters: ClassVar[dict[str, Callable]] = {"accountholder": _account_holder_repr}
+    form_ajax_refs: ClassVar[dict[str, dict]] = {"accountholder": ACCOUNT_HOLDER_AJAX_REF}
     form_widget_args: ClassVar[dict[str, dict]] = {
         "reward_id": {"readonly": True},
         "reward_code": {"readonly": True},
         "accountholder": {"disabled": True},
     }
     column_formatters_export: ClassVar[dict[str, Callable]] = {"accountholder": _account_holder_export_repr}
+    column_export_paths: ClassVar[dict[str, str]] = {"accountholder": "accountholder.account_holder_uuid"}
     column_export_exclude_list: ClassVar[list[str]] = ["idempotency_token", "code"]
     can_export = True
+    copy_export = True
+    background_export = True
 
     def is_accessible(self) -> bool:
         return super().is_accessible() if self.is_read_write_user else False
@@ -231,9 +256,11 @@ class AccountHolderPendingRewardAdmin(BaseModelView):
         "accountholder.email",
         "accountholder.account_holder_uuid",
     )
+    search_planner = True
     column_labels: ClassVar[dict[str, str]] = {"accountholder": "Account Holder", "id": "Pending Reward id"}
     column_filters = ("accountholder.retailerconfig.slug", "campaign_slug", "created_date", "conversion_date")
     column_formatters: ClassVar[dict[str, Callable]] = {"accountholder": _account_holder_repr}
+    form_ajax_refs: ClassVar[dict[str, dict]] = {"accountholder": ACCOUNT_HOLDER_AJAX_REF}
     form_widget_args: ClassVar[dict[str, dict]] = {"accountholder": {"disabled": True}}
     column_export_exclude_list: ClassVar[list[str]] = ["idempotency_token"]
     column_export_list: ClassVar[list[str]] = [
@@ -251,6 +278,8 @@ class AccountHolderPendingRewardAdmin(BaseModelView):
         "count",
     ]
     can_export = True
+    copy_export = True
+    background_export = True
 
 
 class RetailerConfigAdmin(BaseModelView):
@@ -258,6 +287,7 @@ class RetailerConfigAdmin(BaseModelView):
     column_searchable_list = ("id", "slug", "name")
     column_labels: ClassVar[dict[str, str]] = {"profile_config": "Enrolment Config"}
     column_exclude_list = ("profile_config", "marketing_preference_config")
+    defer_unlisted_columns = True
     form_create_rules = (
         "name",
         "slug",
@@ -350,6 +380,7 @@ marketing_pref:
     }
 
     def after_model_change(self, form: wtforms.Form, model: "RetailerConfig", is_created: bool) -> None:
+        super().after_model_change(form, model, is_created)
         if is_created:
             try:
                 sync_retailer_insert(model.slug, model.status)
@@ -518,14 +549,18 @@ marketing_pref:
 class AccountHolderCampaignBalanceAdmin(BaseModelView):
     can_create = False
     column_searchable_list = ("accountholder.id", "accountholder.email", "accountholder.account_holder_uuid")
+    search_planner = True
     column_labels: ClassVar[dict[str, str]] = {"accountholder": "Account Holder"}
     column_filters = ("accountholder.retailerconfig.slug", "campaign_slug")
     column_formatters: ClassVar[dict[str, Callable]] = {"accountholder": _account_holder_repr}
+    form_ajax_refs: ClassVar[dict[str, dict]] = {"accountholder": ACCOUNT_HOLDER_AJAX_REF}
     form_widget_args: ClassVar[dict[str, dict]] = {"accountholder": {"disabled": True}}
 
 
 class AccountHolderMarketingPreferenceAdmin(BaseModelView):
     can_export = True
+    copy_export = True
+    background_export = True
     column_list = (
         "accountholder",
         "accountholder.retailerconfig",
@@ -536,6 +571,7 @@ class AccountHolderMarketingPreferenceAdmin(BaseModelView):
         "updated_at",
     )
     column_searchable_list = ("accountholder.id", "accountholder.email", "accountholder.account_holder_uuid")
+    search_planner = True
     column_filters = ("key_name", "value_type", "accountholder.retailerconfig.slug", "value")
     column_labels: ClassVar[dict[str, str]] = {
         "accountholder": "Account Holder",
@@ -587,6 +623,7 @@ class EmailTemplateKeyAdmin(BaseModelView):
     can_create = False
     can_edit = False
     can_delete = False
+    cache_list_results = True
     column_searchable_list = ("name", "display_name", "description")
     form_excluded_columns = (
         "template",
@@ -599,6 +636,8 @@ class EmailTemplateKeyAdmin(BaseModelView):
 
 
 class AccountHolderTransactionHistoryAdmin(BaseModelView):
+    keyset_pagination = True
+    time_window_column = "datetime"
     can_create = False
     can_edit = False
     column_searchable_list = (
@@ -607,6 +646,7 @@ class AccountHolderTransactionHistoryAdmin(BaseModelView):
         "accountholder.account_holder_uuid",
         "transaction_id",
     )
+    search_planner = True
     column_filters = ("datetime", "location_name")
     column_labels: ClassVar[dict[str, str]] = {"accountholder": "Account Holder"}
     column_formatters: ClassVar[dict[str, Callable]] = {
@@ -8,13 +8,15 @@ from sqlalchemy.exc import DBAPIError
 from sqlalchemy.future import select
 
 from event_horizon.admin.utils import SessionDataMethodsMixin
-from event_horizon.carina.db.models import Retailer
+from event_horizon.carina.db.models import Retailer, RetailerFetchType
 from event_horizon.carina.db.session import db_session as carina_db_session
 from event_horizon.hubble.db.models import Activity
 from event_horizon.hubble.db.session import db_session as hubble_db_session
+from event_horizon.metrics import timed_custom_action
 from event_horizon.polaris.db.models import AccountHolder, AccountHolderReward, RetailerConfig
 from event_horizon.polaris.db.session import db_session as polaris_db_session
 from event_horizon.polaris.forms import DeleteRetailerActionForm
+from event_horizon.reference_cache import reference_cache
 from event_horizon.vela.db.models import Campaign, RetailerRewards
 from event_horizon.vela.db.session import db_session as vela_db_session
 
@@ -118,6 +120,7 @@ class DeleteRetailerAction:
         )
         hubble_db_session.flush()
 
+    @timed_custom_action("delete_retailer")
     def delete_retailer(self) -> bool:
         if not self.form.acceptance.data:
             flash("User did not agree to proceed, action halted.")
@@ -146,6 +149,13 @@ class DeleteRetailerAction:
         vela_db_session.commit()
         carina_db_session.commit()
         hubble_db_session.commit()
+        reference_cache.invalidate(
+            RetailerConfig.__tablename__,
+            RetailerRewards.__tablename__,
+            Campaign.__tablename__,
+            Retailer.__tablename__,
+            RetailerFetchType.__tablename__,
+        )
         flash(
             f"All rows related to retailer {self.session_data.retailer_name} ({self.session_data.polaris_retailer_id}) "
             "have been deleted."
@@ -1,12 +1,12 @@
 from sqlalchemy import Column, Text
-from sqlalchemy.ext.automap import AutomapBase, automap_base
+from sqlalchemy.ext.automap import AutomapBase
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.schema import MetaData
 
-from event_horizon.db import UpdatedAtMixin
+from event_horizon.db import ReferenceDataMixin, UpdatedAtMixin, lazy_automap_base
 
 metadata = MetaData()
-Base: AutomapBase = automap_base(metadata=metadata)
+Base: AutomapBase = lazy_automap_base(metadata)
 
 
 class AccountHolder(Base, UpdatedAtMixin):
@@ -40,7 +40,7 @@ class AccountHolderReward(Base, UpdatedAtMixin):
         return self.code
 
 
-class RetailerConfig(Base, UpdatedAtMixin):
+class RetailerConfig(Base, UpdatedAtMixin, ReferenceDataMixin):
     __tablename__ = "retailer_config"
 
     marketing_preference_config = Column(Text, nullable=False, default="")
@@ -77,7 +77,7 @@ class EmailTemplate(Base, UpdatedAtMixin):
         return f"{self.retailerconfig.slug}: {self.type}"
 
 
-class EmailTemplateKey(Base, UpdatedAtMixin):
+class EmailTemplateKey(Base, UpdatedAtMixin, ReferenceDataMixin):
     __tablename__ = "email_template_key"
 
     def __repr__(self) -> str:
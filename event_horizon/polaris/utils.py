@@ -1,4 +1,4 @@
-from collections.abc import Generator
+from collections.abc import Generator, Iterator
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
@@ -23,7 +23,7 @@ def transfer_balance(  # noqa: PLR0913
     min_balance: int,
     rate_percent: int,
     loyalty_type: str,
-) -> Generator[dict, None, None]:  # pragma: no cover
+) -> Iterator[dict]:  # pragma: no cover
     rate_multiplier = rate_percent / 100
 
     match loyalty_type:
@@ -69,17 +69,14 @@ def transfer_balance(  # noqa: PLR0913
         ).all()
     )
 
-    return (
-        ActivityType.get_balance_change_activity_data(
-            retailer_slug=retailer_slug,
-            from_campaign_slug=from_campaign_slug,
-            to_campaign_slug=to_campaign_slug,
-            account_holder_uuid=account_holder_id_map[ah_id],
-            activity_datetime=to_campaign_start_date,
-            new_balance=balance,
-            loyalty_type=loyalty_type,
-        )
-        for ah_id, balance in updated_balances
+    return ActivityType.get_balance_change_activity_data_batch(
+        retailer_slug=retailer_slug,
+        from_campaign_slug=from_campaign_slug,
+        to_campaign_slug=to_campaign_slug,
+        account_holder_uuids=[account_holder_id_map[ah_id] for ah_id, _ in updated_balances],
+        activity_datetime=to_campaign_start_date,
+        new_balances=[balance for _, balance in updated_balances],
+        loyalty_type=loyalty_type,
     )
 
 
@@ -91,7 +88,7 @@ def transfer_pending_rewards(  # noqa: PLR0913
     to_campaign_slug: str,
     to_campaign_reward_slug: str,
     to_campaign_start_date: "datetime",
-) -> Generator[dict, None, None]:  # pragma: no cover
+) -> Iterator[dict]:  # pragma: no cover
     updated_rewards = db_session.execute(
         AccountHolderPendingReward.__table__.update()
         # NB: we might want to remove reward_slug here when we stop using it
@@ -104,16 +101,13 @@ def transfer_pending_rewards(  # noqa: PLR0913
         .returning(AccountHolderPendingReward.pending_reward_uuid, AccountHolder.account_holder_uuid)
     ).all()
 
-    return (
-        ActivityType.get_reward_status_activity_data(
-            retailer_slug=retailer_slug,
-            from_campaign_slug=from_campaign_slug,
-            to_campaign_slug=to_campaign_slug,
-            account_holder_uuid=ah_uuid,
-            activity_datetime=to_campaign_start_date,
-            pending_reward_uuid=pr_uuid,
-        )
-        for pr_uuid, ah_uuid in updated_rewards
+    return ActivityType.get_reward_status_activity_data_batch(
+        retailer_slug=retailer_slug,
+        from_campaign_slug=from_campaign_slug,
+        to_campaign_slug=to_campaign_slug,
+        account_holder_uuids=[ah_uuid for _, ah_uuid in updated_rewards],
+        activity_datetime=to_campaign_start_date,
+        pending_reward_uuids=[pr_uuid for pr_uuid, _ in updated_rewards],
     )
 
 
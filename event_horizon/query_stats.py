@@ -0,0 +1,109 @@
+import json
+import logging
+
+from collections import Counter
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from flask import g, has_app_context, request
+from sqlalchemy import event
+
+from event_horizon.metrics import DB_QUERY_DURATION
+from event_horizon.settings import SQL_N_PLUS_ONE_ACTION, SQL_N_PLUS_ONE_THRESHOLD
+
+if TYPE_CHECKING:
+    from flask import Flask, Response
+    from sqlalchemy.engine import Connection, Engine, ExceptionContext
+
+logger = logging.getLogger("query-stats")
+
+
+class NPlusOneQueryError(Exception):
+    pass
+
+
+@dataclass
+class DatabaseQueryStats:
+    count: int = 0
+    duration_ms: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+
+@dataclass
+class RequestQueryStats:
+    databases: dict[str, DatabaseQueryStats] = field(default_factory=dict)
+    suspected_n_plus_one: list[dict] = field(default_factory=list)
+
+    def record(self, db_name: str, statement: str, duration_ms: float) -> None:
+        stats = self.databases.setdefault(db_name, DatabaseQueryStats())
+        stats.count += 1
+        stats.duration_ms += duration_ms
+        stats.statements[statement] += 1
+
+        # statements are parameterised, the same text executed repeatedly is the same query shape
+        if SQL_N_PLUS_ONE_THRESHOLD and stats.statements[statement] == SQL_N_PLUS_ONE_THRESHOLD:
+            self.suspected_n_plus_one.append({"database": db_name, "statement": statement})
+            msg = f"Suspected N+1: statement executed {SQL_N_PLUS_ONE_THRESHOLD} times on {db_name}: {statement}"
+            if SQL_N_PLUS_ONE_ACTION == "raise":
+                raise NPlusOneQueryError(msg)
+
+            logger.warning(msg)
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            f'db-{db_name};dur={stats.duration_ms:.2f};desc="{db_name} {stats.count} queries"'
+            for db_name, stats in self.databases.items()
+        )
+
+    def summary(self) -> dict:
+        return {
+            "databases": {
+                db_name: {"queries": stats.count, "duration_ms": round(stats.duration_ms, 2)}
+                for db_name, stats in self.databases.items()
+            },
+            "suspected_n_plus_one": self.suspected_n_plus_one,
+        }
+
+
+def _request_query_stats() -> RequestQueryStats | None:
+    # queries run outside of a request, e.g. readiness probes or cli commands, are not recorded
+    return g.get("query_stats") if has_app_context() else None
+
+
+def instrument_engine(db_name: str, engine: "Engine") -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn: "Connection", *args: Any) -> None:
+        conn.info.setdefault("query_stats_start_time", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn: "Connection", cursor: Any, statement: str, *args: Any) -> None:
+        duration_ms = (perf_counter() - conn.info["query_stats_start_time"].pop()) * 1000
+        DB_QUERY_DURATION.labels(database=db_name).observe(duration_ms / 1000)
+        if (stats := _request_query_stats()) is not None:
+            stats.record(db_name, statement, duration_ms)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context: "ExceptionContext") -> None:
+        if context.connection is not None and (start_times := context.connection.info.get("query_stats_start_time")):
+            start_times.pop()
+
+
+def init_query_stats(app: "Flask") -> None:
+    @app.before_request
+    def _start_query_stats() -> None:
+        g.query_stats = RequestQueryStats()
+
+    @app.after_request
+    def _report_query_stats(response: "Response") -> "Response":
+        stats: RequestQueryStats | None = g.pop("query_stats", None)
+        if stats is None or not stats.databases:
+            return response
+
+        response.headers["Server-Timing"] = stats.server_timing()
+        logger.info(
+            json.dumps(
+                {"method": request.method, "path": request.path, "status": response.status_code} | stats.summary()
+            )
+        )
+        return response
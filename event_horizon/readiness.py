@@ -0,0 +1,140 @@
+import logging
+import os
+import threading
+
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import asdict, dataclass
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING
+
+from sqlalchemy.sql import text
+
+from event_horizon.carina.db.session import engine as carina_engine
+from event_horizon.hubble.db.session import engine as hubble_engine
+from event_horizon.polaris.db.session import engine as polaris_engine
+from event_horizon.settings import READINESS_CACHE_SECONDS, READINESS_TIMEOUTS, redis
+from event_horizon.vela.db.session import engine as vela_engine
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("readiness")
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    ok: bool
+    latency_ms: float
+    error: str | None = None
+
+    def as_dict(self) -> dict:
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+
+def _probe_database(engine: "Engine") -> Callable[[], None]:
+    def probe() -> None:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    return probe
+
+
+def _probe_redis() -> None:
+    redis.ping()
+
+
+def _probe_rabbitmq() -> None:
+    # imported here so that the probes can be loaded without the activity publisher
+    from event_horizon.activity_utils.tasks import activity_connections
+
+    with activity_connections.clone(connect_timeout=READINESS_TIMEOUTS["rabbitmq"]) as probe_connection:
+        probe_connection.connect()
+
+
+PROBES: dict[str, Callable[[], None]] = {
+    "polaris": _probe_database(polaris_engine),
+    "vela": _probe_database(vela_engine),
+    "carina": _probe_database(carina_engine),
+    "hubble": _probe_database(hubble_engine),
+    "redis": _probe_redis,
+    "rabbitmq": _probe_rabbitmq,
+}
+
+
+def _timed(probe: Callable[[], None]) -> ProbeResult:
+    start = perf_counter()
+    try:
+        probe()
+    except Exception as ex:
+        return ProbeResult(ok=False, latency_ms=(perf_counter() - start) * 1000, error=repr(ex))
+
+    return ProbeResult(ok=True, latency_ms=(perf_counter() - start) * 1000)
+
+
+class ReadinessChecker:
+    """
+    Runs every probe concurrently, each bounded by its own timeout.
+
+    A probe that is still running from an earlier check, e.g. a connection attempt to a database that is not
+    responding, is waited on again instead of being started a second time. Results are cached for cache_seconds
+    so that a burst of readiness probes only reaches the dependencies once.
+    """
+
+    def __init__(
+        self, probes: Mapping[str, Callable[[], None]], *, timeouts: Mapping[str, float], cache_seconds: float
+    ) -> None:
+        self.probes = probes
+        self.timeouts = timeouts
+        self.cache_seconds = cache_seconds
+        self._lock = threading.Lock()
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._executor: ThreadPoolExecutor | None = None
+        self._in_flight: dict[str, Future] = {}
+        self._results: dict[str, ProbeResult] | None = None
+        self._checked_at = 0.0
+
+    def _submit(self, name: str) -> Future:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=len(self.probes), thread_name_prefix="readiness")
+
+        if (future := self._in_flight.get(name)) is None or future.done():
+            future = self._in_flight[name] = self._executor.submit(_timed, self.probes[name])
+
+        return future
+
+    def _run(self) -> dict[str, ProbeResult]:
+        started = monotonic()
+        futures = {name: self._submit(name) for name in self.probes}
+        results = {}
+        for name, future in futures.items():
+            timeout = self.timeouts[name]
+            try:
+                result = future.result(timeout=max(timeout - (monotonic() - started), 0))
+            except FutureTimeoutError:
+                result = None
+
+            # a probe may finish while waiting on slower ones, it still failed if it took longer than its timeout
+            if result is None or result.latency_ms > timeout * 1000:
+                logger.warning("Readiness probe for %s timed out after %ss", name, timeout)
+                result = ProbeResult(ok=False, latency_ms=timeout * 1000, error="timed out")
+
+            results[name] = result
+
+        return results
+
+    def check(self, *, use_cache: bool = True) -> dict[str, ProbeResult]:
+        with self._lock:
+            if use_cache and self._results is not None and monotonic() - self._checked_at < self.cache_seconds:
+                return self._results
+
+            self._results = self._run()
+            self._checked_at = monotonic()
+            return self._results
+
+
+readiness_checker = ReadinessChecker(PROBES, timeouts=READINESS_TIMEOUTS, cache_seconds=READINESS_CACHE_SECONDS)
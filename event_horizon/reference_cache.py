@@ -0,0 +1,137 @@
+import json
+import logging
+import threading
+import time
+
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from event_horizon.invalidation import ALL_TABLES, InvalidationBus, invalidation_bus
+from event_horizon.settings import REFERENCE_CACHE_LOCAL_TTL, REFERENCE_CACHE_MAXSIZE, REFERENCE_CACHE_TTL, redis
+
+logger = logging.getLogger("reference-cache")
+
+REFERENCE_CACHE_KEY = "event-horizon:reference:{table}"
+
+
+class ReferenceCache:
+    """
+    Two level cache for lookups on small, rarely changing tables e.g. a retailer's fetch types or the choices of a
+    retailer select field.
+
+    Values are keyed by the table they are read from and a key e.g. a retailer's id or slug. They are kept in an
+    in-process LRU for local_ttl seconds in front of a Redis hash per table, where they are kept for ttl seconds.
+    Invalidating a table drops its hash and publishes the change on the invalidation bus, which drops every process'
+    local copies.
+
+    Values have to be JSON serialisable and are always returned as decoded from JSON, e.g. tuples come back as lists.
+    Redis being unavailable only costs a database query.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self, redis: Redis, ttl: int, local_ttl: int, maxsize: int, bus: InvalidationBus | None = None
+    ) -> None:
+        self.redis = redis
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.maxsize = maxsize
+        self.bus = bus
+        self._local: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        if bus is not None:
+            bus.subscribe(self._evict_local)
+
+    def _evict_local(self, table: str) -> None:
+        with self._lock:
+            if table == ALL_TABLES:
+                self._local.clear()
+                return
+
+            for local_key in [local_key for local_key in self._local if local_key[0] == table]:
+                del self._local[local_key]
+
+    def _get_local(self, local_key: tuple[str, str]) -> tuple[bool, Any]:
+        with self._lock:
+            if (entry := self._local.get(local_key)) is None:
+                return False, None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._local[local_key]
+                return False, None
+
+            self._local.move_to_end(local_key)
+            return True, value
+
+    def _set_local(self, local_key: tuple[str, str], value: Any) -> None:
+        with self._lock:
+            self._local[local_key] = (time.monotonic() + self.local_ttl, value)
+            self._local.move_to_end(local_key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    def _get_shared(self, table: str, key: str) -> tuple[bool, Any]:
+        try:
+            cached = self.redis.hget(REFERENCE_CACHE_KEY.format(table=table), key)
+        except RedisError:
+            logger.warning("Failed to read %s %s from the reference cache", table, key, exc_info=True)
+            return False, None
+
+        if cached is None:
+            return False, None
+
+        stored_at, value = json.loads(cached)
+        return stored_at + self.ttl > time.time(), value
+
+    def _set_shared(self, table: str, key: str, value: Any) -> None:
+        name = REFERENCE_CACHE_KEY.format(table=table)
+        try:
+            with self.redis.pipeline() as pipe:
+                pipe.hset(name, key, json.dumps([time.time(), value]))
+                pipe.expire(name, self.ttl)
+                pipe.execute()
+        except RedisError:
+            logger.warning("Failed to write %s %s to the reference cache", table, key, exc_info=True)
+
+    def get(self, table: str, key: str | int, loader: Callable[[], Any]) -> Any:
+        """The cached value for the table's key, loader is called to look it up on a miss"""
+        if not self.ttl:
+            return loader()
+
+        local_key = (table, str(key))
+        found, value = self._get_local(local_key)
+        if not found:
+            found, value = self._get_shared(*local_key)
+            if not found:
+                value = json.loads(json.dumps(loader()))
+                self._set_shared(*local_key, value)
+
+            self._set_local(local_key, value)
+
+        return value
+
+    def invalidate(self, *tables: str) -> None:
+        """Drop every value read from the tables, call after changing them"""
+        try:
+            self.redis.delete(*(REFERENCE_CACHE_KEY.format(table=table) for table in tables))
+        except RedisError:
+            logger.warning("Failed to invalidate %s in the reference cache", ", ".join(tables), exc_info=True)
+
+        for table in tables:
+            if self.bus is not None:
+                self.bus.publish(table)
+            else:
+                self._evict_local(table)
+
+
+reference_cache = ReferenceCache(
+    redis,
+    ttl=REFERENCE_CACHE_TTL,
+    local_ttl=REFERENCE_CACHE_LOCAL_TTL,
+    maxsize=REFERENCE_CACHE_MAXSIZE,
+    bus=invalidation_bus,
+)
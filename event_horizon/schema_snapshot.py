@@ -0,0 +1,149 @@
+import logging
+import os
+import pickle
+import tempfile
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import sqlalchemy
+
+from sqlalchemy import inspect
+from sqlalchemy.sql import text
+
+from event_horizon.settings import SCHEMA_SNAPSHOT_DIR
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection, Engine
+    from sqlalchemy.engine.reflection import Inspector
+    from sqlalchemy.ext.automap import AutomapBase
+
+logger = logging.getLogger("schema-snapshot")
+
+# A single round trip that summarises every column and constraint visible in the current schema.
+# Any DDL that could change what automap produces (new/dropped/retyped columns, keys, foreign keys)
+# changes this value.
+SCHEMA_FINGERPRINT_SQL = text(
+    """
+    SELECT md5(coalesce(string_agg(schema_row, '|' ORDER BY schema_row), ''))
+    FROM (
+        SELECT concat_ws(
+            ',', 'column', table_name, column_name, ordinal_position,
+            data_type, udt_name, is_nullable, column_default
+        ) AS schema_row
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+        UNION ALL
+        SELECT concat_ws(
+            ',', 'constraint', tc.table_name, tc.constraint_name, tc.constraint_type,
+            kcu.column_name, kcu.ordinal_position, ccu.table_name, ccu.column_name
+        ) AS schema_row
+        FROM information_schema.table_constraints AS tc
+        LEFT JOIN information_schema.key_column_usage AS kcu
+            ON kcu.constraint_schema = tc.constraint_schema AND kcu.constraint_name = tc.constraint_name
+        LEFT JOIN information_schema.constraint_column_usage AS ccu
+            ON ccu.constraint_schema = tc.constraint_schema AND ccu.constraint_name = tc.constraint_name
+        WHERE tc.table_schema = current_schema()
+    ) AS schema_rows
+    """
+)
+
+
+def schema_fingerprint(connection: "Connection") -> str:
+    return connection.execute(SCHEMA_FINGERPRINT_SQL).scalar_one()
+
+
+def _snapshot_path(name: str) -> Path:
+    return Path(SCHEMA_SNAPSHOT_DIR) / f"{name}.schema.pickle"  # type: ignore [arg-type]
+
+
+def _load_snapshot(name: str, fingerprint: str) -> dict | None:
+    path = _snapshot_path(name)
+    try:
+        with path.open("rb") as f:
+            snapshot = pickle.load(f)  # noqa: S301
+    except FileNotFoundError:
+        logger.info("No schema snapshot found for %s at %s", name, path)
+        return None
+    except Exception:
+        logger.exception("Failed to load schema snapshot for %s from %s", name, path)
+        return None
+
+    if snapshot.get("sqlalchemy_version") != sqlalchemy.__version__:
+        logger.info("Schema snapshot for %s was taken with a different SQLAlchemy version", name)
+        return None
+
+    if snapshot.get("fingerprint") != fingerprint:
+        logger.info("Schema snapshot for %s is stale", name)
+        return None
+
+    return snapshot["info_cache"]
+
+
+def _write_snapshot(name: str, fingerprint: str, info_cache: dict) -> Path:
+    path = _snapshot_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    snapshot = {
+        "sqlalchemy_version": sqlalchemy.__version__,
+        "fingerprint": fingerprint,
+        "info_cache": info_cache,
+    }
+    # several workers may boot at once, write to a temporary file and swap it in atomically
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(snapshot, f)
+        os.replace(tmp_path, path)
+    except Exception:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+    return path
+
+
+# Every table in the schema is reflected anyway, so foreign keys resolve without following them. Following
+# them would reflect referred tables through a new Inspector that does not share the snapshot cache.
+REFLECTION_OPTIONS = {"resolve_fks": False}
+
+
+def _reflect_with_inspector(engine: "Engine") -> tuple["Inspector", str]:
+    inspector = inspect(engine)
+    with engine.connect() as connection:
+        fingerprint = schema_fingerprint(connection)
+
+    return inspector, fingerprint
+
+
+def prepare_automap_base(name: str, base: type["AutomapBase"], engine: "Engine") -> None:
+    """Reflect and map an automap base, reusing a persisted schema snapshot when possible.
+
+    The snapshot is the reflection cache of a SQLAlchemy Inspector. When it is still valid for the live
+    schema the Inspector answers every reflection call from it, so no catalog queries are issued beyond
+    the fingerprint check. When it is missing or stale, reflection runs as usual and the snapshot is
+    rewritten.
+    """
+    if not SCHEMA_SNAPSHOT_DIR:
+        base.prepare(engine, reflect=True)
+        return
+
+    inspector, fingerprint = _reflect_with_inspector(engine)
+    if cached := _load_snapshot(name, fingerprint):
+        inspector.info_cache.update(cached)
+        base.prepare(autoload_with=inspector, reflection_options=REFLECTION_OPTIONS)
+        logger.info("Prepared %s models from schema snapshot", name)
+        return
+
+    base.prepare(autoload_with=inspector, reflection_options=REFLECTION_OPTIONS)
+    try:
+        path = _write_snapshot(name, fingerprint, inspector.info_cache)
+    except Exception:
+        logger.exception("Failed to write schema snapshot for %s", name)
+    else:
+        logger.info("Prepared %s models by reflection and saved schema snapshot to %s", name, path)
+
+
+def refresh_schema_snapshot(name: str, engine: "Engine") -> Path:
+    """Reflect the live schema into a throwaway MetaData and overwrite the snapshot for it."""
+    inspector, fingerprint = _reflect_with_inspector(engine)
+    sqlalchemy.MetaData().reflect(inspector, **REFLECTION_OPTIONS)
+    return _write_snapshot(name, fingerprint, inspector.info_cache)
@@ -22,6 +22,7 @@ from event_horizon.activity_utils.enums import ActivityType
 from event_horizon.activity_utils.tasks import sync_send_activity
 from event_horizon.admin.model_views import BaseModelView, CanDeleteModelView
 from event_horizon.carina.utils import delete_reward_campaign
+from event_horizon.metrics import outbound_request_hook, timed_custom_action
 from event_horizon.vela.custom_actions import CampaignEndAction
 from event_horizon.vela.db import Campaign, RetailerRewards, RewardRule
 from event_horizon.vela.validators import (
@@ -140,6 +141,7 @@ class CampaignAdmin(CanDeleteModelView):
         if cmp_end_action.form.validate_on_submit():
             del session["form_dynamic_val"]
             cmp_end_action.end_campaigns(self._campaigns_status_change, self.sso_username)
+            self._invalidate_reference_data()
             return redirect(campaigns_index_uri)
 
         return self.render(
@@ -159,6 +161,7 @@ class CampaignAdmin(CanDeleteModelView):
                     f"{settings.VELA_BASE_URL}/{retailer_slug}/campaigns/{campaign_slug}",
                     headers={"Authorization": f"token {settings.VELA_AUTH_TOKEN}"},
                     timeout=settings.REQUEST_TIMEOUT,
+                    hooks={"response": outbound_request_hook("vela")},
                 )
                 if not 200 <= resp.status_code <= 204:
                     flash("Could not complete this action. Please try again", category="error")
@@ -179,6 +182,7 @@ class CampaignAdmin(CanDeleteModelView):
         return False
 
     def after_model_delete(self, model: Campaign) -> None:
+        super().after_model_delete(model)
         # Synchronously send activity for a campaign deletion after successful deletion
         activity_data = {}
         try:
@@ -242,6 +246,7 @@ class CampaignAdmin(CanDeleteModelView):
                 headers={"Authorization": f"token {settings.VELA_AUTH_TOKEN}"},
                 json=request_body,
                 timeout=settings.REQUEST_TIMEOUT,
+                hooks={"response": outbound_request_hook("vela")},
             )
             if 200 <= resp.status_code <= 204:
                 # Change success message depending on action chose for ending campaign
@@ -340,6 +345,7 @@ class CampaignAdmin(CanDeleteModelView):
         return super().on_model_change(form, model, is_created)
 
     def after_model_change(self, form: wtforms.Form, model: "Campaign", is_created: bool) -> None:
+        super().after_model_change(form, model, is_created)
         if is_created:
             # Synchronously send activity for campaign creation after successfull campaign creation
             sync_send_activity(
@@ -520,6 +526,7 @@ class CampaignAdmin(CanDeleteModelView):
         "Clone",
         "Only one campaign allowed for this action, the selected campaign's retailer must be in a TEST state.",
     )
+    @timed_custom_action("clone-campaign")
     def clone_campaign_action(self, ids: list[str]) -> None:
         if len(ids) > 1:
             flash("Only one campaign at a time is supported for this action.", category="error")
@@ -776,6 +783,7 @@ class RewardRuleAdmin(CanDeleteModelView):
 class RetailerRewardsAdmin(BaseModelView):
     can_create = False
     can_edit = False
+    cache_list_results = True
     column_default_sort = ("slug", False)
     column_searchable_list = ("slug",)
     column_filters = ("status",)
@@ -797,10 +805,18 @@ class RetailerStoreAdmin(BaseModelView):
 
 
 class TransactionAdmin(BaseModelView):
+    keyset_pagination = True
+    time_window_column = "datetime"
+    count_strategy = "estimated"
+    deferred_count = True
     column_filters = ("retailerrewards.slug", "created_at", "datetime")
     column_searchable_list = ("transaction_id", "account_holder_uuid")
+    search_planner = True
 
 
 class ProcessedTransactionAdmin(BaseModelView):
+    keyset_pagination = True
+    time_window_column = "datetime"
     column_filters = ("retailerrewards.slug", "created_at", "datetime")
     column_searchable_list = ("transaction_id", "payment_transaction_id", "account_holder_uuid")
+    search_planner = True
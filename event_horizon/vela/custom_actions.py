@@ -1,5 +1,5 @@
 import logging
-from collections.abc import Callable, Generator
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, ClassVar, cast
@@ -8,8 +8,10 @@ from flask import flash
 from sqlalchemy.future import select
 
 from event_horizon.activity_utils.enums import ActivityType
-from event_horizon.activity_utils.tasks import sync_send_activity
+from event_horizon.activity_utils.journal import BulkPublishJournal
+from event_horizon.activity_utils.tasks import journal_activities, publish_journals, sync_send_activity
 from event_horizon.admin.utils import SessionDataMethodsMixin
+from event_horizon.metrics import timed_custom_action
 from event_horizon.polaris.db import db_session as polaris_db_session
 from event_horizon.polaris.utils import transfer_balance, transfer_pending_rewards
 from event_horizon.vela.db.models import Campaign, RetailerRewards, RewardRule
@@ -174,8 +176,9 @@ class CampaignEndAction:
         transfer_balance_requested: bool,
         transfer_pending_rewards_requested: bool,
     ) -> None:
-        pending_rewards_transfer_activity_payloads: Generator[dict, None, None] | None = None
-        balance_change_activity_payloads: Generator[dict, None, None] | None = None
+        pending_rewards_transfer_activity_payloads: Iterator[dict] | None = None
+        balance_change_activity_payloads: Iterator[dict] | None = None
+        journals: list[BulkPublishJournal | None] = []
         msg = f"Transfer from campaign '{from_campaign.slug}' to campaign '{to_campaign.slug}'."
 
         # start a session savepoint to ensure all polaris changes are either successful or rolled back.
@@ -208,13 +211,27 @@ class CampaignEndAction:
 
             savepoint.commit()
 
+        # the activities are only published once the transfers have been committed, resuming if publishing dies part way
         if pending_rewards_transfer_activity_payloads:
-            sync_send_activity(pending_rewards_transfer_activity_payloads, routing_key=ActivityType.REWARD_STATUS.value)
+            journals.append(
+                journal_activities(
+                    pending_rewards_transfer_activity_payloads,
+                    routing_key=ActivityType.REWARD_STATUS.value,
+                    session=polaris_db_session,
+                )
+            )
 
         if balance_change_activity_payloads:
-            sync_send_activity(balance_change_activity_payloads, routing_key=ActivityType.BALANCE_CHANGE.value)
+            journals.append(
+                journal_activities(
+                    balance_change_activity_payloads,
+                    routing_key=ActivityType.BALANCE_CHANGE.value,
+                    session=polaris_db_session,
+                )
+            )
 
         polaris_db_session.commit()
+        publish_journals(journals)
         flash(msg)
 
     # this is a separate method to allow for easy mocking
@@ -238,11 +255,61 @@ class CampaignEndAction:
             )
             flash(activity_data.error_message, category="error")
 
+    def _activate_draft_campaign(  # noqa: PLR0913
+        self,
+        status_change_fn: Callable,
+        sso_username: str,
+        activity_start_dt: datetime,
+        transfer_balance_requested: bool,
+        transfer_pending_rewards_requested: bool,
+    ) -> tuple[bool, ActivityData | None]:
+        """Activate the draft campaign and transfer to it what was requested, returns the status change's success and
+        the campaign migration activity, if any"""
+        draft_campaign = cast(CampaignRow, self.session_form_data.draft_campaign)
+        if not status_change_fn([draft_campaign.id], "active"):
+            return False, None
+
+        if not (transfer_balance_requested or transfer_pending_rewards_requested):
+            return True, None
+
+        to_campaign_start_date = self._get_campaign_start_date_by_id(draft_campaign.id)
+        self._update_from_campaign_end_date()
+        self._transfer_balance_and_pending_rewards(
+            retailer_slug=self.session_form_data.retailer_slug,
+            from_campaign=self.session_form_data.active_campaign,
+            to_campaign=draft_campaign,
+            to_campaign_start_date=to_campaign_start_date,
+            rate_percent=self.form.convert_rate.data,
+            threshold=self.form.qualify_threshold.data,
+            transfer_balance_requested=transfer_balance_requested,
+            transfer_pending_rewards_requested=transfer_pending_rewards_requested,
+        )
+
+        return True, ActivityData(
+            type=ActivityType.CAMPAIGN_MIGRATION,
+            payload=ActivityType.get_campaign_migration_activity_data(
+                retailer_slug=self.session_form_data.retailer_slug,
+                from_campaign_slug=self.session_form_data.active_campaign.slug,
+                to_campaign_slug=draft_campaign.slug,
+                sso_username=sso_username,
+                activity_datetime=activity_start_dt,
+                balance_conversion_rate=self.form.convert_rate.data,
+                qualify_threshold=self.form.qualify_threshold.data,
+                pending_rewards=self.form.handle_pending_rewards.data,
+                transfer_balance_requested=transfer_balance_requested,
+            ),
+            error_message=(
+                "Balance migrated successfully but failed to end the active campaign"
+                f" {self.session_form_data.active_campaign.slug}."
+            ),
+        )
+
+    @timed_custom_action("end_campaigns")
     def end_campaigns(self, status_change_fn: Callable, sso_username: str) -> None:
         activity_start_dt = datetime.now(tz=timezone.utc)
         campaign_migration_activity: ActivityData | None = None
         success = True
-        transfer_balance_requested = self.form.transfer_balance and self.form.transfer_balance.data
+        transfer_balance_requested = bool(self.form.transfer_balance and self.form.transfer_balance.data)
         transfer_pending_rewards_requested, issue_pending_rewards = cast(
             PendingRewardChoices, self.form.handle_pending_rewards.data
         ).get_strategy()
@@ -252,40 +319,13 @@ class CampaignEndAction:
             raise ValueError("unexpected: no draft campaign found")
 
         if self.session_form_data.draft_campaign:
-            success = status_change_fn([self.session_form_data.draft_campaign.id], "active")
-
-            if success and transfer_requested:
-                to_campaign_start_date = self._get_campaign_start_date_by_id(self.session_form_data.draft_campaign.id)
-                self._update_from_campaign_end_date()
-                self._transfer_balance_and_pending_rewards(
-                    retailer_slug=self.session_form_data.retailer_slug,
-                    from_campaign=self.session_form_data.active_campaign,
-                    to_campaign=self.session_form_data.draft_campaign,
-                    to_campaign_start_date=to_campaign_start_date,
-                    rate_percent=self.form.convert_rate.data,
-                    threshold=self.form.qualify_threshold.data,
-                    transfer_balance_requested=transfer_balance_requested,
-                    transfer_pending_rewards_requested=transfer_pending_rewards_requested,
-                )
-
-                campaign_migration_activity = ActivityData(
-                    type=ActivityType.CAMPAIGN_MIGRATION,
-                    payload=ActivityType.get_campaign_migration_activity_data(
-                        retailer_slug=self.session_form_data.retailer_slug,
-                        from_campaign_slug=self.session_form_data.active_campaign.slug,
-                        to_campaign_slug=self.session_form_data.draft_campaign.slug,
-                        sso_username=sso_username,
-                        activity_datetime=activity_start_dt,
-                        balance_conversion_rate=self.form.convert_rate.data,
-                        qualify_threshold=self.form.qualify_threshold.data,
-                        pending_rewards=self.form.handle_pending_rewards.data,
-                        transfer_balance_requested=transfer_balance_requested,
-                    ),
-                    error_message=(
-                        "Balance migrated successfully but failed to end the active campaign"
-                        f" {self.session_form_data.active_campaign.slug}."
-                    ),
-                )
+            success, campaign_migration_activity = self._activate_draft_campaign(
+                status_change_fn,
+                sso_username,
+                activity_start_dt,
+                transfer_balance_requested,
+                transfer_pending_rewards_requested,
+            )
 
         if success:
             success = status_change_fn(
@@ -1,13 +1,13 @@
 from sqlalchemy import MetaData
-from sqlalchemy.ext.automap import AutomapBase, automap_base
+from sqlalchemy.ext.automap import AutomapBase
 
-from event_horizon.db import UpdatedAtMixin
+from event_horizon.db import ReferenceDataMixin, UpdatedAtMixin, lazy_automap_base
 
 metadata = MetaData()
-Base: AutomapBase = automap_base(metadata=metadata)
+Base: AutomapBase = lazy_automap_base(metadata)
 
 
-class RetailerRewards(Base):
+class RetailerRewards(Base, ReferenceDataMixin):
     __tablename__ = "retailer_rewards"
 
     def __repr__(self) -> str:
@@ -21,7 +21,7 @@ class RetailerStore(Base, UpdatedAtMixin):
         return self.store_name
 
 
-class Campaign(Base, UpdatedAtMixin):
+class Campaign(Base, UpdatedAtMixin, ReferenceDataMixin):
     __tablename__ = "campaign"
 
     def __repr__(self) -> str:
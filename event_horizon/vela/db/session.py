@@ -1,8 +1,7 @@
-from sqlalchemy import create_engine
 from sqlalchemy.orm import scoped_session, sessionmaker
-from sqlalchemy.pool import NullPool
 
-from event_horizon.settings import VELA_DATABASE_URI
+from event_horizon.db import create_db_engine
+from event_horizon.settings import VELA_DATABASE_URI, VELA_DB_POOL
 
-engine = create_engine(VELA_DATABASE_URI, poolclass=NullPool)
+engine = create_db_engine("vela", VELA_DATABASE_URI, VELA_DB_POOL)
 db_session = scoped_session(sessionmaker(bind=engine))
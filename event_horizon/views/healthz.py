@@ -1,8 +1,12 @@
 from flask.blueprints import Blueprint
-from sqlalchemy.sql import text
 
-from event_horizon.polaris.db import db_session as polaris_db_session
-from event_horizon.vela.db import db_session as vela_db_session
+from event_horizon.carina.db.session import engine as carina_engine
+from event_horizon.db import get_pool_stats
+from event_horizon.hubble.db.session import engine as hubble_engine
+from event_horizon.polaris.db.session import engine as polaris_engine
+from event_horizon.readiness import ProbeResult, readiness_checker
+from event_horizon.settings import READINESS_DEPENDENCIES, READINESS_REQUIRED_DEPENDENCIES
+from event_horizon.vela.db.session import engine as vela_engine
 
 healthz_bp = Blueprint("healthz", __name__)
 
@@ -12,25 +16,28 @@ def livez() -> dict:
     return {}
 
 
+def _readiness_response(results: dict[str, ProbeResult], required: list[str] | tuple[str, ...]) -> tuple[dict, int]:
+    status_code = 200 if all(results[name].ok for name in required) else 500
+    # deepcode ignore ServerInformationExposure: this is an internal endpoint
+    return {name: result.as_dict() for name, result in results.items()}, status_code
+
+
 @healthz_bp.route("/readyz", methods=["GET"])
 def readyz() -> tuple[dict, int]:
-    payload = {}
-    status_code = 200
-    db_errors = []
+    return _readiness_response(readiness_checker.check(), READINESS_REQUIRED_DEPENDENCIES)
 
-    try:
-        polaris_db_session.execute(text("SELECT 1"))
-    except Exception as ex:
-        db_errors.append(f"failed to connect to polaris database due to error: {ex!r}")
 
-    try:
-        vela_db_session.execute(text("SELECT 1"))
-    except Exception as ex:
-        db_errors.append(f"failed to connect to vela database due to error: {ex!r}")
+@healthz_bp.route("/readyz/deep", methods=["GET"])
+def readyz_deep() -> tuple[dict, int]:
+    return _readiness_response(readiness_checker.check(use_cache=False), READINESS_DEPENDENCIES)
 
-    if db_errors:
-        payload = {"postgres": db_errors}
-        status_code = 500
 
-    # deepcode ignore ServerInformationExposure: this is an internal endpoint
-    return payload, status_code
+@healthz_bp.route("/poolz", methods=["GET"])
+def poolz() -> dict:
+    # per worker process connection pool usage, counters reset when the worker restarts
+    return {
+        "polaris": get_pool_stats(polaris_engine),
+        "vela": get_pool_stats(vela_engine),
+        "carina": get_pool_stats(carina_engine),
+        "hubble": get_pool_stats(hubble_engine),
+    }
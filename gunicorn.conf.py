@@ -0,0 +1,23 @@
+import os
+
+from typing import TYPE_CHECKING
+
+from prometheus_client import multiprocess
+
+if TYPE_CHECKING:  # pragma: no cover
+    from gunicorn.arbiter import Arbiter
+    from gunicorn.workers.base import Worker
+
+
+def child_exit(server: "Arbiter", worker: "Worker") -> None:
+    # drop the live gauge samples of workers that exited, their files in PROMETHEUS_MULTIPROC_DIR are left behind
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def post_worker_init(worker: "Worker") -> None:
+    # imported once the worker has loaded the app, importing it here would load the settings in the arbiter
+    from event_horizon.app import start_background_threads
+
+    # background threads don't survive forking, every worker starts its own
+    start_background_threads()
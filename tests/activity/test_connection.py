@@ -0,0 +1,102 @@
+import threading
+
+from unittest import mock
+
+import pytest
+
+from pytest_mock import MockerFixture
+
+from event_horizon.activity_utils.connection import ActivityConnectionManager
+
+
+class BrokerConnectionError(Exception):
+    pass
+
+
+class FakeConnection:
+    """Stands in for a kombu connection to a local broker"""
+
+    connection_errors = (BrokerConnectionError,)
+    channel_errors = ()
+
+    def __init__(self, transport_options: dict | None = None) -> None:
+        self.transport_options = transport_options or {}
+        self.released = False
+
+    def clone(self, **kwargs: dict) -> "FakeConnection":
+        return FakeConnection(**kwargs)
+
+    def release(self) -> None:
+        self.released = True
+
+
+@pytest.fixture(name="connect")
+def connect_fixture() -> mock.MagicMock:
+    return mock.MagicMock(side_effect=lambda: (FakeConnection({"heartbeat": 10}), "exchange"))
+
+
+@pytest.fixture(name="manager")
+def manager_fixture(connect: mock.MagicMock, mocker: MockerFixture) -> ActivityConnectionManager:
+    mocker.patch("event_horizon.activity_utils.connection.time.sleep")
+    return ActivityConnectionManager(connect, max_retries=2, backoff=0.1, max_backoff=1)
+
+
+def test_connections_are_made_lazily_per_thread(manager: ActivityConnectionManager, connect: mock.MagicMock) -> None:
+    connect.assert_not_called()
+
+    connection, exchange = manager.get()
+    assert exchange == "exchange"
+    assert connection.transport_options == {"heartbeat": 10, "confirm_publish": False}
+    assert manager.get()[0] is connection
+    assert manager.get(confirmed=True)[0].transport_options == {"heartbeat": 10, "confirm_publish": True}
+
+    other_thread_connections = []
+    thread = threading.Thread(target=lambda: other_thread_connections.append(manager.get()[0]))
+    thread.start()
+    thread.join()
+    assert other_thread_connections[0] is not connection
+    connect.assert_called_once()
+
+    manager.close()
+    assert connection.released
+    assert other_thread_connections[0].released
+
+
+def test_connections_are_not_shared_after_a_fork(
+    manager: ActivityConnectionManager, connect: mock.MagicMock, mocker: MockerFixture
+) -> None:
+    connection, _ = manager.get()
+    mocker.patch("event_horizon.activity_utils.connection.os.getpid", return_value=-1)
+
+    assert manager.get()[0] is not connection
+    assert connect.call_count == 2
+    # the parent's connection is left alone
+    assert not connection.released
+
+
+def test_publish_reconnects(manager: ActivityConnectionManager, connect: mock.MagicMock) -> None:
+    connect.side_effect = [OSError("connection refused"), (FakeConnection(), "exchange")]
+    connections = []
+
+    def send(connection: FakeConnection, exchange: str) -> str:
+        connections.append(connection)
+        if len(connections) == 1:
+            raise BrokerConnectionError("missed heartbeats")
+        return exchange
+
+    assert manager.publish(send) == "exchange"
+    assert connections[0].released
+    assert not connections[1].released
+
+
+def test_publish_gives_up(manager: ActivityConnectionManager) -> None:
+    send = mock.MagicMock(side_effect=BrokerConnectionError)
+    with pytest.raises(BrokerConnectionError):
+        manager.publish(send)
+    assert send.call_count == 3
+
+    # invalid payloads are not published again
+    send = mock.MagicMock(side_effect=ValueError)
+    with pytest.raises(ValueError):
+        manager.publish(send)
+    send.assert_called_once()
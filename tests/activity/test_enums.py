@@ -4,9 +4,12 @@ import uuid
 
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
+from typing import Any
 
+import pytest
 import yaml
 
+from pydantic import ValidationError
 from pytest_mock import MockFixture
 
 from event_horizon.activity_utils.enums import ActivityType
@@ -765,6 +768,73 @@ def test_get_balance_change_activity_data(mocker: MockFixture) -> None:
         }
 
 
+def test_get_balance_change_activity_data_batch(mocker: MockFixture) -> None:
+    mock_datetime = mocker.patch("event_horizon.activity_utils.enums.datetime")
+    mock_datetime.now.return_value = datetime.now(tz=timezone.utc)
+
+    account_holder_uuids = [str(uuid.uuid4()) for _ in range(4)]
+    new_balances = [1200, 100, 1250, 1200]
+    activity_datetime = datetime.now(tz=timezone.utc)
+
+    for loyalty_type in ("STAMPS", "ACCUMULATOR"):
+        kwargs: dict[str, Any] = {
+            "retailer_slug": "test-retailer",
+            "from_campaign_slug": "ended-campaign",
+            "to_campaign_slug": "activated-campaign",
+            "activity_datetime": activity_datetime,
+            "loyalty_type": loyalty_type,
+        }
+
+        payloads = list(
+            ActivityType.get_balance_change_activity_data_batch(
+                account_holder_uuids=account_holder_uuids, new_balances=new_balances, **kwargs
+            )
+        )
+
+        assert len({payload.pop("id") for payload in payloads}) == 4, "payload ids are not unique"
+        expected = [
+            ActivityType.get_balance_change_activity_data(
+                account_holder_uuid=account_holder_uuid, new_balance=new_balance, **kwargs
+            )
+            for account_holder_uuid, new_balance in zip(account_holder_uuids, new_balances, strict=True)
+        ]
+        for payload in expected:
+            payload.pop("id")
+        assert payloads == expected
+        assert [list(payload) for payload in payloads] == [list(payload) for payload in expected]
+        # one timestamp for the whole batch
+        assert mock_datetime.now.call_count == 1 + len(expected)
+        mock_datetime.now.reset_mock()
+
+    assert not list(
+        ActivityType.get_balance_change_activity_data_batch(account_holder_uuids=[], new_balances=[], **kwargs)
+    )
+    with pytest.raises(ValidationError):
+        ActivityType.get_balance_change_activity_data_batch(
+            account_holder_uuids=account_holder_uuids[:1], new_balances=[-100], **kwargs
+        )
+
+
+def test_get_balance_change_activity_data_batch_payloads_are_independent() -> None:
+    payloads = list(
+        ActivityType.get_balance_change_activity_data_batch(
+            retailer_slug="test-retailer",
+            from_campaign_slug="ended-campaign",
+            to_campaign_slug="activated-campaign",
+            account_holder_uuids=[str(uuid.uuid4()) for _ in range(2)],
+            activity_datetime=datetime.now(tz=timezone.utc),
+            new_balances=[100, 200],
+            loyalty_type="STAMPS",
+        )
+    )
+    reasons, campaigns = list(payloads[1]["reasons"]), list(payloads[1]["campaigns"])
+
+    payloads[0]["reasons"].append("Changed")
+    payloads[0]["campaigns"].clear()
+
+    assert (payloads[1]["reasons"], payloads[1]["campaigns"]) == (reasons, campaigns)
+
+
 def test_get_campaign_migration_activity_data(mocker: MockFixture) -> None:
     mock_datetime = mocker.patch("event_horizon.activity_utils.enums.datetime")
     fake_now = datetime.now(tz=timezone.utc)
@@ -1041,6 +1111,48 @@ def test_get_reward_status_activity_data(mocker: MockFixture) -> None:
     }
 
 
+def test_get_reward_status_activity_data_batch(mocker: MockFixture) -> None:
+    mock_datetime = mocker.patch("event_horizon.activity_utils.enums.datetime")
+    mock_datetime.now.return_value = datetime.now(tz=timezone.utc)
+
+    account_holder_uuids = [str(uuid.uuid4()) for _ in range(3)]
+    pending_reward_uuids = [str(uuid.uuid4()) for _ in range(3)]
+    kwargs: dict[str, Any] = {
+        "retailer_slug": "test-retailer",
+        "from_campaign_slug": "ended-campaign",
+        "to_campaign_slug": "activated-campaign",
+        "activity_datetime": datetime.now(tz=timezone.utc),
+    }
+
+    payloads = list(
+        ActivityType.get_reward_status_activity_data_batch(
+            account_holder_uuids=account_holder_uuids,
+            pending_reward_uuids=pending_reward_uuids,
+            **kwargs,
+        )
+    )
+
+    assert len({payload.pop("id") for payload in payloads}) == 3, "payload ids are not unique"
+    expected = [
+        ActivityType.get_reward_status_activity_data(
+            account_holder_uuid=account_holder_uuid,
+            pending_reward_uuid=pending_reward_uuid,
+            **kwargs,
+        )
+        for account_holder_uuid, pending_reward_uuid in zip(account_holder_uuids, pending_reward_uuids, strict=True)
+    ]
+    for payload in expected:
+        payload.pop("id")
+    assert payloads == expected
+    assert [list(payload) for payload in payloads] == [list(payload) for payload in expected]
+
+    # payloads don't share their lists and dicts
+    payloads[0]["reasons"].append("Changed")
+    payloads[0]["campaigns"].clear()
+    payloads[0]["data"]["new_campaign"] = "changed"
+    assert payloads[1:] == expected[1:]
+
+
 def test_delete_account_holder_activity_data(mocker: MockFixture) -> None:
     mock_datetime = mocker.patch("event_horizon.activity_utils.enums.datetime")
     fake_now = datetime.now(tz=timezone.utc)
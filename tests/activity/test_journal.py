@@ -0,0 +1,129 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+import pytest
+
+from event_horizon.activity_utils.journal import READY_JOURNALS_KEY, BulkPublishJournal
+from event_horizon.activity_utils.tasks import BulkPublishProgress, publish_in_chunks
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+        self.lists: dict[str, list[bytes]] = {}
+        self.sets: dict[str, set[bytes]] = {}
+
+    def get(self, name: str) -> bytes | None:
+        return self.values.get(name)
+
+    def set(self, name: str, value: str | int, ex: int, nx: bool = False) -> bool:  # noqa: ARG002
+        if nx and name in self.values:
+            return False
+
+        self.values[name] = str(value).encode()
+        return True
+
+    def delete(self, *names: str) -> None:
+        for name in names:
+            self.values.pop(name, None)
+            self.lists.pop(name, None)
+
+    def expire(self, name: str, time: int) -> None:
+        pass
+
+    def rpush(self, name: str, *values: str) -> None:
+        self.lists.setdefault(name, []).extend(value.encode() for value in values)
+
+    def lrange(self, name: str, start: int, end: int) -> list[bytes]:
+        return self.lists.get(name, [])[start : end + 1]
+
+    def sadd(self, name: str, *values: str) -> None:
+        self.sets.setdefault(name, set()).update(value.encode() for value in values)
+
+    def srem(self, name: str, *values: str) -> None:
+        self.sets.get(name, set()).difference_update(value.encode() for value in values)
+
+    def smembers(self, name: str) -> frozenset[bytes]:
+        return frozenset(self.sets.get(name, ()))
+
+
+@pytest.fixture(name="redis")
+def redis_fixture() -> FakeRedis:
+    return FakeRedis()
+
+
+def _write(redis: FakeRedis, payloads: list[dict]) -> BulkPublishJournal:
+    return BulkPublishJournal.write(
+        redis,
+        iter(payloads),
+        "activity.balance.change",
+        chunk_size=2,
+        ttl=60,
+        lock_timeout=10,
+    )
+
+
+def _ready(redis: FakeRedis) -> list[BulkPublishJournal]:
+    return list(BulkPublishJournal.ready(redis, ttl=60, lock_timeout=10))
+
+
+def test_journal_publishes_once_ready(redis: FakeRedis) -> None:
+    journal = _write(redis, [{"id": 1, "datetime": datetime(2023, 1, 1, tzinfo=timezone.utc)}, {"id": 2}])
+    assert journal.routing_key == "activity.balance.change"
+    # not committed yet
+    assert not _ready(redis)
+
+    journal.mark_ready()
+    assert [ready.key for ready in _ready(redis)] == [journal.key]
+
+    publish = mock.MagicMock(side_effect=publish_in_chunks)
+    with mock.patch("event_horizon.activity_utils.tasks.publish_activity") as mock_publish_activity:
+        assert journal.publish(publish, chunk_size=2) == 2
+
+    mock_publish_activity.assert_called_once_with(
+        [{"id": 1, "datetime": "2023-01-01T00:00:00+00:00"}, {"id": 2}],
+        routing_key="activity.balance.change",
+        confirmed=True,
+    )
+    assert not _ready(redis)
+    assert not redis.values
+    assert not redis.lists
+
+
+def test_journal_resumes_from_the_last_confirmed_chunk(redis: FakeRedis) -> None:
+    journal = _write(redis, [{"id": i} for i in range(5)])
+    journal.mark_ready()
+
+    with (
+        mock.patch("event_horizon.activity_utils.tasks.publish_activity", side_effect=[None, ConnectionError]),
+        pytest.raises(ConnectionError),
+    ):
+        journal.publish(publish_in_chunks, chunk_size=2)
+
+    # the failed publish released its lock, another process picks the journal up after the confirmed chunk
+    [resumed] = _ready(redis)
+    with mock.patch("event_horizon.activity_utils.tasks.publish_activity") as mock_publish_activity:
+        assert resumed.publish(publish_in_chunks, chunk_size=2) == 3
+
+    assert mock_publish_activity.call_args_list == [
+        mock.call([{"id": 2}, {"id": 3}], routing_key="activity.balance.change", confirmed=True),
+        mock.call([{"id": 4}], routing_key="activity.balance.change", confirmed=True),
+    ]
+    assert not _ready(redis)
+
+
+def test_journal_is_not_resumed_while_locked(redis: FakeRedis) -> None:
+    journal = _write(redis, [{"id": 1}])
+    journal.mark_ready()
+    publish = mock.MagicMock()
+
+    [other] = _ready(redis)
+    assert other.publish(publish, chunk_size=2) == 0
+    publish.assert_not_called()
+
+    # the lock expires once the process publishing the journal died
+    redis.delete(f"{journal.key}:lock")
+    publish.return_value = BulkPublishProgress("activity.balance.change", sent=1, confirmed=1)
+    assert other.publish(publish, chunk_size=2) == 1
+    assert not _ready(redis)
+    assert not redis.smembers(READY_JOURNALS_KEY)
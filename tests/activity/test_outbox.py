@@ -0,0 +1,115 @@
+import threading
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session
+
+from event_horizon.activity_utils.outbox import (
+    activity_outbox,
+    idempotency_key,
+    purge_published,
+    relay_batch,
+    run_relay,
+    write_activities,
+)
+
+ACTIVITY_DATETIME = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(name="session")
+def session_fixture(tmp_path: Path) -> Session:
+    engine = create_engine(f"sqlite:///{tmp_path / 'polaris.db'}")
+    # created by polaris' migrations
+    activity_outbox.metadata.create_all(engine)
+    return Session(engine)
+
+
+def _outbox(session: Session) -> list[tuple[str, dict, bool]]:
+    return [
+        (row.routing_key, row.payload, row.published_at is not None)
+        for row in session.execute(select(activity_outbox).order_by(activity_outbox.c.id))
+    ]
+
+
+def test_write_activities(session: Session) -> None:
+    payloads = [{"activity_identifier": str(i), "datetime": ACTIVITY_DATETIME} for i in range(2)]
+
+    write_activities(session, iter(payloads), "activity.balance.change")
+    # writing the same activities again doesn't duplicate them
+    write_activities(session, payloads[:1], "activity.balance.change")
+    session.rollback()
+    assert not _outbox(session)
+
+    write_activities(session, iter(payloads), "activity.balance.change")
+    write_activities(session, payloads[:1], "activity.balance.change")
+    session.commit()
+    assert _outbox(session) == [
+        ("activity.balance.change", {"activity_identifier": "0", "datetime": "2023-01-01T00:00:00+00:00"}, False),
+        ("activity.balance.change", {"activity_identifier": "1", "datetime": "2023-01-01T00:00:00+00:00"}, False),
+    ]
+    assert session.execute(select(activity_outbox.c.idempotency_key)).scalars().first() == idempotency_key(
+        {"activity_identifier": "0", "datetime": "2023-01-01T00:00:00+00:00"}, "activity.balance.change"
+    )
+
+
+def test_relay_batch(session: Session) -> None:
+    write_activities(session, [{"id": 1}, {"id": 2}], "activity.reward.status")
+    write_activities(session, [{"id": 3}], "activity.balance.change")
+    session.commit()
+    send = mock.MagicMock(side_effect=[None, ValueError])
+
+    # the confirmed activities are marked as published, the relay resumes from the ones that failed
+    with pytest.raises(ValueError):
+        relay_batch(session, send, batch_size=10)
+    assert [published for _, _, published in _outbox(session)] == [True, True, False]
+
+    write_activities(session, [{"id": 4}], "activity.reward.status")
+    session.commit()
+    send = mock.MagicMock()
+    assert relay_batch(session, send, batch_size=1) == 1
+    assert relay_batch(session, send, batch_size=1) == 1
+    assert relay_batch(session, send, batch_size=1) == 0
+    assert send.call_args_list == [
+        mock.call([{"id": 3}], routing_key="activity.balance.change"),
+        mock.call([{"id": 4}], routing_key="activity.reward.status"),
+    ]
+    assert [published for _, _, published in _outbox(session)] == [True, True, True, True]
+
+
+def test_purge_published(session: Session) -> None:
+    write_activities(session, [{"id": 1}, {"id": 2}, {"id": 3}], "activity.reward.status")
+    session.execute(
+        update(activity_outbox)
+        .where(activity_outbox.c.id < 3)
+        .values(published_at=datetime.now(tz=timezone.utc) - timedelta(days=8))
+    )
+    session.execute(
+        update(activity_outbox).where(activity_outbox.c.id == 2).values(published_at=datetime.now(tz=timezone.utc))
+    )
+    session.commit()
+
+    assert purge_published(session, timedelta(days=7)) == 1
+    assert [payload for _, payload, _ in _outbox(session)] == [{"id": 2}, {"id": 3}]
+
+
+def test_run_relay(session: Session) -> None:
+    write_activities(session, [{"id": 1}], "activity.reward.status")
+    session.commit()
+    stop = threading.Event()
+    # the first attempt fails, the relay carries on
+    send = mock.MagicMock(side_effect=[ConnectionError, None])
+
+    def wait(timeout: float) -> None:
+        if send.call_count == 2:
+            stop.set()
+
+    with mock.patch.object(stop, "wait", side_effect=wait):
+        run_relay(session, send, batch_size=10, poll_interval=0, retention=timedelta(days=7), stop=stop)
+
+    assert send.call_count == 2
+    assert _outbox(session) == [("activity.reward.status", {"id": 1}, True)]
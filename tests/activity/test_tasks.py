@@ -0,0 +1,182 @@
+from unittest import mock
+
+import pytest
+
+from pytest_mock import MockerFixture
+
+from event_horizon.activity_utils import tasks
+from event_horizon.activity_utils.tasks import (
+    ActivityPublisher,
+    BulkPublishProgress,
+    journal_activities,
+    publish_in_chunks,
+    publish_journals,
+    resume_journals,
+    sync_send_activity,
+)
+
+
+@pytest.fixture(name="publisher")
+def publisher_fixture() -> ActivityPublisher:
+    return ActivityPublisher(mock.MagicMock(), maxsize=3, batch_size=2, flush_interval=0.01, drain_timeout=5)
+
+
+def test_publisher_publishes_batches(publisher: ActivityPublisher) -> None:
+    assert not publisher.enqueue([{"id": 1}, {"id": 2}], "activity.campaign")
+    assert publisher.enqueue([{"id": 3}, {"id": 4}], "activity.reward.status") == [{"id": 4}]
+
+    publisher.start()
+    assert publisher.running
+    publisher.stop()
+    assert not publisher.running
+
+    assert publisher.send.call_args_list == [
+        mock.call([{"id": 1}, {"id": 2}], routing_key="activity.campaign"),
+        mock.call([{"id": 3}], routing_key="activity.reward.status"),
+    ]
+
+
+def test_publisher_flushes_after_the_first_activity_was_queued(
+    publisher: ActivityPublisher, mocker: MockerFixture
+) -> None:
+    mocker.patch("event_horizon.activity_utils.tasks.time.monotonic", side_effect=[99.995, 100])
+    publisher.enqueue([{"id": 1}], "activity.campaign")
+    mock_get = mocker.spy(publisher._queue, "get")
+
+    assert publisher._next_batch() == [(99.995, "activity.campaign", {"id": 1})]
+    # the batch waits for the rest of the flush interval, not the whole of it
+    assert mock_get.call_args_list == [mock.call(timeout=0.01), mock.call(timeout=pytest.approx(0.005))]
+
+
+def test_publisher_requeues_failures(publisher: ActivityPublisher) -> None:
+    send = mock.MagicMock(side_effect=[ValueError, None, None])
+    publisher.send = send
+    publisher.enqueue([{"id": 1}], "activity.campaign")
+    publisher.enqueue([{"id": 2}], "activity.retailer.status")
+
+    publisher._publish_batch([publisher._queue.get(), publisher._queue.get()])
+
+    assert send.call_count == 2
+    assert publisher._queue.get_nowait() == (0, "activity.campaign", {"id": 1})
+
+    # failures are dropped once stopping
+    send.side_effect = ValueError
+    publisher._stop.set()
+    publisher._publish_batch([(0, "activity.campaign", {"id": 1})])
+    assert publisher._queue.empty()
+
+
+def test_sync_send_activity(mocker: MockerFixture) -> None:
+    mock_publish = mocker.patch.object(tasks, "publish_activity")
+    mock_publish_in_chunks = mocker.patch.object(tasks, "publish_in_chunks")
+    publisher = mocker.patch.object(tasks, "activity_publisher")
+    publisher.enqueue.return_value = []
+    payloads = iter([{"id": 1}, {"id": 2}])
+
+    sync_send_activity({"id": 1}, routing_key="activity.campaign")
+    mock_publish.assert_called_once_with({"id": 1}, routing_key="activity.campaign")
+    sync_send_activity(payloads, routing_key="activity.campaign")
+    mock_publish_in_chunks.assert_called_once_with(payloads, routing_key="activity.campaign")
+
+    mock_publish.reset_mock()
+    mock_publish_in_chunks.reset_mock()
+    mocker.patch.object(tasks, "ACTIVITY_PUBLISH_MODE", "async")
+    sync_send_activity(iter([{"id": 1}, {"id": 2}]), routing_key="activity.campaign")
+    publisher.enqueue.assert_called_once_with([{"id": 1}, {"id": 2}], "activity.campaign")
+    mock_publish.assert_not_called()
+    mock_publish_in_chunks.assert_not_called()
+
+    # activities that don't fit in the queue are published inline
+    publisher.enqueue.return_value = [{"id": 2}]
+    sync_send_activity({"id": 2}, routing_key="activity.campaign")
+    mock_publish_in_chunks.assert_called_once_with([{"id": 2}], routing_key="activity.campaign")
+
+
+def test_sync_send_activity_outbox(mocker: MockerFixture) -> None:
+    mock_publish = mocker.patch.object(tasks, "publish_activity")
+    mock_write = mocker.patch.object(tasks, "write_activities")
+    mocker.patch.object(tasks, "ACTIVITY_PUBLISH_MODE", "outbox")
+    session = mock.MagicMock()
+    payloads = iter([{"id": 1}])
+
+    sync_send_activity(payloads, routing_key="activity.balance.change", session=session)
+    mock_write.assert_called_once_with(session, payloads, "activity.balance.change")
+
+    # activities of changes to other databases are published straight away
+    sync_send_activity({"id": 2}, routing_key="activity.campaign")
+    mock_publish.assert_called_once_with({"id": 2}, routing_key="activity.campaign")
+
+
+def test_publish_in_chunks(mocker: MockerFixture) -> None:
+    mock_publish = mocker.patch.object(tasks, "publish_activity")
+    on_confirmed = mock.MagicMock()
+    payloads = ({"id": i} for i in range(5))
+
+    progress = publish_in_chunks(
+        payloads, routing_key="activity.balance.change", chunk_size=2, on_confirmed=on_confirmed
+    )
+
+    assert progress == BulkPublishProgress("activity.balance.change", sent=5, confirmed=5)
+    assert mock_publish.call_args_list == [
+        mock.call([{"id": 0}, {"id": 1}], routing_key="activity.balance.change", confirmed=True),
+        mock.call([{"id": 2}, {"id": 3}], routing_key="activity.balance.change", confirmed=True),
+        mock.call([{"id": 4}], routing_key="activity.balance.change", confirmed=True),
+    ]
+    assert on_confirmed.call_count == 3
+
+    mock_publish.side_effect = [None, ConnectionError]
+    on_confirmed.reset_mock()
+    with pytest.raises(ConnectionError):
+        publish_in_chunks(
+            ({"id": i} for i in range(5)),
+            routing_key="activity.balance.change",
+            chunk_size=2,
+            on_confirmed=on_confirmed,
+        )
+
+    on_confirmed.assert_called_once()
+    assert on_confirmed.call_args.args[0] == BulkPublishProgress(
+        "activity.balance.change", sent=4, confirmed=2, failed=2
+    )
+
+
+def test_journal_activities(mocker: MockerFixture) -> None:
+    mock_write_journal = mocker.patch.object(tasks.BulkPublishJournal, "write")
+    mock_write_activities = mocker.patch.object(tasks, "write_activities")
+    session = mock.MagicMock()
+    payloads = iter([{"id": 1}])
+
+    assert (
+        journal_activities(payloads, routing_key="activity.balance.change", session=session)
+        == mock_write_journal.return_value
+    )
+    assert mock_write_journal.call_args.args[1:] == (payloads, "activity.balance.change")
+    mock_write_activities.assert_not_called()
+
+    mock_write_journal.reset_mock()
+    mocker.patch.object(tasks, "ACTIVITY_PUBLISH_MODE", "outbox")
+    assert journal_activities(payloads, routing_key="activity.balance.change", session=session) is None
+    mock_write_activities.assert_called_once_with(session, payloads, "activity.balance.change")
+    mock_write_journal.assert_not_called()
+
+
+def test_publish_journals() -> None:
+    failing, journal = mock.MagicMock(), mock.MagicMock()
+    failing.publish.side_effect = ConnectionError
+
+    publish_journals([failing, None, journal])
+
+    # every journal is ready to be resumed before any is published, a failure doesn't stop the others
+    failing.mark_ready.assert_called_once_with()
+    journal.mark_ready.assert_called_once_with()
+    journal.publish.assert_called_once_with(publish_in_chunks, tasks.ACTIVITY_PUBLISH_CHUNK_SIZE)
+
+
+def test_resume_journals(mocker: MockerFixture) -> None:
+    failing, journal = mock.MagicMock(), mock.MagicMock()
+    failing.publish.side_effect = ConnectionError
+    journal.publish.return_value = 3
+    mocker.patch.object(tasks.BulkPublishJournal, "ready", return_value=iter([failing, journal]))
+
+    assert resume_journals() == 3
+    journal.publish.assert_called_once_with(publish_in_chunks, tasks.ACTIVITY_PUBLISH_CHUNK_SIZE)
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import pytest
+
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine, event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import DeclarativeMeta, declarative_base, relationship, scoped_session, sessionmaker
+
+from event_horizon.admin.ajax_loaders import IndexedAjaxModelLoader
+
+Base: DeclarativeMeta = declarative_base()
+UUIDBase: DeclarativeMeta = declarative_base()
+
+
+class Retailer(Base):
+    __tablename__ = "retailer"
+
+    id = Column(Integer, primary_key=True)
+    slug = Column(String)
+
+
+class AccountHolder(Base):
+    __tablename__ = "account_holder"
+
+    id = Column(Integer, primary_key=True)
+    email = Column(String)
+    retailer_id = Column(Integer, ForeignKey("retailer.id"))
+    retailerconfig = relationship("Retailer")
+
+    def __str__(self) -> str:
+        return f"{self.email} ({self.id}, {self.retailerconfig.slug})"
+
+
+class UUIDAccountHolder(UUIDBase):
+    __tablename__ = "uuid_account_holder"
+
+    id = Column(Integer, primary_key=True)
+    account_holder_uuid = Column(UUID)
+
+
+@pytest.fixture(name="loader")
+def loader_fixture(tmp_path: Path) -> IndexedAjaxModelLoader:
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(Retailer.__table__.insert(), [{"id": 1, "slug": "test-retailer"}])
+        conn.execute(
+            AccountHolder.__table__.insert(),
+            [
+                {"id": 1, "email": "alice@example.com", "retailer_id": 1},
+                {"id": 2, "email": "bob@example.com", "retailer_id": 1},
+                {"id": 12, "email": "al_1@example.com", "retailer_id": 1},
+                {"id": 13, "email": "al11@example.com", "retailer_id": 1},
+            ],
+        )
+
+    return IndexedAjaxModelLoader(
+        "accountholder",
+        scoped_session(sessionmaker(bind=engine)),
+        AccountHolder,
+        fields=("email",),
+        exact_fields=("id",),
+        eager_loads=("retailerconfig",),
+    )
+
+
+def test_get_list_prefix_and_exact_matches(loader: IndexedAjaxModelLoader) -> None:
+    assert [holder.id for holder in loader.get_list("al")] == [1, 12, 13]
+    assert [holder.id for holder in loader.get_list("al_")] == [12]
+    assert [holder.id for holder in loader.get_list("example")] == []
+    assert [holder.id for holder in loader.get_list(" 2 ")] == [2]
+    assert [holder.id for holder in loader.get_list("al", offset=1, limit=1)] == [12]
+
+
+def test_get_list_loads_eager_loads(loader: IndexedAjaxModelLoader) -> None:
+    statements: list[str] = []
+    event.listen(loader.session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    formatted = [loader.format(holder) for holder in loader.get_list("al")]
+
+    assert formatted[0] == (1, "alice@example.com (1, test-retailer)")
+    assert len(statements) == 1
+
+
+def test_exact_value() -> None:
+    assert IndexedAjaxModelLoader._exact_value(AccountHolder.id, "12") == 12
+    assert IndexedAjaxModelLoader._exact_value(AccountHolder.id, "al") is None
+    assert IndexedAjaxModelLoader._exact_value(UUIDAccountHolder.account_holder_uuid, "not-a-uuid") is None
+    assert (
+        IndexedAjaxModelLoader._exact_value(
+            UUIDAccountHolder.account_holder_uuid, "6F4C4B1A-0D5E-4C2B-8B1E-5C2F0A6E9D11"
+        )
+        == "6f4c4b1a-0d5e-4c2b-8b1e-5c2f0a6e9d11"
+    )
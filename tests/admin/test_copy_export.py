@@ -0,0 +1,218 @@
+import threading
+
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from flask import Flask
+from flask_admin import Admin
+from pytest_mock import MockerFixture
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeMeta, Query, declarative_base, relationship, scoped_session, sessionmaker
+
+from event_horizon.admin.copy_export import copy_csv, export_query
+from event_horizon.admin.model_views import BaseModelView
+
+Base: DeclarativeMeta = declarative_base()
+PostgresBase: DeclarativeMeta = declarative_base()
+
+
+class AccountHolder(Base):
+    __tablename__ = "account_holder"
+
+    id = Column(Integer, primary_key=True)
+    email = Column(String)
+    accountholderprofile_collection = relationship("AccountHolderProfile")
+
+
+class AccountHolderProfile(Base):
+    __tablename__ = "account_holder_profile"
+
+    id = Column(Integer, primary_key=True)
+    first_name = Column(String)
+    account_holder_id = Column(Integer, ForeignKey("account_holder.id"))
+
+
+class MarketingPreference(Base):
+    __tablename__ = "marketing_preference"
+
+    id = Column(Integer, primary_key=True)
+    key_name = Column(String)
+    account_holder_id = Column(Integer, ForeignKey("account_holder.id"))
+    accountholder = relationship("AccountHolder")
+
+
+class PostgresAccountHolder(PostgresBase):
+    __tablename__ = "account_holder"
+
+    id = Column(Integer, primary_key=True)
+    email = Column(String)
+    is_active = Column(Boolean)
+    created_at = Column(DateTime(timezone=True))
+    campaigns = Column(postgresql.ARRAY(String))
+
+
+class MarketingPreferenceAdmin(BaseModelView):
+    column_default_sort = "id"
+    column_list = ("accountholder", "key_name")
+    column_filters = ("key_name",)
+    column_formatters_export = {"accountholder": lambda v, c, model, p: model.accountholder.email}  # noqa: RUF012
+    column_export_list = ("accountholder", "accountholder.accountholderprofile_collection.first_name", "key_name")
+    column_export_paths = {"accountholder": "accountholder.email"}  # noqa: RUF012
+    can_export = True
+    copy_export = True
+
+
+@pytest.fixture(name="view")
+def view_fixture(tmp_path: Path) -> MarketingPreferenceAdmin:
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            AccountHolder.__table__.insert(), [{"id": 1, "email": "alice@example.com"}, {"id": 2, "email": "bob@ex"}]
+        )
+        conn.execute(
+            AccountHolderProfile.__table__.insert(),
+            [
+                {"id": 1, "first_name": "Alice", "account_holder_id": 1},
+                {"id": 2, "first_name": "Alicia", "account_holder_id": 1},
+            ],
+        )
+        conn.execute(
+            MarketingPreference.__table__.insert(),
+            [
+                {"id": 1, "key_name": "marketing_pref", "account_holder_id": 1},
+                {"id": 2, "key_name": "newsletter", "account_holder_id": 1},
+                {"id": 3, "key_name": "marketing_pref", "account_holder_id": 2},
+            ],
+        )
+
+    return MarketingPreferenceAdmin(
+        MarketingPreference, scoped_session(sessionmaker(bind=engine)), endpoint="preferences"
+    )
+
+
+def test_export_query_sql() -> None:
+    query = export_query(
+        Query(MarketingPreference),
+        MarketingPreference,
+        ["accountholder.email", "accountholder.accountholderprofile_collection.first_name", "key_name"],
+    )
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+    assert sql.count("LEFT OUTER JOIN") == 2
+    # collections are joined to their first row only
+    assert "min(account_holder_profile_2.id)" in sql
+
+    with pytest.raises(ValueError, match="'accountholder' is not a column path of MarketingPreference"):
+        export_query(Query(MarketingPreference), MarketingPreference, ["accountholder"])
+
+
+def test_export_query_renders_values_like_the_default_export() -> None:
+    query = export_query(
+        Query(PostgresAccountHolder), PostgresAccountHolder, ["is_active", "created_at", "campaigns", "email"]
+    )
+    sql = str(query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    assert "CASE WHEN account_holder.is_active THEN 'True' WHEN NOT account_holder.is_active THEN 'False' END" in sql
+    assert (
+        "to_char(account_holder.created_at, 'YYYY-MM-DD HH24:MI:SS') || "
+        "CASE WHEN (to_char(account_holder.created_at, 'US') != '000000') "
+        "THEN to_char(account_holder.created_at, '.US') ELSE '' END || "
+        "to_char(account_holder.created_at, 'TZH:TZM')"
+    ) in sql
+    assert "array_to_string(account_holder.campaigns, ', ')" in sql
+    assert ", account_holder.email \nFROM" in sql
+
+
+def test_copy_export_query(view: MarketingPreferenceAdmin) -> None:
+    app = Flask(__name__)
+    Admin(app).add_view(view)
+    with app.test_request_context("/admin/preferences/export/csv/?flt0_0=marketing_pref"):
+        assert view._get_copy_export_query().all() == [
+            ("alice@example.com", "Alice", "marketing_pref"),
+            ("bob@ex", None, "marketing_pref"),
+        ]
+
+    with (
+        mock.patch.object(MarketingPreferenceAdmin, "column_export_paths", {}),
+        app.test_request_context("/admin/preferences/export/csv/"),
+        pytest.raises(ValueError, match="formatter"),
+    ):
+        view._get_copy_export_query()
+
+
+def test_export_falls_back_outside_of_postgres(view: MarketingPreferenceAdmin, mocker: MockerFixture) -> None:
+    mock_copy_csv = mocker.patch("event_horizon.admin.copy_export.copy_csv")
+    mocker.patch.object(BaseModelView, "is_accessible", lambda _: True)
+    app = Flask(__name__)
+    Admin(app).add_view(view)
+
+    resp = app.test_client().get("/admin/preferences/export/csv/")
+
+    assert resp.status_code == 200
+    assert resp.text.splitlines()[1] == "alice@example.com,,marketing_pref"
+    mock_copy_csv.assert_not_called()
+
+
+def test_copy_export_closes_the_stream(view: MarketingPreferenceAdmin, mocker: MockerFixture) -> None:
+    stream = mock.MagicMock()
+    stream.__iter__.return_value = iter([b"alice@example.com,Alice,marketing_pref\n"])
+    mocker.patch.object(MarketingPreferenceAdmin, "_copy_export_stream", return_value=stream)
+    mocker.patch.object(BaseModelView, "is_accessible", lambda _: True)
+    app = Flask(__name__)
+    Admin(app).add_view(view)
+
+    resp = app.test_client().get("/admin/preferences/export/csv/")
+    assert resp.text.splitlines()[1] == "alice@example.com,Alice,marketing_pref"
+    resp.close()
+
+    stream.close.assert_called_once()
+
+
+def _bind(copy_expert: mock.MagicMock) -> mock.MagicMock:
+    bind = mock.MagicMock()
+    bind.dialect = postgresql.psycopg2.dialect()
+    cursor = bind.connect.return_value.__enter__.return_value.connection.cursor.return_value
+    cursor.mogrify.side_effect = lambda sql, params: (sql % {k: repr(v) for k, v in params.items()}).encode()
+    cursor.copy_expert.side_effect = copy_expert
+    cursor.rowcount = 4
+    return bind
+
+
+def test_copy_csv_streams_chunks(mocker: MockerFixture) -> None:
+    mocker.patch("event_horizon.admin.copy_export.COPY_CHUNK_SIZE", 10)
+    copy_expert = mock.MagicMock(side_effect=lambda sql, file: [file.write(b"%d,row\n" % i) for i in range(4)])
+    bind = _bind(copy_expert)
+
+    rows = copy_csv(bind, Query(MarketingPreference).filter(MarketingPreference.key_name == "newsletter"))
+    chunks = list(rows)
+
+    assert chunks == [b"0,row\n1,row\n", b"2,row\n3,row\n"]
+    assert rows.rowcount == 4
+    sql = copy_expert.call_args.args[0]
+    assert sql.startswith("COPY (SELECT ")
+    assert "WHERE marketing_preference.key_name = 'newsletter') TO STDOUT WITH (FORMAT csv)" in sql
+
+
+def test_copy_csv_cancelled(mocker: MockerFixture) -> None:
+    mocker.patch("event_horizon.admin.copy_export.COPY_CHUNK_SIZE", 1)
+    invalidated = threading.Event()
+    bind = _bind(mock.MagicMock(side_effect=lambda sql, file: [file.write(b"%d\n" % i) for i in range(1000)]))
+    bind.connect.return_value.__enter__.return_value.invalidate.side_effect = invalidated.set
+
+    rows = copy_csv(bind, Query(MarketingPreference))
+    assert next(rows) == b"0\n"
+    rows.close()
+
+    # the writer gives up on the next chunk and the connection isn't returned to the pool mid COPY
+    assert invalidated.wait(5)
+
+
+def test_copy_csv_error() -> None:
+    bind = _bind(mock.MagicMock(side_effect=ValueError("COPY failed")))
+
+    with pytest.raises(ValueError, match="COPY failed"):
+        list(copy_csv(bind, Query(MarketingPreference)))
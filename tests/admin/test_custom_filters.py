@@ -0,0 +1,75 @@
+from unittest import mock
+
+from pytest_mock import MockerFixture
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import DeclarativeMeta, Query, declarative_base
+
+from event_horizon.admin.custom_filters import ArrayContainsAll, ArrayContainsAny, ArrayElementSuggestions
+
+Base: DeclarativeMeta = declarative_base()
+
+
+class Activity(Base):
+    __tablename__ = "activity"
+
+    id = Column(Integer, primary_key=True)
+    campaigns = Column(ARRAY(String), index=True)
+
+
+def _where(query: Query) -> str:
+    return str(query.whereclause.compile(dialect=postgresql.dialect()))
+
+
+def test_array_filters_use_array_operators() -> None:
+    contains_all = ArrayContainsAll(Activity.campaigns, "Campaigns")
+    contains_any = ArrayContainsAny(Activity.campaigns, "Campaigns")
+    value = contains_all.clean(" test-campaign-1, ,test-campaign-2")
+
+    assert value == ["test-campaign-1", "test-campaign-2"]
+    assert contains_all.data_type == "select2-tags"
+    assert _where(contains_all.apply(Query(Activity), value)) == "activity.campaigns @> %(campaigns_1)s::VARCHAR[]"
+    assert _where(contains_any.apply(Query(Activity), value)) == "activity.campaigns && %(campaigns_1)s::VARCHAR[]"
+
+
+def _session(dialect: str, elements: list[str] | None = None) -> mock.MagicMock:
+    session = mock.MagicMock()
+    session.get_bind.return_value.dialect.name = dialect
+    session.execute.return_value.scalar.return_value = elements
+    return session
+
+
+def test_suggestions_are_loaded_lazily_and_cached(mocker: MockerFixture) -> None:
+    mock_monotonic = mocker.patch("event_horizon.admin.custom_filters.time.monotonic", return_value=0.0)
+    session = _session("postgresql", ["campaign-b", "campaign-a"])
+    view = mock.MagicMock(session=session)
+    flt = ArrayContainsAny(Activity.campaigns, "Campaigns")
+
+    suggestions = flt.get_options(view)
+    assert suggestions is flt.get_options(view)
+    assert suggestions
+    session.execute.assert_not_called()
+
+    assert list(suggestions) == [("campaign-a", "campaign-a"), ("campaign-b", "campaign-b")]
+    assert list(suggestions) == [("campaign-a", "campaign-a"), ("campaign-b", "campaign-b")]
+    assert session.execute.call_count == 1
+    assert session.execute.call_args.args[1] == {"table": "activity", "column": "campaigns"}
+
+    mock_monotonic.return_value = ArrayElementSuggestions.cache_ttl + 1.0
+    list(suggestions)
+    assert session.execute.call_count == 2
+
+
+def test_suggestions_without_statistics() -> None:
+    assert not list(ArrayElementSuggestions(Activity.campaigns, _session("postgresql", None)))
+
+    session = _session("sqlite")
+    assert not list(ArrayElementSuggestions(Activity.campaigns, session))
+    session.execute.assert_not_called()
+
+
+def test_explicit_options_are_kept() -> None:
+    flt = ArrayContainsAll(Activity.campaigns, "Campaigns", options=[("a", "A")])
+
+    assert flt.get_options(mock.MagicMock()) == [("a", "A")]
@@ -0,0 +1,198 @@
+from pathlib import Path
+
+import pytest
+
+from flask import Flask
+from flask_admin import Admin
+from markupsafe import Markup
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeMeta, Load, declarative_base, relationship, scoped_session, sessionmaker
+
+from event_horizon.admin.eager_loading import (
+    column_keys,
+    column_relationship_paths,
+    eager_load_options,
+    relationship_paths,
+)
+from event_horizon.admin.model_views import BaseModelView
+
+Base: DeclarativeMeta = declarative_base()
+
+
+class Retailer(Base):
+    __tablename__ = "retailer"
+
+    id = Column(Integer, primary_key=True)
+    slug = Column(String)
+
+    def __str__(self) -> str:
+        return self.slug
+
+
+class RewardConfig(Base):
+    __tablename__ = "reward_config"
+
+    id = Column(Integer, primary_key=True)
+    reward_slug = Column(String)
+    retailer_id = Column(Integer, ForeignKey("retailer.id"))
+    retailer = relationship("Retailer")
+
+    def __str__(self) -> str:
+        return f"{self.retailer.slug}: {self.reward_slug}"
+
+
+class Reward(Base):
+    __tablename__ = "reward"
+
+    id = Column(Integer, primary_key=True)
+    code = Column(String)
+    associated_url = Column(String)
+    reward_config_id = Column(Integer, ForeignKey("reward_config.id"))
+    rewardconfig = relationship("RewardConfig", backref="reward_collection")
+
+    @property
+    def display_code(self) -> str:
+        return f"{self.code} ({self.associated_url})"
+
+
+def reward_config_format(_v: BaseModelView, _c: dict, model: Reward, _p: str) -> str:
+    return Markup("{0} {1}").format(model.rewardconfig.reward_slug, model.rewardconfig.retailer.slug)
+
+
+def _paths(paths: set[tuple]) -> set[str]:
+    return {".".join(prop.key for prop in path) for path in paths}
+
+
+def test_column_relationship_paths() -> None:
+    assert _paths(column_relationship_paths(Reward, ["code", "rewardconfig"])) == {"rewardconfig"}
+    assert _paths(column_relationship_paths(Reward, ["rewardconfig.retailer.slug"])) == {"rewardconfig.retailer"}
+    assert _paths(column_relationship_paths(RewardConfig, ["retailer.slug", "reward_collection"])) == {
+        "retailer",
+        "reward_collection",
+    }
+    assert not column_relationship_paths(Reward, ["code", "id"])
+
+
+def test_column_keys() -> None:
+    assert column_keys(Reward, ["code", "rewardconfig"]) == {"code", "reward_config_id"}
+    assert column_keys(Reward, ["code", "rewardconfig.retailer.slug"]) == {"code", "reward_config_id"}
+    assert column_keys(RewardConfig, ["retailer.slug", "reward_collection"]) == {"retailer_id", "id"}
+    # what a property reads is unknown
+    assert column_keys(Reward, ["code", "display_code"]) is None
+
+
+def test_relationship_paths() -> None:
+    assert _paths(relationship_paths(Reward, ["rewardconfig.retailer"])) == {"rewardconfig.retailer"}
+
+    with pytest.raises(ValueError, match="'rewardconfig.reward_slug' is not a relationship path of Reward"):
+        relationship_paths(Reward, ["rewardconfig.reward_slug"])
+
+
+def test_eager_load_options() -> None:
+    options = eager_load_options(
+        relationship_paths(RewardConfig, ["retailer", "reward_collection", "reward_collection.rewardconfig"])
+    )
+
+    assert [_strategies(option) for option in options] == [
+        [("retailer", "joined")],
+        [("reward_collection", "selectin"), ("rewardconfig", "joined")],
+    ]
+
+
+def _strategies(option: Load) -> list[tuple[str, str]]:
+    return [(path[-1].key, dict(load.strategy)["lazy"]) for (_, path), load in option.context.items()]
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path: Path) -> Engine:
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(Retailer.__table__.insert(), [{"id": i, "slug": f"retailer-{i}"} for i in range(1, 4)])
+        conn.execute(
+            RewardConfig.__table__.insert(),
+            [{"id": i, "reward_slug": f"reward-{i}", "retailer_id": i} for i in range(1, 4)],
+        )
+        conn.execute(
+            Reward.__table__.insert(),
+            [
+                {
+                    "id": i,
+                    "code": f"code-{i}",
+                    "associated_url": f"https://example.com/{i}",
+                    "reward_config_id": i % 3 + 1,
+                }
+                for i in range(1, 10)
+            ],
+        )
+    return engine
+
+
+class RewardAdmin(BaseModelView):
+    column_default_sort = "id"
+    column_list = ("code", "rewardconfig")
+    column_formatters = {"rewardconfig": reward_config_format}  # noqa: RUF012
+    column_eager_loads = ("rewardconfig.retailer",)
+    defer_unlisted_columns = True
+
+
+class ListedRewardAdmin(BaseModelView):
+    column_default_sort = "id"
+    column_list = ("code",)
+
+
+def test_list_view_loads_relationships_up_front(engine: Engine) -> None:
+    db_session = scoped_session(sessionmaker(bind=engine))
+    view = RewardAdmin(Reward, db_session, endpoint="rewards")
+    app = Flask(__name__)
+    Admin(app).add_view(view)
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with app.test_request_context("/admin/rewards/"):
+        _, rows = view.get_list(0, None, False, None, [])
+        statements.clear()
+        assert [reward_config_format(view, {}, row, "rewardconfig") for row in rows[:3]] == [
+            "reward-2 retailer-2",
+            "reward-3 retailer-3",
+            "reward-1 retailer-1",
+        ]
+
+    assert not statements
+
+
+def test_list_view_defers_unlisted_columns(engine: Engine) -> None:
+    db_session = scoped_session(sessionmaker(bind=engine))
+    view = RewardAdmin(Reward, db_session, endpoint="rewards")
+    app = Flask(__name__)
+    Admin(app).add_view(view)
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with app.test_request_context("/admin/rewards/"):
+        _, rows = view.get_list(0, None, False, None, [])
+
+    assert "associated_url" not in statements[-1]
+    assert "reward.code" in statements[-1]
+
+    db_session.expunge_all()
+    with app.test_request_context("/admin/rewards/details/?id=1"):
+        assert view.get_one("1").associated_url == "https://example.com/1"
+
+    view.column_extra_loads = ("associated_url",)
+    view._refresh_cache()
+    with app.test_request_context("/admin/rewards/"):
+        view.get_list(0, None, False, None, [])
+
+    assert "associated_url" in statements[-1]
+
+    # views that don't opt in load every column
+    view = ListedRewardAdmin(Reward, db_session, endpoint="listed-rewards")
+    app.extensions["admin"][0].add_view(view)
+    with app.test_request_context("/admin/listed-rewards/"):
+        view.get_list(0, None, False, None, [])
+
+    assert "associated_url" in statements[-1]
@@ -0,0 +1,169 @@
+import gzip
+import io
+import os
+import time
+
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from flask import Flask
+from flask_admin import Admin
+from pytest_mock import MockerFixture
+from sqlalchemy import Column, Integer, String, create_engine, event
+from sqlalchemy.orm import DeclarativeMeta, declarative_base, scoped_session, sessionmaker
+
+from event_horizon.admin import export_jobs
+from event_horizon.admin.export_jobs import enqueue_export, expire_artefacts, run_export
+from event_horizon.admin.model_views import BaseModelView
+
+Base: DeclarativeMeta = declarative_base()
+
+
+class PendingReward(Base):
+    __tablename__ = "pending_reward"
+
+    id = Column(Integer, primary_key=True)
+    retailer_slug = Column(String)
+    reward_slug = Column(String)
+
+
+class PendingRewardAdmin(BaseModelView):
+    column_default_sort = "id"
+    column_filters = ("retailer_slug",)
+    column_export_list = ("id", "retailer_slug", "reward_slug")
+    can_export = True
+    background_export = True
+
+
+@pytest.fixture(name="app")
+def app_fixture(tmp_path: Path, mocker: MockerFixture) -> Flask:
+    mocker.patch.object(export_jobs, "EXPORT_ARTEFACTS_DIR", str(tmp_path / "exports"))
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            PendingReward.__table__.insert(),
+            [
+                {"id": i, "retailer_slug": "retailer-1" if i % 2 else "retailer-2", "reward_slug": f"reward-{i}"}
+                for i in range(1, 6)
+            ],
+        )
+
+    app = Flask(__name__, template_folder=Path(export_jobs.__file__).parents[1] / "templates")
+    app.secret_key = "secret"
+    Admin(app).add_view(
+        PendingRewardAdmin(PendingReward, scoped_session(sessionmaker(bind=engine)), endpoint="pending-rewards")
+    )
+    return app
+
+
+def _view(app: Flask) -> PendingRewardAdmin:
+    return app.extensions["admin"][0]._views[1]
+
+
+def test_write_export_csv(app: Flask) -> None:
+    view = _view(app)
+    file = io.BytesIO()
+    progress = mock.MagicMock()
+
+    statements: list[str] = []
+    event.listen(view.session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with app.test_request_context("/admin/pending-rewards/export/csv/?flt0_0=retailer-1&sort=1&desc=1"):
+        assert view.write_export_csv(file, progress) == 3
+
+    # the rows are exported without counting them first
+    assert len(statements) == 1
+    assert "count(" not in statements[0].lower()
+
+    assert file.getvalue().decode().splitlines() == [
+        "Id,Retailer Slug,Reward Slug",
+        "5,retailer-1,reward-5",
+        "3,retailer-1,reward-3",
+        "1,retailer-1,reward-1",
+    ]
+
+
+def test_run_export(app: Flask, mocker: MockerFixture) -> None:
+    job = mock.MagicMock(id="job-1", meta={})
+    mocker.patch.object(export_jobs, "get_current_job", return_value=job)
+
+    with app.app_context():
+        assert run_export("pending-rewards", "flt0_0=retailer-2") == 2
+
+    artefact = Path(export_jobs.EXPORT_ARTEFACTS_DIR) / "job-1.csv.gz"
+    assert gzip.decompress(artefact.read_bytes()).decode().splitlines() == [
+        "Id,Retailer Slug,Reward Slug",
+        "2,retailer-2,reward-2",
+        "4,retailer-2,reward-4",
+    ]
+    assert job.meta == {"rows": 2, "size": artefact.stat().st_size}
+    assert list(artefact.parent.iterdir()) == [artefact]
+
+
+def test_expire_artefacts(tmp_path: Path, mocker: MockerFixture) -> None:
+    mocker.patch.object(export_jobs, "EXPORT_ARTEFACTS_DIR", str(tmp_path))
+    old, new = tmp_path / "old.csv.gz", tmp_path / "new.csv.gz"
+    old.write_bytes(b"")
+    new.write_bytes(b"")
+    expired_at = time.time() - export_jobs.EXPORT_ARTEFACTS_TTL - 1
+    os.utime(old, (expired_at, expired_at))
+
+    assert expire_artefacts() == 1
+    assert list(tmp_path.iterdir()) == [new]
+
+
+def test_enqueue_export(app: Flask, mocker: MockerFixture) -> None:
+    mock_queue = mocker.patch.object(export_jobs, "export_queue")
+    mock_queue.enqueue.return_value.id = "job-1"
+    mock_redis = mocker.patch.object(export_jobs, "redis")
+
+    job = enqueue_export(_view(app), "flt0_0=retailer-1", "Jane Doe", ["Retailer Slug contains retailer-1"])
+
+    assert job.id == "job-1"
+    args, kwargs = mock_queue.enqueue.call_args
+    assert args == (run_export, "pending-rewards", "flt0_0=retailer-1")
+    assert kwargs["meta"]["filters"] == ["Retailer Slug contains retailer-1"]
+    pipe = mock_redis.pipeline.return_value.__enter__.return_value
+    pipe.lpush.assert_called_once_with("event-horizon:export-jobs:pending-rewards", "job-1")
+
+
+def test_export_jobs_view(app: Flask, mocker: MockerFixture) -> None:
+    mocker.patch.object(BaseModelView, "is_accessible", lambda _: True)
+    mocker.patch.object(BaseModelView, "sso_username", "Jane Doe")
+    mock_enqueue = mocker.patch("event_horizon.admin.export_jobs.enqueue_export")
+    mocker.patch("event_horizon.admin.export_jobs.list_exports", return_value=[])
+    client = app.test_client()
+
+    resp = client.get("/admin/pending-rewards/export-jobs/?query=flt0_0%3Dretailer-1")
+    assert resp.status_code == 200
+    assert 'name="query" value="flt0_0=retailer-1"' in resp.text
+
+    resp = client.post("/admin/pending-rewards/export-jobs/", data={"query": "flt0_0=retailer-1"})
+    assert resp.status_code == 302
+    mock_enqueue.assert_called_once_with(
+        _view(app), "flt0_0=retailer-1", "Jane Doe", ["Retailer Slug contains retailer-1"]
+    )
+
+
+def test_export_job_download_view(app: Flask, mocker: MockerFixture) -> None:
+    mocker.patch.object(BaseModelView, "is_accessible", lambda _: True)
+    job = mock.MagicMock(is_finished=True, meta={"endpoint": "pending-rewards", "name": "Pending Rewards"})
+    mock_fetch = mocker.patch("event_horizon.admin.export_jobs.Job.fetch", return_value=job)
+    client = app.test_client()
+
+    resp = client.get("/admin/pending-rewards/export-jobs/job-1/download/")
+    assert resp.status_code == 302
+
+    artefact = Path(export_jobs.EXPORT_ARTEFACTS_DIR) / "job-1.csv.gz"
+    artefact.parent.mkdir()
+    artefact.write_bytes(gzip.compress(b"Id\n1\n"))
+    resp = client.get("/admin/pending-rewards/export-jobs/job-1/download/")
+    assert resp.status_code == 200
+    assert resp.headers["Content-Disposition"] == "attachment; filename=Pending_Rewards_job-1.csv.gz"
+    mock_fetch.assert_called_with("job-1", connection=mock.ANY)
+
+    job.meta["endpoint"] = "other-view"
+    assert client.get("/admin/pending-rewards/export-jobs/job-1/download/").status_code == 302
@@ -0,0 +1,137 @@
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from flask import Flask
+from flask_admin import Admin
+from pytest_mock import MockerFixture
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeMeta, declarative_base, relationship, scoped_session, sessionmaker
+
+from event_horizon.admin.fields import CachedQuerySelectField
+from event_horizon.admin.model_views import BaseModelView
+from event_horizon.db import ReferenceDataMixin
+from event_horizon.reference_cache import reference_cache
+
+Base: DeclarativeMeta = declarative_base()
+
+
+class Retailer(Base, ReferenceDataMixin):
+    __tablename__ = "retailer"
+
+    id = Column(Integer, primary_key=True)
+    slug = Column(String)
+
+    def __str__(self) -> str:
+        return self.slug
+
+
+class RewardConfig(Base):
+    __tablename__ = "reward_config"
+
+    id = Column(Integer, primary_key=True)
+    reward_slug = Column(String)
+    retailer_id = Column(Integer, ForeignKey("retailer.id"), nullable=False)
+    retailer = relationship("Retailer")
+
+
+class RewardConfigAdmin(BaseModelView):
+    column_default_sort = "id"
+    column_filters = ("retailer.slug", "reward_slug")
+    form_columns = ("retailer", "reward_slug")
+
+
+class RetailerAdmin(BaseModelView):
+    column_default_sort = "id"
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path: Path, mocker: MockerFixture) -> Engine:
+    mocker.patch.object(reference_cache, "redis")
+    mocker.patch.object(reference_cache.bus, "redis")
+    reference_cache.redis.hget.return_value = None
+    reference_cache.invalidate(Retailer.__tablename__)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(Retailer.__table__.insert(), [{"id": i, "slug": f"retailer-{i}"} for i in range(1, 4)])
+    return engine
+
+
+@pytest.fixture(name="app")
+def app_fixture(engine: Engine) -> Flask:
+    app = Flask(__name__)
+    app.secret_key = "secret"
+    app.config["WTF_CSRF_ENABLED"] = False
+    db_session = scoped_session(sessionmaker(bind=engine))
+    admin = Admin(app)
+    admin.add_view(RewardConfigAdmin(RewardConfig, db_session, endpoint="reward-configs"))
+    admin.add_view(RetailerAdmin(Retailer, db_session, endpoint="retailers"))
+    return app
+
+
+def _views(app: Flask) -> tuple[RewardConfigAdmin, RetailerAdmin]:
+    return app.extensions["admin"][0]._views[1:3]
+
+
+def test_reference_select_field(app: Flask, engine: Engine) -> None:
+    view, _ = _views(app)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with app.test_request_context("/admin/reward-configs/new/"):
+        form = view.create_form()
+        assert isinstance(form.retailer, CachedQuerySelectField)
+        assert list(form.retailer.iter_choices()) == [
+            ("1", "retailer-1", False),
+            ("2", "retailer-2", False),
+            ("3", "retailer-3", False),
+        ]
+
+    statements.clear()
+    with app.test_request_context(
+        "/admin/reward-configs/new/", method="POST", data={"retailer": "3", "reward_slug": "10-off"}
+    ):
+        form = view.create_form()
+        assert [selected for _, _, selected in form.retailer.iter_choices()] == [False, False, True]
+        assert form.validate()
+        assert form.retailer.data.slug == "retailer-3"
+
+    # the choices were cached, only the chosen retailer is loaded
+    assert len(statements) == 1
+
+    with app.test_request_context(
+        "/admin/reward-configs/new/", method="POST", data={"retailer": "4", "reward_slug": "10-off"}
+    ):
+        form = view.create_form()
+        assert not form.validate()
+        assert form.retailer.errors == ["Not a valid choice"]
+
+
+def test_reference_data_changes_invalidate_the_cache(app: Flask, mocker: MockerFixture) -> None:
+    _, retailer_view = _views(app)
+    mock_invalidate = mocker.patch.object(reference_cache, "invalidate")
+
+    retailer_view.after_model_change(mock.MagicMock(), Retailer(), True)
+    retailer_view.after_model_delete(Retailer())
+
+    assert mock_invalidate.call_args_list == [mock.call("retailer"), mock.call("retailer")]
+
+
+def test_reference_filter_options(app: Flask) -> None:
+    view, _ = _views(app)
+
+    with app.test_request_context("/admin/reward-configs/"):
+        options = {flt.name: flt.get_options(view) for flt in view._filters if flt.operation() == "equals"}
+
+    assert options == {
+        "retailer / Retailer / Slug": [
+            ("retailer-1", "retailer-1"),
+            ("retailer-2", "retailer-2"),
+            ("retailer-3", "retailer-3"),
+        ],
+        "Reward Slug": None,
+    }
@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from sqlalchemy import Column, DateTime, Integer, create_engine
+from sqlalchemy.orm import DeclarativeMeta, Session, declarative_base
+
+from event_horizon.admin.keyset_pagination import decode_cursor, encode_cursor, seek
+
+Base: DeclarativeMeta = declarative_base()
+
+
+class Campaign(Base):
+    __tablename__ = "campaign"
+
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime(timezone=True))
+
+
+def test_cursor_round_trip() -> None:
+    fields = [Campaign.created_at, Campaign.id]
+    row = Campaign(id=3, created_at=datetime(2023, 1, 2, 3, 4, 5, tzinfo=timezone.utc))
+
+    assert decode_cursor(fields, encode_cursor(fields, row)) == (row.created_at, 3)
+
+    with pytest.raises(ValueError, match="Expected 2 cursor values, got 1"):
+        decode_cursor(fields, "3")
+
+    with pytest.raises(ValueError):
+        decode_cursor(fields, "not a date,3")
+
+
+@pytest.mark.parametrize(
+    ("desc", "backwards", "expected"),
+    [(False, False, [4, 5]), (False, True, [2, 1]), (True, False, [2, 1]), (True, True, [4, 5])],
+)
+def test_seek(desc: bool, backwards: bool, expected: list[int]) -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(Campaign(id=id_) for id_ in range(1, 6))
+        session.commit()
+
+        query = session.query(Campaign.id).order_by(Campaign.created_at)
+        assert [row.id for row in seek(query, [Campaign.id], (3,), desc=desc, backwards=backwards).limit(2)] == expected
@@ -0,0 +1,177 @@
+import time
+
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from flask import Flask
+from flask_admin import Admin
+from pytest_mock import MockerFixture
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy import Column, Integer, String, create_engine, event
+from sqlalchemy.orm import DeclarativeMeta, declarative_base, scoped_session, sessionmaker
+from sqlalchemy.sql import text
+
+from event_horizon.admin.list_cache import ListResultCache, list_cache
+from event_horizon.admin.model_views import BaseModelView
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+
+    def get(self, name: str) -> bytes | None:
+        return self.values.get(name)
+
+    def set(self, name: str, value: str, ex: int, nx: bool = False) -> bool:  # noqa: ARG002
+        if nx and name in self.values:
+            return False
+
+        self.values[name] = value.encode()
+        return True
+
+    def delete(self, *names: str) -> None:
+        for name in names:
+            self.values.pop(name, None)
+
+
+@pytest.fixture(name="cache")
+def cache_fixture() -> ListResultCache:
+    return ListResultCache(FakeRedis(), ttl=30, stale_ttl=300, lock_timeout=10)
+
+
+def test_get_caches_results(cache: ListResultCache) -> None:
+    loader = mock.MagicMock(return_value={"pks": ["1", "2"]})
+
+    assert cache.get("activity", {"page": 0}, loader) == {"pks": ["1", "2"]}
+    assert cache.get("activity", {"page": 0}, loader) == {"pks": ["1", "2"]}
+    loader.assert_called_once()
+
+    assert cache.get("activity", {"page": 1}, loader) == {"pks": ["1", "2"]}
+    assert cache.get("reward-file-log", {"page": 0}, loader) == {"pks": ["1", "2"]}
+    assert loader.call_count == 3
+    # the locks were released
+    assert not [key for key in cache.redis.values if key.endswith(":lock")]
+
+
+def test_get_serves_stale_results_while_refreshing(cache: ListResultCache, mocker: MockerFixture) -> None:
+    assert cache.get("activity", {}, lambda: "first") == "first"
+    key = cache.make_key("activity", {})
+
+    mocker.patch("event_horizon.admin.list_cache.time.time", return_value=time.time() + 31)
+    # another request is refreshing the result
+    cache.redis.set(f"{key}:lock", "other-request", ex=1)
+    assert cache.get("activity", {}, mock.MagicMock()) == "first"
+
+    cache.redis.delete(f"{key}:lock")
+    assert cache.get("activity", {}, lambda: "second") == "second"
+    assert cache.get("activity", {}, mock.MagicMock()) == "second"
+
+
+def test_get_waits_for_results_being_loaded(cache: ListResultCache, mocker: MockerFixture) -> None:
+    key = cache.make_key("activity", {})
+    cache.redis.set(f"{key}:lock", "other-request", ex=1)
+    loader = mock.MagicMock(return_value="mine")
+
+    def other_request_loads(_: float) -> None:
+        cache.redis.set(key, f'[{time.time()}, "theirs"]', ex=330)
+
+    mocker.patch("event_horizon.admin.list_cache.time.sleep", side_effect=other_request_loads)
+    assert cache.get("activity", {}, loader) == "theirs"
+    loader.assert_not_called()
+
+    # the other request is still loading the result after a few polls
+    cache.redis.delete(key)
+    polls = 0
+
+    def other_request_loads_slowly(_: float) -> None:
+        nonlocal polls
+        polls += 1
+        if polls == 20:
+            cache.redis.set(key, f'[{time.time()}, "slow"]', ex=330)
+
+    mocker.patch("event_horizon.admin.list_cache.time.sleep", side_effect=other_request_loads_slowly)
+    assert cache.get("activity", {}, loader) == "slow"
+    loader.assert_not_called()
+
+
+def test_get_takes_over_from_failed_loads(cache: ListResultCache, mocker: MockerFixture) -> None:
+    key = cache.make_key("activity", {})
+    cache.redis.set(f"{key}:lock", "other-request", ex=1)
+    loader = mock.MagicMock(return_value="mine")
+
+    def other_request_fails(_: float) -> None:
+        cache.redis.delete(f"{key}:lock")
+
+    mocker.patch("event_horizon.admin.list_cache.time.sleep", side_effect=other_request_fails)
+    assert cache.get("activity", {}, loader) == "mine"
+    loader.assert_called_once_with()
+    assert cache.get("activity", {}, mock.MagicMock()) == "mine"
+
+    # waiting is given up once the lock would have expired
+    cache.redis.delete(key)
+    cache.redis.set(f"{key}:lock", "other-request", ex=1)
+    mocker.patch("event_horizon.admin.list_cache.time.sleep")
+    mocker.patch("event_horizon.admin.list_cache.time.monotonic", side_effect=[0, 5, 11])
+    assert cache.get("activity", {}, loader) == "mine"
+    assert loader.call_count == 2
+
+
+def test_get_without_redis(cache: ListResultCache) -> None:
+    cache.redis = mock.MagicMock()
+    cache.redis.get.side_effect = RedisConnectionError
+    cache.redis.set.side_effect = RedisConnectionError
+    loader = mock.MagicMock(return_value="value")
+
+    assert cache.get("activity", {}, loader) == "value"
+    assert cache.get("activity", {}, loader) == "value"
+    assert loader.call_count == 2
+
+
+Base: DeclarativeMeta = declarative_base()
+
+
+class Activity(Base):
+    __tablename__ = "activity"
+
+    id = Column(Integer, primary_key=True)
+    type = Column(String)
+
+
+class ActivityAdmin(BaseModelView):
+    cache_list_results = True
+    column_default_sort = ("id", True)
+    column_filters = ("type",)
+    page_size = 2
+
+
+def test_cached_list(tmp_path: Path, mocker: MockerFixture) -> None:
+    mocker.patch.object(list_cache, "redis", FakeRedis())
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(Activity.__table__.insert(), [{"id": i, "type": "TX" if i % 2 else "REFUND"} for i in range(1, 6)])
+
+    view = ActivityAdmin(Activity, scoped_session(sessionmaker(bind=engine)), endpoint="activities")
+    app = Flask(__name__)
+    Admin(app).add_view(view)
+
+    def list_page(query_string: str) -> tuple[int | None, list[int]]:
+        with app.test_request_context(f"/admin/activities/?{query_string}"):
+            view_args = view._get_list_extra_args()
+            count, rows = view.get_list(view_args.page, None, False, view_args.search, view_args.filters)
+            return count, [row.id for row in rows]
+
+    assert list_page("flt0_0=TX") == (3, [5, 3])
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE activity SET type = 'TX' WHERE id = 4"))
+        conn.execute(text("DELETE FROM activity WHERE id = 3"))
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    # the cached page's rows are loaded by primary key, without filtering or counting them again
+    assert list_page("flt0_0=TX") == (3, [5])
+    assert len(statements) == 1
+    # other pages are queried as usual
+    assert list_page("flt0_0=TX&page=1") == (3, [1])
@@ -0,0 +1,277 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from flask import Flask
+from flask_admin import Admin
+from pytest_mock import MockerFixture
+from sqlalchemy import MetaData, create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.sql import text
+from werkzeug.exceptions import ServiceUnavailable
+
+from event_horizon.admin.model_views import BaseModelView
+from event_horizon.db import defer_automap_prepare, lazy_automap_base, prepare_deferred_automap_base
+
+
+@pytest.fixture(name="campaign_model")
+def campaign_model_fixture(tmp_path: Path) -> tuple[type, mock.MagicMock, scoped_session]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE campaign (id INTEGER PRIMARY KEY, slug VARCHAR(32), created_at DATETIME)"))
+
+    base = lazy_automap_base(MetaData())
+
+    class Campaign(base):  # type: ignore [valid-type, misc]
+        __tablename__ = "campaign"
+
+    prepare = mock.MagicMock(side_effect=lambda: base.prepare(autoload_with=engine))
+    defer_automap_prepare(base, prepare)
+    return Campaign, prepare, scoped_session(sessionmaker(bind=engine))
+
+
+def test_model_view_init_is_deferred_until_accessed(
+    campaign_model: tuple[type, mock.MagicMock, scoped_session], mocker: MockerFixture
+) -> None:
+    campaign, prepare, db_session = campaign_model
+    app = Flask(__name__)
+    admin = Admin(app)
+
+    view = BaseModelView(campaign, db_session, "Campaigns", endpoint="campaigns", url="/admin/campaigns")
+    admin.add_view(view)
+
+    prepare.assert_not_called()
+    assert view.admin is admin
+    assert view.name == "Campaigns"
+    assert "campaigns.index_view" in app.view_functions
+
+    mocker.patch.object(BaseModelView, "is_accessible", lambda _: True)
+    with app.test_request_context("/admin/campaigns/"):
+        assert view._handle_view("index_view") is None
+        assert view._handle_view("index_view") is None
+
+    prepare.assert_called_once()
+    assert view._primary_key == "id"
+    assert view.admin is admin
+    assert view.url == "/admin/campaigns"
+    assert [name for name, _ in view.get_list_columns()] == ["slug", "created_at"]
+
+
+def test_model_view_inaccessible_does_not_prepare(
+    campaign_model: tuple[type, mock.MagicMock, scoped_session], mocker: MockerFixture
+) -> None:
+    campaign, prepare, db_session = campaign_model
+    view = BaseModelView(campaign, db_session, endpoint="campaigns")
+    mocker.patch.object(BaseModelView, "is_accessible", return_value=False)
+    mock_callback = mocker.patch.object(BaseModelView, "inaccessible_callback")
+
+    assert view._handle_view("index_view") == mock_callback.return_value
+    prepare.assert_not_called()
+
+
+def test_model_view_unavailable_database(
+    campaign_model: tuple[type, mock.MagicMock, scoped_session], mocker: MockerFixture
+) -> None:
+    campaign, prepare, db_session = campaign_model
+    prepare.side_effect = ValueError("database unavailable")
+    view = BaseModelView(campaign, db_session, endpoint="campaigns")
+    mocker.patch.object(BaseModelView, "is_accessible", lambda _: True)
+
+    with pytest.raises(ServiceUnavailable):
+        view._handle_view("index_view")
+
+    assert view._deferred_init is not None
+
+
+class KeysetCampaignAdmin(BaseModelView):
+    keyset_pagination = True
+    page_size = 3
+    column_searchable_list = ("slug",)
+    column_filters = ("slug",)
+
+
+@pytest.fixture(name="campaigns")
+def campaigns_fixture(campaign_model: tuple[type, mock.MagicMock, scoped_session]) -> tuple[type, scoped_session]:
+    campaign, _, db_session = campaign_model
+    with db_session.bind.begin() as conn:
+        # ids 1 to 8, created_at is shared by pairs of campaigns so the primary key has to break ties
+        for i in range(1, 9):
+            conn.execute(
+                text("INSERT INTO campaign (id, slug, created_at) VALUES (:id, :slug, :created_at)"),
+                {
+                    "id": i,
+                    "slug": f"{'odd' if i % 2 else 'even'}-{i}",
+                    "created_at": f"2023-01-0{(i + 1) // 2} 00:00:00.000000",
+                },
+            )
+
+    prepare_deferred_automap_base(campaign)
+    return campaign, db_session
+
+
+@pytest.fixture(name="keyset_view")
+def keyset_view_fixture(campaigns: tuple[type, scoped_session]) -> KeysetCampaignAdmin:
+    return KeysetCampaignAdmin(*campaigns, endpoint="campaigns")
+
+
+def _keyset_page(view: BaseModelView, query_string: str = "") -> tuple[list[int], dict]:
+    app = Flask(__name__)
+    app.secret_key = "secret"
+    Admin(app).add_view(view)
+    with app.test_request_context(f"/admin/campaigns/?{query_string}"):
+        view_args = view._get_list_extra_args()
+        count, rows = view.get_list(view_args.page, None, False, view_args.search, view_args.filters)
+        assert count is None
+        return [row.id for row in rows], view._template_args["keyset_pager"]
+
+
+def test_keyset_pagination(keyset_view: KeysetCampaignAdmin) -> None:
+    ids, pager = _keyset_page(keyset_view)
+    assert ids == [8, 7, 6]
+    assert pager["previous_url"] is None
+
+    ids, pager = _keyset_page(keyset_view, pager["next_url"].split("?", 1)[1])
+    assert ids == [5, 4, 3]
+
+    ids, pager = _keyset_page(keyset_view, pager["next_url"].split("?", 1)[1])
+    assert ids == [2, 1]
+    assert pager["next_url"] is None
+
+    ids, pager = _keyset_page(keyset_view, pager["previous_url"].split("?", 1)[1])
+    assert ids == [5, 4, 3]
+
+    ids, pager = _keyset_page(keyset_view, pager["previous_url"].split("?", 1)[1])
+    assert ids == [8, 7, 6]
+    assert pager["previous_url"] is None
+
+
+def test_keyset_pagination_with_search_and_filters(keyset_view: KeysetCampaignAdmin) -> None:
+    ids, pager = _keyset_page(keyset_view, "search=odd")
+    assert ids == [7, 5, 3]
+    assert "search=odd" in pager["next_url"]
+
+    ids, pager = _keyset_page(keyset_view, pager["next_url"].split("?", 1)[1])
+    assert ids == [1]
+    assert pager["next_url"] is None
+
+    ids, pager = _keyset_page(keyset_view, "flt0_0=even")
+    assert ids == [8, 6, 4]
+    assert "flt0_0=even" in pager["next_url"]
+
+
+def test_keyset_pagination_invalid_cursor(keyset_view: KeysetCampaignAdmin) -> None:
+    ids, _ = _keyset_page(keyset_view, "after=not-a-cursor")
+    assert ids == [8, 7, 6]
+
+
+def test_keyset_pagination_not_used_for_other_sort_orders(keyset_view: KeysetCampaignAdmin) -> None:
+    app = Flask(__name__)
+    Admin(app).add_view(keyset_view)
+    with app.test_request_context("/admin/campaigns/?page=1"):
+        _, rows = keyset_view.get_list(1, "slug", False, None, [])
+        assert [row.slug for row in rows] == ["even-8", "odd-1", "odd-3"]
+        assert "keyset_pager" not in keyset_view._template_args
+
+
+class CountedCampaignAdmin(BaseModelView):
+    column_filters = ("slug",)
+
+
+def _list_count(view: BaseModelView, query_string: str = "") -> int | None:
+    app = Flask(__name__)
+    Admin(app).add_view(view)
+    with app.test_request_context(f"/admin/campaigns/?{query_string}"):
+        view_args = view._get_list_extra_args()
+        count, rows = view.get_list(view_args.page, None, False, view_args.search, view_args.filters)
+        assert rows
+        return count
+
+
+def test_capped_count(campaigns: tuple[type, scoped_session], mocker: MockerFixture) -> None:
+    view = CountedCampaignAdmin(*campaigns, endpoint="campaigns")
+    mocker.patch.multiple(view, count_strategy="capped", count_cap=5)
+
+    count = _list_count(view)
+    assert count == 5
+    assert str(count) == "5+"
+
+    count = _list_count(view, "flt0_0=odd")
+    assert count == 4
+    assert str(count) == "4"
+
+
+def test_estimated_count(campaigns: tuple[type, scoped_session], mocker: MockerFixture) -> None:
+    view = CountedCampaignAdmin(*campaigns, endpoint="campaigns")
+    mocker.patch.object(view, "count_strategy", "estimated")
+
+    # there are no planner estimates outside of postgres, the rows are counted instead
+    count = _list_count(view)
+    assert count == 8
+    assert str(count) == "8"
+
+    mock_session = mocker.patch.object(view, "session")
+    mock_session.get_bind.return_value.dialect.name = "postgresql"
+    mock_session.execute.return_value.scalar.return_value = 1200
+    mock_session.connection.return_value.exec_driver_sql.return_value.scalar.return_value = [
+        {"Plan": {"Plan Rows": 42.0}}
+    ]
+    assert view._estimate_count(mock.MagicMock(), filtered=False) == 1200
+    assert view._estimate_count(mock.MagicMock(), filtered=True) == 42
+
+    mock_session.execute.return_value.scalar.return_value = -1
+    assert view._estimate_count(mock.MagicMock(), filtered=False) == 42
+
+
+def test_deferred_count(campaigns: tuple[type, scoped_session], mocker: MockerFixture) -> None:
+    view = CountedCampaignAdmin(*campaigns, endpoint="campaigns", url="/admin/campaigns")
+    mocker.patch.object(view, "deferred_count", True)
+    mocker.patch.object(BaseModelView, "is_accessible", lambda _: True)
+    assert _list_count(view) is None
+
+    app = Flask(__name__)
+    Admin(app).add_view(view)
+    resp = app.test_client().get("/admin/campaigns/count/?flt0_0=even")
+    assert resp.status_code == 200
+    assert resp.json == {"count": 4, "label": "4"}
+
+
+class WindowedCampaignAdmin(BaseModelView):
+    time_window_column = "created_at"
+    default_time_window = "1d"
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz: timezone | None = None) -> datetime:  # type: ignore [override]
+        return datetime(2023, 1, 4, 12, tzinfo=tz)
+
+
+def test_time_window(campaigns: tuple[type, scoped_session], mocker: MockerFixture) -> None:
+    mocker.patch("event_horizon.admin.time_windows.datetime", FrozenDatetime)
+    view = WindowedCampaignAdmin(*campaigns, endpoint="campaigns")
+    app = Flask(__name__)
+    app.secret_key = "secret"
+    Admin(app).add_view(view)
+
+    for query_string, expected in (("", [7, 8]), ("window=7d", [1, 2, 3, 4, 5, 6, 7, 8]), ("window=nope", [7, 8])):
+        with app.test_request_context(f"/admin/campaigns/?{query_string}"):
+            count, rows = view.get_list(0, None, False, None, [])
+            assert sorted(row.id for row in rows) == expected
+            assert count == len(expected)
+
+    with app.test_request_context("/admin/campaigns/"):
+        view.get_list(0, None, False, None, [])
+        time_window = view._template_args["time_window"]
+        assert time_window["label"] == "Last 24 hours"
+        assert [(label, active) for label, _, active in time_window["options"]][-1] == ("All time", False)
+        assert time_window["options"][-1][1] == "/admin/campaigns/?window=all"
+
+    with app.test_request_context("/admin/campaigns/?window=all"):
+        assert view._get_time_window() == "all"
+        assert view.get_query().count() == 8
+
+    # rows are looked up by primary key outside of the list views
+    with app.test_request_context("/admin/campaigns/details/?id=1"):
+        assert view._get_time_window() is None
@@ -0,0 +1,228 @@
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from flask import Flask
+from flask_admin import Admin
+from sqlalchemy import Column, Enum, ForeignKey, Integer, String, create_engine
+from sqlalchemy.dialects.postgresql import UUID
+from pytest_mock import MockerFixture
+from sqlalchemy.orm import DeclarativeMeta, declarative_base, relationship, scoped_session, sessionmaker
+from sqlalchemy.sql.elements import ColumnElement
+
+from event_horizon.admin.model_views import BaseModelView
+from event_horizon.admin.search import (
+    PREFIX_INDEX_RE,
+    classify_term,
+    column_search_kind,
+    prefix_indexed_columns,
+    search_condition,
+)
+
+Base: DeclarativeMeta = declarative_base()
+PostgresBase: DeclarativeMeta = declarative_base()
+
+HOLDER_UUID = "6f4c4b1a-0d5e-4c2b-8b1e-5c2f0a6e9d11"
+
+
+class AccountHolder(Base):
+    __tablename__ = "account_holder"
+
+    id = Column(Integer, primary_key=True)
+    email = Column(String)
+    account_holder_uuid = Column(String)
+    status = Column(Enum("ACTIVE", "PENDING", name="status"))
+
+
+class Reward(Base):
+    __tablename__ = "reward"
+
+    id = Column(Integer, primary_key=True)
+    code = Column(String)
+    transaction_id = Column(String)
+    account_holder_id = Column(Integer, ForeignKey("account_holder.id"))
+    accountholder = relationship("AccountHolder")
+
+
+class PostgresAccountHolder(PostgresBase):
+    __tablename__ = "account_holder"
+
+    id = Column(Integer, primary_key=True)
+    account_holder_uuid = Column(UUID)
+
+
+@pytest.mark.parametrize(
+    ("term", "expected"),
+    [
+        (HOLDER_UUID, "uuid"),
+        (HOLDER_UUID.upper().replace("-", ""), "uuid"),
+        ("12345", "integer"),
+        ("9" * 20, "text"),
+        ("alice@example.com", "email"),
+        ("alice@", "text"),
+        ("ABC-123", "text"),
+        ("alice", "text"),
+    ],
+)
+def test_classify_term(term: str, expected: str) -> None:
+    assert classify_term(term) == expected
+
+
+def test_column_search_kind() -> None:
+    assert column_search_kind(AccountHolder.id) == "integer"
+    assert column_search_kind(AccountHolder.email) == "email"
+    assert column_search_kind(AccountHolder.account_holder_uuid) == "uuid"
+    assert column_search_kind(PostgresAccountHolder.account_holder_uuid) == "uuid"
+    assert column_search_kind(Reward.code) == "reward_code"
+    assert column_search_kind(Reward.transaction_id) == "transaction_id"
+    assert column_search_kind(AccountHolder.status) is None
+
+
+def _sql(condition: ColumnElement | None) -> str:
+    assert condition is not None
+    return str(condition.compile(compile_kwargs={"literal_binds": True}))
+
+
+def test_search_condition_skips_columns_the_term_cannot_match() -> None:
+    assert search_condition(AccountHolder.id, "integer", "alice") is None
+    assert search_condition(AccountHolder.email, "email", HOLDER_UUID) is None
+    assert search_condition(Reward.code, "reward_code", "alice@example.com") is None
+    assert search_condition(AccountHolder.account_holder_uuid, "uuid", "alice") is None
+
+
+def test_search_condition_equality() -> None:
+    condition = search_condition(PostgresAccountHolder.account_holder_uuid, "uuid", HOLDER_UUID.upper())
+    assert condition is not None
+    assert condition.right.value == HOLDER_UUID
+
+    assert _sql(search_condition(Reward.code, "reward_code", "ABC-123")) == "reward.code = 'ABC-123'"
+    assert _sql(search_condition(Reward.code, "reward_code", "ALICE")) == "reward.code = 'ALICE'"
+    assert _sql(search_condition(Reward.transaction_id, "transaction_id", "tx")) == "reward.transaction_id = 'tx'"
+    assert _sql(search_condition(AccountHolder.email, "email", "Al@Example.com")) == (
+        "account_holder.email IN ('Al@Example.com', 'al@example.com')"
+    )
+
+
+def test_search_condition_prefix_only_with_an_index() -> None:
+    assert _sql(search_condition(AccountHolder.email, "email", "Al_")) == "account_holder.email = 'Al_'"
+    assert _sql(search_condition(AccountHolder.email, "email", "Al_", prefix_indexed=True)) == (
+        "lower(account_holder.email) LIKE 'al/_' || '%' ESCAPE '/'"
+    )
+
+
+@pytest.mark.parametrize(
+    ("indexdef", "expected"),
+    [
+        ("CREATE INDEX ix ON public.account_holder USING btree (lower((email)::text) text_pattern_ops)", {"email"}),
+        ("CREATE INDEX ix ON public.account_holder USING btree (lower(email) varchar_pattern_ops)", {"email"}),
+        ("CREATE INDEX ix ON public.account_holder USING btree (lower((email)::text))", set()),
+        ("CREATE UNIQUE INDEX ix ON public.account_holder USING btree (email)", set()),
+    ],
+)
+def test_prefix_index_re(indexdef: str, expected: set[str]) -> None:
+    assert {match.group(1) for match in PREFIX_INDEX_RE.finditer(indexdef)} == expected
+
+
+def test_prefix_indexed_columns() -> None:
+    assert not prefix_indexed_columns(create_engine("sqlite://"), AccountHolder.__table__)
+
+    bind = mock.MagicMock()
+    bind.dialect.name = "postgresql"
+    bind.connect.return_value.__enter__.return_value.execute.return_value.scalars.return_value = [
+        "CREATE INDEX ix ON public.account_holder USING btree (lower((email)::text) text_pattern_ops)"
+    ]
+    assert prefix_indexed_columns(bind, AccountHolder.__table__) == frozenset({"email"})
+    assert prefix_indexed_columns(bind, AccountHolder.__table__) == frozenset({"email"})
+    bind.connect.assert_called_once_with()
+
+
+class RewardAdmin(BaseModelView):
+    column_default_sort = "id"
+    column_searchable_list = (
+        "code",
+        "transaction_id",
+        "accountholder.id",
+        "accountholder.email",
+        "accountholder.account_holder_uuid",
+    )
+    search_planner = True
+
+
+@pytest.fixture(name="view")
+def view_fixture(tmp_path: Path) -> RewardAdmin:
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            AccountHolder.__table__.insert(),
+            [
+                {"id": 1, "email": "alice@example.com", "account_holder_uuid": HOLDER_UUID, "status": "ACTIVE"},
+                {"id": 2, "email": "bob@example.com", "account_holder_uuid": "other", "status": "ACTIVE"},
+            ],
+        )
+        conn.execute(
+            Reward.__table__.insert(),
+            [
+                {"id": 1, "code": "1ABC", "transaction_id": "tx-0001", "account_holder_id": 1},
+                {"id": 2, "code": "CODE-2", "transaction_id": "tx-0002", "account_holder_id": 2},
+                {"id": 3, "code": "XALICE", "transaction_id": "tx-0003", "account_holder_id": 2},
+            ],
+        )
+
+    return RewardAdmin(Reward, scoped_session(sessionmaker(bind=engine)), endpoint="rewards")
+
+
+@pytest.fixture(name="email_prefix_index")
+def email_prefix_index_fixture(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "event_horizon.admin.search.prefix_indexed_columns",
+        side_effect=lambda _, table: frozenset({"email"} if table.name == "account_holder" else ()),
+    )
+
+
+def _search(view: BaseModelView, search: str) -> list[int]:
+    app = Flask(__name__)
+    Admin(app).add_view(view)
+    with app.test_request_context("/admin/rewards/"):
+        count, rows = view.get_list(0, None, False, search, [])
+        assert count == len(rows)
+        return [row.id for row in rows]
+
+
+@pytest.mark.parametrize(
+    ("search", "expected"),
+    [
+        (HOLDER_UUID, [1]),
+        ("1", [1]),
+        ("2", [2, 3]),
+        ("bob", [2, 3]),
+        ("bob@example.com", [2, 3]),
+        ("example.com", []),
+        ("ali", [1]),
+        ("ALI", [1]),
+        ("BOB@EXAMPLE.COM", [2, 3]),
+        ("1abc", []),
+        ("XALICE", [3]),
+        ("xalice", []),
+        ("tx-0002", [2]),
+        ("tx-000", []),
+        ("alice 1ABC", [1]),
+        ("%alice", [1, 3]),
+        ("%example", [1, 2, 3]),
+    ],
+)
+@pytest.mark.usefixtures("email_prefix_index")
+def test_planned_search(view: RewardAdmin, search: str, expected: list[int]) -> None:
+    assert _search(view, search) == expected
+
+
+@pytest.mark.parametrize(("search", "expected"), [("bob", []), ("bob@example.com", [2, 3]), ("XALICE", [3])])
+def test_planned_search_without_prefix_indexes(view: RewardAdmin, search: str, expected: list[int]) -> None:
+    assert _search(view, search) == expected
+
+
+def test_search_placeholder(view: RewardAdmin) -> None:
+    placeholder = view.search_placeholder()
+    assert placeholder is not None
+    assert placeholder.endswith(" (% to match anywhere)")
@@ -2,6 +2,7 @@ from unittest import mock
 
 import pytest
 import wtforms
+from pytest_mock import MockerFixture
 from wtforms.validators import StopValidation
 
 from event_horizon.carina.validators import (
@@ -11,17 +12,24 @@ from event_horizon.carina.validators import (
 )
 
 
-def test_validate_retailer_fetch_type(mock_form: mock.MagicMock, mock_field: mock.MagicMock) -> None:
-    pre_loaded_fetch_type = mock.Mock(name="PRE_LOADED")
-    mock_form.retailer = mock.Mock(data=mock.Mock(fetch_types=[pre_loaded_fetch_type]))
-    mock_field.data = pre_loaded_fetch_type
+def test_validate_retailer_fetch_type(
+    mock_form: mock.MagicMock, mock_field: mock.MagicMock, mocker: MockerFixture
+) -> None:
+    mock_get_ids = mocker.patch("event_horizon.carina.validators.get_retailer_fetch_type_ids", return_value=[1, 2])
+    mock_form.retailer = mock.Mock(data=mock.Mock(id=5))
+    mock_field.data = mock.Mock(id=2)
 
     validate_retailer_fetch_type(mock_form, mock_field)
 
+    mock_get_ids.assert_called_once_with(5)
+
 
-def test_validate_retailer_fetch_type_wrong_fetch_type(mock_form: mock.MagicMock, mock_field: mock.MagicMock) -> None:
-    mock_form.retailer = mock.Mock(data=mock.Mock(fetch_types=[mock.Mock(name="JIGSAW_EGIFT")]))
-    mock_field.data = mock.Mock(name="PRE_LOADED")
+def test_validate_retailer_fetch_type_wrong_fetch_type(
+    mock_form: mock.MagicMock, mock_field: mock.MagicMock, mocker: MockerFixture
+) -> None:
+    mocker.patch("event_horizon.carina.validators.get_retailer_fetch_type_ids", return_value=[1])
+    mock_form.retailer = mock.Mock(data=mock.Mock(id=5))
+    mock_field.data = mock.Mock(id=2)
 
     with pytest.raises(wtforms.ValidationError) as ex_info:
         validate_retailer_fetch_type(mock_form, mock_field)
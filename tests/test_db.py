@@ -0,0 +1,151 @@
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+
+from sqlalchemy import Column, DateTime, MetaData, create_engine, inspect, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool, QueuePool
+from sqlalchemy.sql import text
+
+from event_horizon.db import (
+    create_db_engine,
+    defer_automap_prepare,
+    get_pool_stats,
+    is_mapped,
+    lazy_automap_base,
+    prepare_deferred_automap_base,
+)
+
+POOL_CONFIG = {
+    "pool_class": "queue",
+    "pool_size": 2,
+    "max_overflow": 1,
+    "pool_timeout": 5,
+    "pool_recycle": 1800,
+    "pool_pre_ping": True,
+}
+
+
+def test_create_db_engine_queue_pool(tmp_path: Path) -> None:
+    engine = create_db_engine("test-queue", f"sqlite:///{tmp_path / 'test.db'}", POOL_CONFIG)
+
+    assert isinstance(engine.pool, QueuePool)
+    assert engine.pool.size() == 2
+    assert engine.pool._max_overflow == 1
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        stats = get_pool_stats(engine)
+        assert stats["checked_out"] == 1
+
+    stats = get_pool_stats(engine)
+    assert stats["checkouts"] == 1
+    assert stats["checked_out"] == 0
+    assert stats["checked_in"] == 1
+    assert stats["wait_seconds_total"] >= 0
+    assert stats["held_seconds_total"] > 0
+
+
+def test_create_db_engine_null_pool(tmp_path: Path) -> None:
+    engine = create_db_engine("test-null", f"sqlite:///{tmp_path / 'test.db'}", POOL_CONFIG | {"pool_class": "null"})
+
+    assert isinstance(engine.pool, NullPool)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    stats = get_pool_stats(engine)
+    assert stats["checkouts"] == 1
+    assert "checked_out" not in stats
+
+
+def test_pool_stats_survive_dispose(tmp_path: Path) -> None:
+    engine = create_db_engine("test-dispose", f"sqlite:///{tmp_path / 'test.db'}", POOL_CONFIG)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    engine.dispose(close=False)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert get_pool_stats(engine)["checkouts"] == 2
+
+
+@pytest.fixture(name="engine")
+def sqlite_engine(tmp_path: Path) -> Engine:
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE campaign (id INTEGER PRIMARY KEY, slug VARCHAR(32), created_at DATETIME)"))
+    return engine
+
+
+def _make_lazy_model(engine: Engine) -> tuple[Any, mock.MagicMock]:
+    base = lazy_automap_base(MetaData())
+
+    class Campaign(base):  # type: ignore [valid-type, misc]
+        __tablename__ = "campaign"
+
+        created_at = Column(DateTime)
+
+    prepare = mock.MagicMock(side_effect=lambda: base.prepare(autoload_with=engine))
+    defer_automap_prepare(base, prepare)
+    return Campaign, prepare
+
+
+def test_lazy_automap_base_prepares_on_attribute_lookup(engine: Engine) -> None:
+    campaign, prepare = _make_lazy_model(engine)
+
+    # declared columns and private lookups do not need the schema
+    assert campaign.created_at is not None
+    assert not hasattr(campaign, "_not_there")
+    assert not is_mapped(campaign)
+    prepare.assert_not_called()
+
+    assert campaign.slug is not None
+    assert set(inspect(campaign).columns.keys()) == {"id", "slug", "created_at"}
+    assert not hasattr(campaign, "not_there")
+    prepare.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "use_model",
+    [
+        pytest.param(lambda model: select(model), id="select"),
+        pytest.param(lambda model: model(slug="test"), id="instantiate"),
+    ],
+)
+def test_lazy_automap_base_prepares_on_use(engine: Engine, use_model: mock.MagicMock) -> None:
+    campaign, prepare = _make_lazy_model(engine)
+
+    use_model(campaign)
+
+    prepare.assert_called_once()
+
+
+def test_lazy_automap_base_reflection_failure_is_an_attribute_error(engine: Engine) -> None:
+    campaign, prepare = _make_lazy_model(engine)
+    reflect = prepare.side_effect
+    prepare.side_effect = ValueError("database unavailable")
+
+    assert not hasattr(campaign, "slug")
+    assert getattr(campaign, "slug", None) is None
+    with pytest.raises(AttributeError, match="reflecting its database failed") as exc_info:
+        campaign.slug
+    assert isinstance(exc_info.value.__cause__, ValueError)
+
+    prepare.side_effect = reflect
+    assert campaign.slug is not None
+
+
+def test_prepare_deferred_automap_base_failure_is_retried(engine: Engine) -> None:
+    campaign, prepare = _make_lazy_model(engine)
+    prepare.side_effect = [ValueError("database unavailable"), None]
+
+    with pytest.raises(ValueError, match="database unavailable"):
+        prepare_deferred_automap_base(campaign)
+
+    assert prepare_deferred_automap_base(campaign)
+    assert not prepare_deferred_automap_base(campaign)
+    assert prepare.call_count == 2
@@ -0,0 +1,91 @@
+import json
+import threading
+
+from unittest import mock
+
+import pytest
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from event_horizon.invalidation import ALL_TABLES, InvalidationBus
+from event_horizon.reference_cache import ReferenceCache
+
+
+@pytest.fixture(name="bus")
+def bus_fixture() -> InvalidationBus:
+    return InvalidationBus(mock.MagicMock(), "invalidation")
+
+
+def test_publish(bus: InvalidationBus) -> None:
+    handler = mock.MagicMock()
+    bus.subscribe(handler)
+
+    bus.publish("campaign")
+
+    handler.assert_called_once_with("campaign")
+    channel, data = bus.redis.publish.call_args.args
+    assert channel == "invalidation"
+    assert json.loads(data) == {"origin": bus.origin, "table": "campaign"}
+
+
+def test_publish_without_redis(bus: InvalidationBus) -> None:
+    handler = mock.MagicMock()
+    bus.subscribe(handler)
+    bus.redis.publish.side_effect = RedisConnectionError
+
+    bus.publish("campaign")
+
+    handler.assert_called_once_with("campaign")
+
+
+def test_handle_message(bus: InvalidationBus) -> None:
+    handler = mock.MagicMock()
+    bus.subscribe(handler)
+    failing_handler = mock.MagicMock(side_effect=ValueError)
+    bus.subscribe(failing_handler)
+
+    bus._handle_message({"data": json.dumps({"origin": "other-worker", "table": "retailer_config"})})
+    bus._handle_message({"data": json.dumps({"origin": bus.origin, "table": "campaign"})})
+    bus._handle_message({"data": b"not json"})
+
+    handler.assert_called_once_with("retailer_config")
+    failing_handler.assert_called_once_with("retailer_config")
+
+
+def test_listen_reconnects(bus: InvalidationBus) -> None:
+    handler = mock.MagicMock()
+    bus.subscribe(handler)
+    stop = threading.Event()
+    message = {"data": json.dumps({"origin": "other-worker", "table": "campaign"})}
+    pubsub = bus.redis.pubsub.return_value
+    pubsub.subscribe.side_effect = [RedisConnectionError, None]
+
+    def get_message(timeout: float) -> dict:
+        # the listener stops after this message
+        stop.set()
+        return message
+
+    pubsub.get_message.side_effect = get_message
+
+    with mock.patch("event_horizon.invalidation.RECONNECT_DELAY", 0):
+        bus._listen(stop)
+
+    # the changes published while disconnected were missed, everything is dropped once reconnected
+    assert handler.call_args_list == [mock.call(ALL_TABLES), mock.call("campaign")]
+    assert pubsub.close.call_count == 2
+
+
+def test_reference_cache_evicts_other_workers_values(bus: InvalidationBus) -> None:
+    cache = ReferenceCache(mock.MagicMock(), ttl=60, local_ttl=30, maxsize=10, bus=bus)
+    cache.redis.hget.return_value = None
+    cache.get("campaign", "active:test-retailer", lambda: [1])
+    cache.get("retailer_config", "choices", lambda: [["1", "Test Retailer"]])
+
+    bus._handle_message({"data": json.dumps({"origin": "other-worker", "table": "campaign"})})
+    assert list(cache._local) == [("retailer_config", "choices")]
+
+    bus._dispatch(ALL_TABLES)
+    assert not cache._local
+
+    cache.invalidate("retailer_config")
+    assert json.loads(bus.redis.publish.call_args.args[1])["table"] == "retailer_config"
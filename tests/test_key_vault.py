@@ -1,11 +1,17 @@
+import time
+
 from collections.abc import Generator
+from pathlib import Path
 from unittest import mock
 
 import pytest
 
+from azure.core.exceptions import ResourceNotFoundError
 from azure.keyvault.secrets import SecretClient
+from cryptography.fernet import Fernet
+from pytest_mock import MockerFixture
 
-from event_horizon.key_vault import KeyVault
+from event_horizon.key_vault import KeyVault, LocalSecretClient
 
 
 @pytest.fixture(name="mocked_client")
@@ -59,3 +65,79 @@ def test_get_secret_no_key_in_secret(mocked_client: mock.MagicMock) -> None:
     key_vault = KeyVault(client=mocked_client)
     with pytest.raises(KeyError):
         key_vault.get_secret("made-up-name", key="no-key-with-this-name")
+
+
+def test_get_secret_cached(mocked_client: mock.MagicMock, mocker: MockerFixture) -> None:
+    mocked_client.get_secret.return_value.value = '{"value": "shhh! secret"}'
+    mock_time = mocker.patch("event_horizon.key_vault.time.time", return_value=1000.0)
+    key_vault = KeyVault(client=mocked_client, cache_ttl=60)
+
+    assert key_vault.get_secret("made-up-name") == "shhh! secret"
+    assert key_vault.get_secret("made-up-name") == "shhh! secret"
+    mocked_client.get_secret.assert_called_once_with("made-up-name")
+
+    mock_time.return_value = 1061.0
+    assert key_vault.get_secret("made-up-name") == "shhh! secret"
+    assert mocked_client.get_secret.call_count == 2
+
+
+def test_prefetch_is_concurrent() -> None:
+    secrets = {f"secret-{i}": {"value": f"secret #{i}"} for i in range(5)}
+    client = LocalSecretClient(secrets, latency=0.2)
+    key_vault = KeyVault(client=client, cache_ttl=60)
+    mock_get_secret = mock.MagicMock(wraps=client.get_secret)
+    client.get_secret = mock_get_secret  # type: ignore [method-assign]
+
+    start = time.perf_counter()
+    key_vault.prefetch([*secrets, "secret-0", "missing-secret"])
+
+    assert time.perf_counter() - start < 0.2 * len(secrets)
+    assert mock_get_secret.call_count == len(secrets) + 1
+    assert [key_vault.get_secret(name) for name in secrets] == [f"secret #{i}" for i in range(5)]
+    assert mock_get_secret.call_count == len(secrets) + 1
+
+    with pytest.raises(ResourceNotFoundError):
+        key_vault.get_secret("missing-secret")
+
+
+def test_prefetch_requires_cache() -> None:
+    with pytest.raises(ValueError):
+        KeyVault(client=LocalSecretClient({})).prefetch(["secret"])
+
+
+def test_disk_cache(tmp_path: Path, mocker: MockerFixture) -> None:
+    cache_path = tmp_path / "secrets.cache"
+    cache_key = Fernet.generate_key().decode()
+    KeyVault(
+        client=LocalSecretClient({"secret": '{"value": "shhh! secret"}'}),
+        cache_ttl=60,
+        disk_cache_path=str(cache_path),
+        disk_cache_key=cache_key,
+    ).prefetch(["secret"])
+
+    assert b"shhh! secret" not in cache_path.read_bytes()
+
+    offline_client = LocalSecretClient({})
+    key_vault = KeyVault(client=offline_client, cache_ttl=60, disk_cache_path=str(cache_path), disk_cache_key=cache_key)
+    assert key_vault.get_secret("secret") == "shhh! secret"
+
+    # the cache expires with the ttl
+    mocker.patch("event_horizon.key_vault.time.time", return_value=time.time() + 61)
+    key_vault = KeyVault(client=offline_client, cache_ttl=60, disk_cache_path=str(cache_path), disk_cache_key=cache_key)
+    with pytest.raises(ResourceNotFoundError):
+        key_vault.get_secret("secret")
+
+    # a different key can not read it
+    key_vault = KeyVault(
+        client=offline_client,
+        cache_ttl=60,
+        disk_cache_path=str(cache_path),
+        disk_cache_key=Fernet.generate_key().decode(),
+    )
+    with pytest.raises(ResourceNotFoundError):
+        key_vault.get_secret("secret")
+
+
+def test_disk_cache_requires_key() -> None:
+    with pytest.raises(ValueError):
+        KeyVault(client=LocalSecretClient({}), cache_ttl=60, disk_cache_path="secrets.cache")
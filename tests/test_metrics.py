@@ -0,0 +1,86 @@
+import runpy
+
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from flask import Flask
+from prometheus_client import REGISTRY
+
+from event_horizon.metrics import _view_type, init_metrics, metrics_bp, timed_custom_action
+
+
+def _sample(name: str, labels: dict) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.parametrize(
+    ("endpoint", "expected"),
+    [
+        ("polaris/account-holders.index_view", "list"),
+        ("polaris/account-holders.edit_view", "edit"),
+        ("vela/campaigns.action_view", "action"),
+        ("vela/campaigns.end_campaigns", "action"),
+        ("healthz.readyz", "other"),
+        ("admin.index", "other"),
+        (None, "other"),
+    ],
+)
+def test_view_type(endpoint: str | None, expected: str) -> None:
+    assert _view_type(endpoint) == expected
+
+
+def test_request_duration_and_metrics_endpoint() -> None:
+    app = Flask(__name__)
+    init_metrics(app)
+    app.register_blueprint(metrics_bp)
+
+    @app.route("/hello")
+    def hello() -> str:
+        return "hello"
+
+    labels = {"endpoint": "hello", "view_type": "other", "method": "GET", "status": "200"}
+    before = _sample("event_horizon_request_duration_seconds_count", labels)
+
+    assert app.test_client().get("/hello").status_code == 200
+    assert _sample("event_horizon_request_duration_seconds_count", labels) == before + 1
+
+    resp = app.test_client().get("/metrics")
+    assert resp.status_code == 200
+    assert b"event_horizon_request_duration_seconds_bucket" in resp.data
+
+
+def test_timed_custom_action() -> None:
+    @timed_custom_action("test-action")
+    def action(value: int) -> int:
+        return value * 2
+
+    before = _sample("event_horizon_custom_action_duration_seconds_count", {"action": "test-action"})
+
+    assert action(2) == 4
+    assert action.__name__ == "action"
+    assert _sample("event_horizon_custom_action_duration_seconds_count", {"action": "test-action"}) == before + 1
+
+
+def test_gunicorn_child_exit_marks_the_worker_dead(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    child_exit = runpy.run_path(str(Path(__file__).parents[1] / "gunicorn.conf.py"))["child_exit"]
+    worker = mock.MagicMock(pid=1234)
+
+    with mock.patch("prometheus_client.multiprocess.mark_process_dead") as mock_mark_process_dead:
+        monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+        child_exit(mock.MagicMock(), worker)
+        mock_mark_process_dead.assert_not_called()
+
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+        child_exit(mock.MagicMock(), worker)
+        mock_mark_process_dead.assert_called_once_with(1234)
+
+
+def test_gunicorn_post_worker_init_starts_background_threads() -> None:
+    post_worker_init = runpy.run_path(str(Path(__file__).parents[1] / "gunicorn.conf.py"))["post_worker_init"]
+
+    with mock.patch("event_horizon.app.start_background_threads") as mock_start_background_threads:
+        post_worker_init(mock.MagicMock())
+
+    mock_start_background_threads.assert_called_once_with()
@@ -0,0 +1,96 @@
+import json
+import logging
+
+from pathlib import Path
+
+import pytest
+
+from flask import Flask
+from pytest_mock import MockerFixture
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from event_horizon import query_stats
+from event_horizon.query_stats import NPlusOneQueryError, init_query_stats, instrument_engine
+
+
+@pytest.fixture(name="engine")
+def sqlite_engine(tmp_path: Path) -> Engine:
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    instrument_engine("polaris", engine)
+    return engine
+
+
+@pytest.fixture(name="app")
+def app_fixture(engine: Engine) -> Flask:
+    app = Flask(__name__)
+    init_query_stats(app)
+
+    @app.route("/queries/<int:repeat>")
+    def run_queries(repeat: int) -> str:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            for i in range(repeat):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return "ok"
+
+    return app
+
+
+def test_request_query_stats(app: Flask, caplog: pytest.LogCaptureFixture) -> None:
+    with caplog.at_level(logging.INFO, logger="query-stats"):
+        resp = app.test_client().get("/queries/3")
+
+    assert resp.status_code == 200
+    assert resp.headers["Server-Timing"].startswith("db-polaris;dur=")
+    assert resp.headers["Server-Timing"].endswith(';desc="polaris 4 queries"')
+
+    log_line = json.loads(caplog.records[-1].getMessage())
+    assert log_line == {
+        "method": "GET",
+        "path": "/queries/3",
+        "status": 200,
+        "databases": {"polaris": {"queries": 4, "duration_ms": log_line["databases"]["polaris"]["duration_ms"]}},
+        "suspected_n_plus_one": [],
+    }
+
+
+def test_request_without_queries(app: Flask) -> None:
+    @app.route("/no-queries")
+    def no_queries() -> str:
+        return "ok"
+
+    assert "Server-Timing" not in app.test_client().get("/no-queries").headers
+
+
+def test_queries_outside_requests_are_not_recorded(engine: Engine) -> None:
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+def test_suspected_n_plus_one_warning(app: Flask, mocker: MockerFixture, caplog: pytest.LogCaptureFixture) -> None:
+    mocker.patch.object(query_stats, "SQL_N_PLUS_ONE_THRESHOLD", 5)
+
+    with caplog.at_level(logging.INFO, logger="query-stats"):
+        assert app.test_client().get("/queries/4").status_code == 200
+        assert json.loads(caplog.records[-1].getMessage())["suspected_n_plus_one"] == []
+
+        assert app.test_client().get("/queries/6").status_code == 200
+
+    warning, log_line = caplog.records[-2:]
+    assert warning.levelno == logging.WARNING
+    assert warning.getMessage() == "Suspected N+1: statement executed 5 times on polaris: SELECT ?"
+    assert json.loads(log_line.getMessage())["suspected_n_plus_one"] == [
+        {"database": "polaris", "statement": "SELECT ?"}
+    ]
+
+
+def test_suspected_n_plus_one_raise(app: Flask, engine: Engine, mocker: MockerFixture) -> None:
+    mocker.patch.object(query_stats, "SQL_N_PLUS_ONE_THRESHOLD", 5)
+    mocker.patch.object(query_stats, "SQL_N_PLUS_ONE_ACTION", "raise")
+    app.testing = True
+
+    with pytest.raises(NPlusOneQueryError):
+        app.test_client().get("/queries/6")
+
+    assert app.test_client().get("/queries/4").status_code == 200
@@ -0,0 +1,130 @@
+import threading
+import time
+
+from unittest import mock
+
+import pytest
+
+from flask import Flask
+from pytest_mock import MockerFixture
+
+from event_horizon.readiness import ReadinessChecker
+from event_horizon.settings import READINESS_DEPENDENCIES
+from event_horizon.views import healthz
+
+
+def _slow_probe(seconds: float) -> mock.MagicMock:
+    return mock.MagicMock(side_effect=lambda: time.sleep(seconds))
+
+
+@pytest.fixture(name="probes")
+def probes_fixture() -> dict[str, mock.MagicMock]:
+    return {"polaris": _slow_probe(0.2), "vela": _slow_probe(0.2), "redis": _slow_probe(0.2)}
+
+
+def test_check_runs_probes_concurrently(probes: dict[str, mock.MagicMock]) -> None:
+    checker = ReadinessChecker(probes, timeouts=dict.fromkeys(probes, 1.0), cache_seconds=0)
+
+    start = time.perf_counter()
+    results = checker.check()
+
+    assert time.perf_counter() - start < 0.2 * len(probes)
+    assert all(result.ok for result in results.values())
+    assert all(result.latency_ms >= 200 for result in results.values())
+
+
+def test_check_reports_failures_and_timeouts(probes: dict[str, mock.MagicMock]) -> None:
+    probes["vela"].side_effect = ConnectionError("vela is down")
+    timeouts = dict.fromkeys(probes, 1.0) | {"redis": 0.05}
+    checker = ReadinessChecker(probes, timeouts=timeouts, cache_seconds=0)
+
+    results = checker.check()
+
+    assert results["polaris"].as_dict() == {"ok": True, "latency_ms": mock.ANY}
+    assert results["vela"].as_dict() == {
+        "ok": False,
+        "latency_ms": mock.ANY,
+        "error": "ConnectionError('vela is down')",
+    }
+    assert results["redis"].as_dict() == {"ok": False, "latency_ms": 50.0, "error": "timed out"}
+
+
+def test_check_does_not_restart_probes_still_running() -> None:
+    release = threading.Event()
+    probe = mock.MagicMock(side_effect=release.wait)
+    checker = ReadinessChecker({"hubble": probe}, timeouts={"hubble": 0.05}, cache_seconds=0)
+
+    assert not checker.check()["hubble"].ok
+    assert not checker.check()["hubble"].ok
+    probe.assert_called_once()
+
+    release.set()
+    time.sleep(0.05)
+    assert checker.check()["hubble"].ok
+    assert probe.call_count == 2
+
+
+def test_check_caches_results(probes: dict[str, mock.MagicMock]) -> None:
+    checker = ReadinessChecker(probes, timeouts=dict.fromkeys(probes, 1.0), cache_seconds=60)
+
+    first = checker.check()
+    assert checker.check() is first
+    assert checker.check(use_cache=False) is not first
+    assert all(probe.call_count == 2 for probe in probes.values())
+
+
+@pytest.fixture(name="app_probes")
+def app_probes_fixture(mocker: MockerFixture) -> dict[str, mock.MagicMock]:
+    probes = {name: mock.MagicMock() for name in READINESS_DEPENDENCIES}
+    checker = ReadinessChecker(probes, timeouts=dict.fromkeys(probes, 1.0), cache_seconds=60)
+    mocker.patch.object(healthz, "readiness_checker", checker)
+    mocker.patch.object(healthz, "READINESS_REQUIRED_DEPENDENCIES", ["polaris", "vela"])
+    return probes
+
+
+@pytest.fixture(name="app")
+def app_fixture(app_probes: dict[str, mock.MagicMock]) -> Flask:
+    app = Flask(__name__)
+    app.register_blueprint(healthz.healthz_bp)
+    return app
+
+
+def test_readyz(app: Flask, app_probes: dict[str, mock.MagicMock]) -> None:
+    app_probes["carina"].side_effect = ConnectionError("carina is down")
+
+    resp = app.test_client().get("/readyz")
+
+    # only the required dependencies fail the check
+    assert resp.status_code == 200
+    assert resp.json == {name: {"ok": True, "latency_ms": mock.ANY} for name in READINESS_DEPENDENCIES} | {
+        "carina": {"ok": False, "latency_ms": mock.ANY, "error": "ConnectionError('carina is down')"}
+    }
+
+    app_probes["vela"].side_effect = ConnectionError("vela is down")
+    # results are cached
+    assert app.test_client().get("/readyz").status_code == 200
+    app_probes["vela"].assert_called_once()
+
+
+def test_readyz_required_dependency_down(app: Flask, app_probes: dict[str, mock.MagicMock]) -> None:
+    app_probes["vela"].side_effect = ConnectionError("vela is down")
+
+    resp = app.test_client().get("/readyz")
+
+    assert resp.status_code == 500
+    assert resp.json is not None
+    assert resp.json["vela"] == {"ok": False, "latency_ms": mock.ANY, "error": "ConnectionError('vela is down')"}
+
+
+def test_readyz_deep(app: Flask, app_probes: dict[str, mock.MagicMock]) -> None:
+    resp = app.test_client().get("/readyz/deep")
+    assert resp.status_code == 200
+    assert resp.json == {name: {"ok": True, "latency_ms": mock.ANY} for name in READINESS_DEPENDENCIES}
+
+    # every dependency is required and the probes always run
+    app_probes["carina"].side_effect = ConnectionError("carina is down")
+    resp = app.test_client().get("/readyz/deep")
+    assert resp.status_code == 500
+    assert resp.json is not None
+    assert resp.json["carina"] == {"ok": False, "latency_ms": mock.ANY, "error": "ConnectionError('carina is down')"}
+    assert app_probes["carina"].call_count == 2
@@ -0,0 +1,104 @@
+import time
+
+from unittest import mock
+
+import pytest
+
+from pytest_mock import MockerFixture
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from event_horizon.reference_cache import ReferenceCache
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, bytes]] = {}
+
+    def hget(self, name: str, key: str) -> bytes | None:
+        return self.hashes.get(name, {}).get(key)
+
+    def hset(self, name: str, key: str, value: str) -> None:
+        self.hashes.setdefault(name, {})[key] = value.encode()
+
+    def expire(self, name: str, time: int) -> None:
+        pass
+
+    def delete(self, *names: str) -> None:
+        for name in names:
+            self.hashes.pop(name, None)
+
+    def pipeline(self) -> mock.MagicMock:
+        pipe = mock.MagicMock(hset=self.hset, expire=self.expire)
+        pipe.__enter__.return_value = pipe
+        return pipe
+
+
+@pytest.fixture(name="cache")
+def cache_fixture() -> ReferenceCache:
+    return ReferenceCache(FakeRedis(), ttl=60, local_ttl=30, maxsize=2)
+
+
+def test_get_caches_values(cache: ReferenceCache) -> None:
+    loader = mock.MagicMock(return_value=[(1, "Test Retailer")])
+
+    assert cache.get("retailer", 1, loader) == [[1, "Test Retailer"]]
+    assert cache.get("retailer", 1, loader) == [[1, "Test Retailer"]]
+    loader.assert_called_once()
+
+    # other processes read the value from redis
+    other = ReferenceCache(cache.redis, ttl=60, local_ttl=30, maxsize=2)
+    assert other.get("retailer", "1", loader) == [[1, "Test Retailer"]]
+    loader.assert_called_once()
+
+
+def test_get_expires_values(cache: ReferenceCache, mocker: MockerFixture) -> None:
+    loader = mock.MagicMock(side_effect=["first", "second"])
+    assert cache.get("retailer", 1, loader) == "first"
+
+    now, monotonic_now = time.time(), time.monotonic()
+    # the local copy has expired, redis' hasn't
+    mocker.patch("event_horizon.reference_cache.time.monotonic", return_value=monotonic_now + 31)
+    assert cache.get("retailer", 1, loader) == "first"
+
+    mocker.patch("event_horizon.reference_cache.time.monotonic", return_value=monotonic_now + 62)
+    mocker.patch("event_horizon.reference_cache.time.time", return_value=now + 61)
+    assert cache.get("retailer", 1, loader) == "second"
+
+
+def test_get_evicts_least_recently_used(cache: ReferenceCache) -> None:
+    for key in ("a", "b", "c"):
+        cache.get("retailer", key, mock.MagicMock(return_value=key))
+
+    assert list(cache._local) == [("retailer", "b"), ("retailer", "c")]
+
+
+def test_invalidate(cache: ReferenceCache) -> None:
+    loader = mock.MagicMock(side_effect=["first", "second"])
+    cache.get("retailer", 1, loader)
+    cache.get("campaign", 1, lambda: "campaign")
+
+    cache.invalidate("retailer")
+
+    assert cache.get("retailer", 1, loader) == "second"
+    assert cache.get("campaign", 1, mock.MagicMock()) == "campaign"
+
+
+def test_get_without_redis(cache: ReferenceCache) -> None:
+    cache.redis = mock.MagicMock()
+    cache.redis.hget.side_effect = RedisConnectionError
+    cache.redis.pipeline.side_effect = RedisConnectionError
+    cache.redis.delete.side_effect = RedisConnectionError
+
+    assert cache.get("retailer", 1, lambda: "value") == "value"
+    cache.invalidate("retailer")
+    assert cache.get("retailer", 1, lambda: "new value") == "new value"
+
+
+def test_get_disabled(cache: ReferenceCache) -> None:
+    cache.ttl = 0
+    loader = mock.MagicMock(return_value="value")
+
+    cache.get("retailer", 1, loader)
+    cache.get("retailer", 1, loader)
+
+    assert loader.call_count == 2
@@ -0,0 +1,120 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from pytest_mock import MockerFixture
+from sqlalchemy import Column, DateTime, MetaData, create_engine, event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.automap import AutomapBase, automap_base
+from sqlalchemy.sql import text
+
+from event_horizon import schema_snapshot
+
+
+@pytest.fixture(name="engine")
+def sqlite_engine(tmp_path: Path) -> Engine:
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE retailer (id INTEGER PRIMARY KEY, slug VARCHAR(32) NOT NULL)"))
+        conn.execute(
+            text(
+                "CREATE TABLE campaign (id INTEGER PRIMARY KEY, slug VARCHAR(32), created_at DATETIME, "
+                "retailer_id INTEGER REFERENCES retailer(id))"
+            )
+        )
+    return engine
+
+
+@pytest.fixture(name="snapshot_dir")
+def snapshot_dir_fixture(tmp_path: Path, mocker: MockerFixture) -> Path:
+    snapshot_dir = tmp_path / "snapshots"
+    mocker.patch.object(schema_snapshot, "SCHEMA_SNAPSHOT_DIR", str(snapshot_dir))
+    return snapshot_dir
+
+
+def _make_base() -> tuple[AutomapBase, type]:
+    base: AutomapBase = automap_base(metadata=MetaData())
+
+    class Campaign(base):
+        __tablename__ = "campaign"
+
+        created_at = Column(DateTime)
+
+    return base, Campaign
+
+
+def _count_statements(engine: Engine) -> list[str]:
+    statements: list[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    return statements
+
+
+def test_prepare_automap_base_without_snapshot_dir(engine: Engine, mocker: MockerFixture) -> None:
+    mocker.patch.object(schema_snapshot, "SCHEMA_SNAPSHOT_DIR", None)
+    mock_fingerprint = mocker.patch.object(schema_snapshot, "schema_fingerprint")
+    base, campaign = _make_base()
+
+    schema_snapshot.prepare_automap_base("test", base, engine)
+
+    mock_fingerprint.assert_not_called()
+    assert set(base.metadata.tables) == {"campaign", "retailer"}
+    assert "retailer" in inspect(campaign).relationships
+
+
+def test_prepare_automap_base_writes_then_reuses_snapshot(
+    engine: Engine, snapshot_dir: Path, mocker: MockerFixture
+) -> None:
+    mocker.patch.object(schema_snapshot, "schema_fingerprint", return_value="fingerprint-1")
+
+    first_base, _ = _make_base()
+    schema_snapshot.prepare_automap_base("test", first_base, engine)
+    assert (snapshot_dir / "test.schema.pickle").exists()
+
+    statements = _count_statements(engine)
+    second_base, campaign = _make_base()
+    schema_snapshot.prepare_automap_base("test", second_base, engine)
+
+    # everything was answered from the snapshot, no catalog queries were needed
+    assert not [stmt for stmt in statements if "sqlite_master" in stmt or stmt.startswith("PRAGMA")]
+    assert set(second_base.metadata.tables) == {"campaign", "retailer"}
+    assert set(inspect(campaign).columns.keys()) == {"id", "slug", "created_at", "retailer_id"}
+    assert "retailer" in inspect(campaign).relationships
+
+
+def test_prepare_automap_base_reflects_on_stale_snapshot(
+    engine: Engine, snapshot_dir: Path, mocker: MockerFixture
+) -> None:
+    mock_fingerprint = mocker.patch.object(schema_snapshot, "schema_fingerprint", return_value="fingerprint-1")
+    schema_snapshot.prepare_automap_base("test", _make_base()[0], engine)
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE retailer ADD COLUMN status VARCHAR(32)"))
+
+    mock_fingerprint.return_value = "fingerprint-2"
+    base, _ = _make_base()
+    schema_snapshot.prepare_automap_base("test", base, engine)
+
+    assert "status" in base.metadata.tables["retailer"].c
+    assert schema_snapshot._load_snapshot("test", "fingerprint-2") is not None
+    assert schema_snapshot._load_snapshot("test", "fingerprint-1") is None
+
+
+def test_refresh_schema_snapshot(engine: Engine, snapshot_dir: Path, mocker: MockerFixture) -> None:
+    mocker.patch.object(schema_snapshot, "schema_fingerprint", return_value="fingerprint-1")
+
+    path = schema_snapshot.refresh_schema_snapshot("test", engine)
+
+    assert path == snapshot_dir / "test.schema.pickle"
+    assert schema_snapshot._load_snapshot("test", "fingerprint-1")
+
+
+def test_load_snapshot_ignores_corrupt_file(snapshot_dir: Path) -> None:
+    snapshot_dir.mkdir()
+    (snapshot_dir / "test.schema.pickle").write_bytes(b"not a pickle")
+
+    assert schema_snapshot._load_snapshot("test", "fingerprint-1") is None
@@ -407,6 +407,8 @@ def test_campaign_end_action_end_campaigns_ok(
 
     mock_start_date = datetime.now(tz=timezone.utc).replace(tzinfo=None)  # DB returns naive UTC datetimes
     mock_send_activity = mocker.patch("event_horizon.vela.custom_actions.sync_send_activity")
+    mock_journal_activities = mocker.patch("event_horizon.vela.custom_actions.journal_activities")
+    mock_publish_journals = mocker.patch("event_horizon.vela.custom_actions.publish_journals")
     end_action_mocks.get_start_date.return_value = mock_start_date
 
     convert_rate = 100
@@ -451,7 +453,13 @@ def test_campaign_end_action_end_campaigns_ok(
         loyalty_type=test_session_form_data.value.draft_campaign.type,
     )
 
-    assert mock_send_activity.call_count == 3
+    # the transfers' activities are published once they have been committed, the campaign migration straight away
+    assert [call.kwargs["routing_key"] for call in mock_journal_activities.call_args_list] == [
+        ActivityType.REWARD_STATUS.value,
+        ActivityType.BALANCE_CHANGE.value,
+    ]
+    mock_publish_journals.assert_called_once_with([mock_journal_activities.return_value] * 2)
+    assert mock_send_activity.call_count == 1
     end_action_mocks.get_start_date.assert_called_once_with(test_session_form_data.value.draft_campaign.id)
 
 
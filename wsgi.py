@@ -1,7 +1,8 @@
-from event_horizon.app import create_app
+from event_horizon.app import create_app, start_background_threads
 from event_horizon.settings import DEBUG, DEV_PORT
 
 app = create_app()
 
 if __name__ == "__main__":
+    start_background_threads()
     app.run(debug=DEBUG, port=DEV_PORT)